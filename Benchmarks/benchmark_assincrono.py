@@ -0,0 +1,144 @@
+# Benchmarks/benchmark_assincrono.py
+"""
+Compara o carregamento da página de comandas com consultas sequenciais e
+com as consultas independentes em paralelo (Controllers/assincrono.py).
+
+Cada cenário reproduz as leituras de uma operação de Views/PageComanda.py.
+Por padrão o cache de dados de referência é esvaziado antes de cada
+repetição (primeira carga após uma alteração de mesas ou cardápio); com
+--cache-quente, mede a carga com o cache preenchido.
+
+Uso:
+    python Benchmarks/benchmark_assincrono.py
+    python Benchmarks/benchmark_assincrono.py --escala grande --repeticoes 50 --saida async.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Permite executar este arquivo diretamente e importar os módulos do projeto
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from Benchmarks.benchmark_controllers import (
+    DIR_DADOS_PADRAO, commit_atual, percentil, preparar_banco,
+)
+from Benchmarks.gerador_dados import ESCALAS, SEMENTE_PADRAO
+from Controllers.assincrono import ASYNC_TRABALHADORES, em_paralelo, encerrar_executor
+from Controllers.cache import limpar_cache
+from Controllers.db_connection import configurar_pool, fechar_pool
+from Controllers.ComandaController import (
+    calcular_total_comanda, calcular_totais_comandas, consultar_itens_comanda,
+)
+from Controllers.FuncionarioController import consultar_funcionarios
+from Controllers.ItemCardapioController import consultar_itens
+from Controllers.MesaController import consultar_mesas_com_comanda
+
+REPETICOES_PADRAO = 30
+
+# Cenários: (nome, chamadas(id_comanda)) — as chamadas de cada cenário não
+# dependem umas das outras, como na página
+CENARIOS = [
+    ("abrir_comanda", lambda id_comanda: [
+        (consultar_mesas_com_comanda,), (consultar_funcionarios,),
+    ]),
+    ("gerenciar_comanda", lambda id_comanda: [
+        (consultar_itens,), (consultar_itens_comanda, id_comanda), (calcular_total_comanda, id_comanda),
+    ]),
+    ("fechar_comanda", lambda id_comanda: [
+        (consultar_itens_comanda, id_comanda), (calcular_total_comanda, id_comanda),
+    ]),
+    ("visao_geral", lambda id_comanda: [
+        (calcular_totais_comandas,), (consultar_funcionarios,),
+    ]),
+]
+
+def _sequencial(chamadas):
+    return [funcao(*args) for funcao, *args in chamadas]
+
+def _paralelo(chamadas):
+    return em_paralelo(*chamadas)
+
+def medir(cenario, comandas, repeticoes, cache_quente, semente):
+    """
+    Mede um cenário nos modos sequencial e paralelo, alternando os modos a
+    cada repetição para que ambos vejam o mesmo estado do banco.
+
+    Returns:
+        dict: cenario e, para cada modo, mediana_ms e p95_ms; ganho (sequencial/paralelo)
+    """
+    nome, montar = cenario
+    rng = random.Random(f"{semente}:{nome}")
+    modos = {"sequencial": _sequencial, "paralelo": _paralelo}
+    tempos = {modo: [] for modo in modos}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for repeticao in range(repeticoes + 1):
+            chamadas = montar(rng.choice(comandas))
+            for modo, executar in modos.items():
+                if not cache_quente:
+                    limpar_cache()
+                inicio = time.perf_counter()
+                executar(chamadas)
+                # A primeira repetição é aquecimento (importações, threads do executor)
+                if repeticao:
+                    tempos[modo].append((time.perf_counter() - inicio) * 1000)
+    resultado = {"cenario": nome}
+    for modo, valores in tempos.items():
+        valores.sort()
+        resultado[modo] = {
+            "mediana_ms": round(statistics.median(valores), 4),
+            "p95_ms": round(percentil(valores, 0.95), 4),
+        }
+    resultado["ganho"] = round(resultado["sequencial"]["mediana_ms"] / resultado["paralelo"]["mediana_ms"], 2)
+    return resultado
+
+def main(argumentos=None):
+    """Executa a comparação a partir dos argumentos da linha de comando."""
+    parser = argparse.ArgumentParser(description="Consultas sequenciais x paralelas na página de comandas")
+    parser.add_argument("--escala", choices=list(ESCALAS), default="media")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO)
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--dados", type=Path, default=DIR_DADOS_PADRAO,
+                        help="Diretório dos bancos gerados (padrão: %(default)s)")
+    parser.add_argument("--cache-quente", action="store_true", help="Não esvazia o cache entre repetições")
+    parser.add_argument("--saida", type=Path, help="Arquivo JSON com os resultados")
+    args = parser.parse_args(argumentos)
+
+    resultado = {
+        "commit": commit_atual(),
+        "escala": args.escala,
+        "trabalhadores": ASYNC_TRABALHADORES,
+        "cache_quente": args.cache_quente,
+        "repeticoes": args.repeticoes,
+        "resultados": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="restaurante_async_") as dir_trabalho:
+        print(f"Escala {args.escala}: preparando banco...", flush=True)
+        banco = Path(dir_trabalho) / f"{args.escala}.db"
+        dados = preparar_banco(args.escala, args.semente, args.dados, banco)
+        configurar_pool(caminho=banco)
+        print(f"{'cenário':<20} {'sequencial':>12} {'paralelo':>12} {'ganho':>7}   (mediana, ms)")
+        for cenario in CENARIOS:
+            medicao = medir(cenario, dados["comandas_abertas"], args.repeticoes,
+                            args.cache_quente, args.semente)
+            resultado["resultados"].append(medicao)
+            print(f"{medicao['cenario']:<20} {medicao['sequencial']['mediana_ms']:>12.3f}"
+                  f" {medicao['paralelo']['mediana_ms']:>12.3f} {medicao['ganho']:>6.2f}x")
+        encerrar_executor()
+        fechar_pool()
+
+    if args.saida:
+        args.saida.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nResultados gravados em {args.saida}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+# Benchmarks/benchmark_controllers.py
+"""
+Mede o tempo das funções dos controllers em bancos de vários tamanhos.
+
+Para cada escala, gera (ou reaproveita) um banco sintético com
+Benchmarks/gerador_dados.py, trabalha sobre uma cópia dele e executa cada
+caso de CASOS várias vezes. O resultado (mínimo, mediana, p95 e média em
+milissegundos) é gravado em JSON, junto com o commit e as versões do Python
+e do SQLite, para comparação entre versões do código.
+
+Uso:
+    python Benchmarks/benchmark_controllers.py --saida resultado.json
+    python Benchmarks/benchmark_controllers.py --escalas pequena media grande
+    python Benchmarks/benchmark_controllers.py --saida novo.json --comparar antigo.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Permite executar este arquivo diretamente e importar os módulos do projeto
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from Benchmarks.gerador_dados import ESCALAS, SEMENTE_PADRAO, gerar_dados
+from Controllers.cache import limpar_cache
+from Controllers.db_connection import configurar_pool, fechar_pool
+from Controllers import ClienteController, ComandaController, CozinhaController, FuncionarioController
+from Controllers import ItemCardapioController, MesaController, RelatorioController
+from Controllers import ResumoVendasController
+from Models.Cliente import Cliente
+from Services.database import create_database
+
+# Versão do formato do JSON gerado
+VERSAO_FORMATO = 1
+REPETICOES_PADRAO = 30
+# Execuções descartadas antes da medição (importações tardias, cache de páginas)
+AQUECIMENTO = 1
+# Bancos gerados ficam aqui e são reaproveitados nas próximas execuções
+DIR_DADOS_PADRAO = Path(tempfile.gettempdir()) / "restaurante_benchmark"
+
+def _direto(funcao):
+    """Função original de um controller com cache (mede o acesso ao banco)."""
+    return getattr(funcao, "sem_cache", funcao)
+
+def _abrir_com_itens(ctx, rng):
+    """Abre uma comanda com alguns itens (preparação, fora da medição)."""
+    id_comanda = ComandaController.abrir_comanda(
+        rng.randint(1, ctx["contagens"]["funcionario"]), rng.randint(1, ctx["contagens"]["mesa"])
+    )
+    ComandaController.adicionar_itens_comanda(
+        id_comanda, [(rng.randint(1, ctx["contagens"]["item_cardapio"]), 1) for _ in range(4)]
+    )
+    return (id_comanda,)
+
+def _novo_cliente(ctx, rng):
+    """Cliente com CPF abaixo da faixa sorteada pelo gerador (nunca repetido)."""
+    ctx["proximo_cpf"] += 1
+    return (Cliente(None, f"{ctx['proximo_cpf']:011d}", "Cliente Benchmark", "11900000000"),)
+
+def _linha_na_cozinha(ctx, rng):
+    """Linha em andamento na cozinha e uma nova situação (sem tirá-la da fila)."""
+    linhas, _ = CozinhaController.consultar_fila_cozinha()
+    if not linhas:
+        # Bancos gerados antes da fila da cozinha não têm linhas em andamento
+        ComandaController.adicionar_itens_comanda(rng.choice(ctx["comandas_abertas"]), [(1, 1)])
+        linhas, _ = CozinhaController.consultar_fila_cozinha()
+    return (rng.choice(linhas)["id_comanda_item_cardapio"], rng.choice(("pendente", "preparando")))
+
+def _ultimos_dias(ctx, dias):
+    fim = date.fromisoformat(ctx["periodo"][1])
+    return fim - timedelta(days=dias - 1), fim
+
+# Casos medidos: (nome, preparar, executar, repetições máximas).
+# preparar(ctx, rng) roda fora da medição e devolve os argumentos de executar.
+# Repetições máximas limitam os casos que varrem o banco inteiro (None = sem limite).
+CASOS = [
+    # Salão e comandas
+    ("consultar_mesas_com_comanda", None,
+     lambda: _direto(MesaController.consultar_mesas_com_comanda)(), None),
+    ("consultar_quadro_salao", None, lambda: _direto(MesaController.consultar_quadro_salao)(), None),
+    # Atualização do quadro sem alterações no banco (cache validado pelos contadores)
+    ("quadro_salao_sem_alteracao", None, MesaController.consultar_quadro_salao, None),
+    ("calcular_totais_comandas", None, ComandaController.calcular_totais_comandas, None),
+    ("calcular_total_comanda", lambda ctx, rng: (rng.choice(ctx["comandas_abertas"]),),
+     ComandaController.calcular_total_comanda, None),
+    ("consultar_itens_comanda", lambda ctx, rng: (rng.choice(ctx["comandas_abertas"]),),
+     ComandaController.consultar_itens_comanda, None),
+    ("obter_comanda", lambda ctx, rng: (rng.randint(1, ctx["contagens"]["comanda"]),),
+     ComandaController.obter_comanda, None),
+    ("abrir_comanda",
+     lambda ctx, rng: (rng.randint(1, ctx["contagens"]["funcionario"]),
+                       rng.randint(1, ctx["contagens"]["mesa"])),
+     ComandaController.abrir_comanda, None),
+    ("adicionar_item_comanda",
+     lambda ctx, rng: (rng.choice(ctx["comandas_abertas"]),
+                       rng.randint(1, ctx["contagens"]["item_cardapio"]), 1),
+     ComandaController.adicionar_item_comanda, None),
+    ("fechar_comanda", _abrir_com_itens, ComandaController.fechar_comanda, None),
+    # Cozinha (carga inicial da tela, atualização sem novidades e mudança de situação)
+    ("consultar_fila_cozinha", None, CozinhaController.consultar_fila_cozinha, None),
+    ("consultar_alteracoes_cozinha", lambda ctx, rng: (CozinhaController.consultar_fila_cozinha()[1],),
+     CozinhaController.consultar_alteracoes_cozinha, None),
+    ("alterar_status_preparo", _linha_na_cozinha, CozinhaController.alterar_status_preparo, None),
+    # Cadastros (listagens completas, páginas e buscas)
+    ("consultar_mesas", None, lambda: _direto(MesaController._linhas_mesas)(), None),
+    ("consultar_itens", None, lambda: _direto(ItemCardapioController._linhas_itens)(), None),
+    ("buscar_itens", lambda ctx, rng: (rng.choice(("piz", "fra", "caip", "suco lar", "vin")),),
+     ItemCardapioController.buscar_itens, None),
+    ("consultar_funcionarios", None,
+     lambda: _direto(FuncionarioController._linhas_funcionarios)(), None),
+    ("consultar_clientes", None, ClienteController.consultar_clientes, 10),
+    ("consultar_clientes_pagina", None, ClienteController.consultar_clientes_pagina, None),
+    ("consultar_clientes_pagina_nome", lambda ctx, rng: (rng.choice(("Ana", "Jo", "Mar", "Ra")),),
+     lambda nome: ClienteController.consultar_clientes_pagina(nome=nome), None),
+    ("obter_cliente", lambda ctx, rng: (rng.randint(1, ctx["contagens"]["cliente"]),),
+     ClienteController.obter_cliente, None),
+    ("buscar_cliente_por_cpf", lambda ctx, rng: (rng.choice(ctx["cpfs_clientes"]),),
+     ClienteController.buscar_cliente_por_cpf, None),
+    ("incluir_cliente", _novo_cliente, ClienteController.incluir_cliente, None),
+    # Relatórios
+    ("resumo_vendas_30_dias", lambda ctx, rng: _ultimos_dias(ctx, 30),
+     RelatorioController.resumo_vendas, None),
+    ("resumo_vendas_periodo_completo", lambda ctx, rng: tuple(map(date.fromisoformat, ctx["periodo"])),
+     RelatorioController.resumo_vendas, None),
+    ("consultar_comandas_fechadas", lambda ctx, rng: _ultimos_dias(ctx, 30),
+     RelatorioController.consultar_comandas_fechadas, None),
+    # Manutenção (varrem todas as comandas)
+    ("verificar_subtotais", None, ComandaController.verificar_subtotais, 3),
+    ("verificar_resumos", None, ResumoVendasController.verificar_resumos, 3),
+]
+
+def commit_atual():
+    """Hash do commit do repositório, ou None fora de um checkout git."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def percentil(valores, fracao):
+    """Percentil por vizinho mais próximo de uma lista ordenada."""
+    return valores[min(len(valores) - 1, int(round(fracao * (len(valores) - 1))))]
+
+def preparar_banco(escala, semente, dir_dados, destino):
+    """
+    Copia para 'destino' o banco sintético da escala, gerando-o se necessário.
+    A cópia é migrada para o esquema atual, então um banco gerado por uma
+    versão anterior do código continua servindo.
+
+    Returns:
+        dict: Metadados do banco gerado (ver gerar_dados)
+    """
+    dir_dados.mkdir(parents=True, exist_ok=True)
+    modelo = dir_dados / f"{escala}_s{semente}.db"
+    metadados = dir_dados / f"{escala}_s{semente}.json"
+    if not (modelo.exists() and metadados.exists()):
+        modelo.unlink(missing_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            dados = gerar_dados(modelo, escala, semente)
+        # Fecha as conexões: o checkpoint leva o WAL para o arquivo antes da cópia
+        fechar_pool()
+        metadados.write_text(json.dumps(dados, ensure_ascii=False, indent=2), encoding="utf-8")
+    shutil.copyfile(modelo, destino)
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_database(destino)
+    return json.loads(metadados.read_text(encoding="utf-8"))
+
+def criar_contexto(banco, dados):
+    """
+    Monta o contexto passado às funções 'preparar' dos casos.
+
+    Args:
+        banco (Path): Banco preparado
+        dados (dict): Metadados retornados por preparar_banco()/gerar_dados()
+    """
+    with contextlib.closing(sqlite3.connect(banco)) as conexao:
+        cpfs = [linha[0] for linha in conexao.execute("SELECT cpf FROM cliente LIMIT 1000")]
+    return dict(dados, cpfs_clientes=cpfs, proximo_cpf=0)
+
+def medir_caso(caso, ctx, repeticoes, semente):
+    """
+    Executa um caso 'repeticoes' vezes e resume os tempos.
+
+    Returns:
+        dict: caso, repeticoes, min_ms, mediana_ms, p95_ms, media_ms
+              (ou erro, se o caso lançou exceção)
+    """
+    nome, preparar, executar, maximo = caso
+    if maximo is not None:
+        repeticoes = min(repeticoes, maximo)
+    rng = random.Random(f"{semente}:{nome}")
+    tempos = []
+    try:
+        # Controllers imprimem mensagens a cada operação: fora da saída do benchmark
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(AQUECIMENTO):
+                executar(*(preparar(ctx, rng) if preparar else ()))
+            for _ in range(repeticoes):
+                argumentos = preparar(ctx, rng) if preparar else ()
+                inicio = time.perf_counter()
+                executar(*argumentos)
+                tempos.append((time.perf_counter() - inicio) * 1000)
+    except Exception as e:
+        return {"caso": nome, "repeticoes": len(tempos), "erro": f"{type(e).__name__}: {e}"}
+    tempos.sort()
+    return {
+        "caso": nome,
+        "repeticoes": repeticoes,
+        "min_ms": round(tempos[0], 4),
+        "mediana_ms": round(statistics.median(tempos), 4),
+        "p95_ms": round(percentil(tempos, 0.95), 4),
+        "media_ms": round(statistics.fmean(tempos), 4),
+    }
+
+def executar_benchmark(escalas, repeticoes=REPETICOES_PADRAO, semente=SEMENTE_PADRAO,
+                       dir_dados=DIR_DADOS_PADRAO, filtro=None):
+    """
+    Mede todos os casos (ou os que contêm 'filtro' no nome) em cada escala.
+
+    Returns:
+        dict: Resultado completo, no formato gravado em JSON
+    """
+    casos = [c for c in CASOS if not filtro or filtro in c[0]]
+    resultado = {
+        "versao_formato": VERSAO_FORMATO,
+        "commit": commit_atual(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "semente": semente,
+        "repeticoes": repeticoes,
+        "escalas": {},
+        "resultados": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="restaurante_benchmark_") as dir_trabalho:
+        for escala in escalas:
+            print(f"Escala {escala}: preparando banco...", flush=True)
+            banco = Path(dir_trabalho) / f"{escala}.db"
+            dados = preparar_banco(escala, semente, Path(dir_dados), banco)
+            configurar_pool(caminho=banco)
+            limpar_cache()
+            ctx = criar_contexto(banco, dados)
+            resultado["escalas"][escala] = {
+                "parametros": dados["parametros"], "contagens": dados["contagens"],
+            }
+            for caso in casos:
+                medicao = medir_caso(caso, ctx, repeticoes, semente)
+                resultado["resultados"].append(dict(escala=escala, **medicao))
+                if "erro" in medicao:
+                    print(f"  {caso[0]:<32} ERRO: {medicao['erro']}")
+                else:
+                    print(f"  {caso[0]:<32} mediana {medicao['mediana_ms']:>10.3f} ms"
+                          f"   p95 {medicao['p95_ms']:>10.3f} ms")
+            fechar_pool()
+    return resultado
+
+def comparar(atual, anterior):
+    """Imprime a variação da mediana de cada caso em relação a um resultado anterior."""
+    medianas = {
+        (r["escala"], r["caso"]): r.get("mediana_ms") for r in anterior.get("resultados", [])
+    }
+    print(f"\nComparação com o commit {anterior.get('commit') or '?'} (mediana):")
+    for r in atual["resultados"]:
+        antes = medianas.get((r["escala"], r["caso"]))
+        depois = r.get("mediana_ms")
+        if not antes or depois is None:
+            continue
+        print(f"  {r['escala']:<8} {r['caso']:<32} {antes:>10.3f} -> {depois:>10.3f} ms"
+              f"  ({depois / antes:>5.2f}x)")
+
+def main(argumentos=None):
+    """
+    Executa o benchmark a partir dos argumentos da linha de comando.
+
+    Returns:
+        int: Código de saída (0 = ok, 1 = algum caso falhou)
+    """
+    parser = argparse.ArgumentParser(description="Benchmark dos controllers do restaurante")
+    parser.add_argument("--escalas", nargs="+", choices=list(ESCALAS), default=["pequena", "media"])
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO)
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--dados", type=Path, default=DIR_DADOS_PADRAO,
+                        help="Diretório dos bancos gerados (padrão: %(default)s)")
+    parser.add_argument("--filtro", help="Mede apenas os casos que contêm este texto")
+    parser.add_argument("--saida", type=Path, help="Arquivo JSON com os resultados")
+    parser.add_argument("--comparar", type=Path, help="JSON de uma execução anterior")
+    args = parser.parse_args(argumentos)
+
+    resultado = executar_benchmark(args.escalas, args.repeticoes, args.semente, args.dados, args.filtro)
+    if args.saida:
+        args.saida.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nResultados gravados em {args.saida}")
+    if args.comparar:
+        comparar(resultado, json.loads(args.comparar.read_text(encoding="utf-8")))
+    return 1 if any("erro" in r for r in resultado["resultados"]) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
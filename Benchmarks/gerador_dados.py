@@ -0,0 +1,327 @@
+# Benchmarks/gerador_dados.py
+"""
+Gerador determinístico de dados sintéticos do restaurante.
+
+Cria um banco novo com cardápio, funcionários, mesas, clientes e um histórico
+de comandas fechadas (com itens e pagamentos) no tamanho escolhido. A mesma
+semente e a mesma escala geram sempre o mesmo banco, o que permite comparar
+medições de desempenho entre versões do código.
+
+Uso:
+    python Benchmarks/gerador_dados.py /tmp/restaurante_media.db --escala media
+    python Benchmarks/gerador_dados.py /tmp/teste.db --escala pequena --semente 7
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Permite executar este arquivo diretamente e importar os módulos do projeto
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from Controllers.db_connection import configurar_pool
+from Controllers.ResumoVendasController import reconstruir_resumos
+from Services.database import create_database
+
+# Tamanhos de banco disponíveis. dias * comandas_por_dia dá o volume de
+# comandas fechadas; cada comanda tem de 1 a itens_por_comanda linhas.
+ESCALAS = {
+    "pequena": {
+        "itens": 40, "funcionarios": 5, "mesas": 10, "clientes": 500,
+        "dias": 90, "comandas_por_dia": 40, "itens_por_comanda": 6,
+    },
+    "media": {
+        "itens": 120, "funcionarios": 15, "mesas": 30, "clientes": 5000,
+        "dias": 365, "comandas_por_dia": 150, "itens_por_comanda": 8,
+    },
+    "grande": {
+        "itens": 300, "funcionarios": 40, "mesas": 60, "clientes": 50000,
+        "dias": 730, "comandas_por_dia": 400, "itens_por_comanda": 10,
+    },
+}
+
+SEMENTE_PADRAO = 42
+# Último dia com vendas. Fixo para que o banco gerado não dependa da data atual.
+DATA_FINAL_PADRAO = date(2025, 12, 31)
+# Taxa de serviço das comandas (a mesma usada por abrir_comanda)
+TAXA_SERVICO = 10.0
+# Dias gravados por transação durante a carga
+DIAS_POR_TRANSACAO = 30
+
+_PRATOS = (
+    "Pizza", "Lasanha", "Risoto", "Filé", "Frango", "Salmão", "Hambúrguer",
+    "Salada", "Sopa", "Espaguete", "Picanha", "Moqueca", "Escondidinho",
+    "Tapioca", "Pastel", "Bolinho", "Caipirinha", "Suco", "Refrigerante",
+    "Cerveja", "Vinho", "Água", "Café", "Pudim", "Sorvete", "Torta",
+)
+_VARIACOES = (
+    "da Casa", "Especial", "Tradicional", "Grelhado", "ao Molho", "Vegano",
+    "Mineiro", "Baiano", "Italiano", "Light", "Picante", "Gourmet",
+)
+_COMPLEMENTOS = (
+    "com arroz e fritas", "porção individual", "serve duas pessoas",
+    "acompanha salada", "feito na hora", "receita da casa", None,
+)
+_NOMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Heitor",
+    "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula",
+    "Rafael", "Sofia", "Thiago", "Vanessa", "William",
+)
+_SOBRENOMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+    "Pereira", "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho",
+)
+# Peso relativo de cada hora de abertura de comanda (almoço e jantar)
+_PESOS_HORA = {
+    11: 3, 12: 10, 13: 9, 14: 4, 15: 1, 16: 1, 17: 2,
+    18: 4, 19: 8, 20: 10, 21: 7, 22: 3,
+}
+
+def _nome(rng):
+    return f"{rng.choice(_NOMES)} {rng.choice(_SOBRENOMES)} {rng.choice(_SOBRENOMES)}"
+
+def _cpfs(rng, quantidade):
+    """Sorteia CPFs (11 dígitos) distintos."""
+    return [f"{n:011d}" for n in rng.sample(range(10**10, 10**11), quantidade)]
+
+def _gerar_cadastros(rng, escala):
+    """Monta as linhas de cardápio, funcionários, mesas e clientes."""
+    itens = []
+    combinacoes = [(p, v) for p in _PRATOS for v in _VARIACOES]
+    for id_item, (prato, variacao) in enumerate(rng.sample(combinacoes, escala["itens"]), 1):
+        itens.append((
+            id_item, f"{prato} {variacao}", rng.choice(_COMPLEMENTOS),
+            round(rng.uniform(5, 120), 2),
+        ))
+
+    cpfs = _cpfs(rng, escala["funcionarios"] + escala["clientes"])
+    funcionarios = [
+        (i, cpfs[i - 1], _nome(rng)) for i in range(1, escala["funcionarios"] + 1)
+    ]
+    clientes = [
+        (i, cpfs[escala["funcionarios"] + i - 1], _nome(rng),
+         f"119{rng.randrange(10**7, 10**8)}")
+        for i in range(1, escala["clientes"] + 1)
+    ]
+    mesas = [(i, "livre", rng.choice((2, 4, 4, 6, 8))) for i in range(1, escala["mesas"] + 1)]
+    return itens, funcionarios, mesas, clientes
+
+def _gerar_dia(rng, escala, dia, itens, pesos_itens, proximo_id):
+    """
+    Gera as comandas fechadas de um dia.
+
+    Returns:
+        tuple: (comandas, linhas de itens, pagamentos, próximo id de comanda)
+    """
+    comandas, linhas, pagamentos = [], [], []
+    media = escala["comandas_por_dia"]
+    # Sexta e sábado têm mais movimento
+    if dia.weekday() in (4, 5):
+        media = int(media * 1.3)
+    quantidade = rng.randint(int(media * 0.7), int(media * 1.3))
+    horas = rng.choices(list(_PESOS_HORA), weights=list(_PESOS_HORA.values()), k=quantidade)
+
+    for hora in sorted(horas):
+        id_comanda = proximo_id
+        proximo_id += 1
+        abertura = datetime(dia.year, dia.month, dia.day, hora, rng.randrange(60), rng.randrange(60))
+        duracao = timedelta(minutes=rng.randint(20, 120))
+        fechamento = abertura + duracao
+
+        subtotal = 0.0
+        escolhidos = rng.choices(itens, weights=pesos_itens, k=rng.randint(1, escala["itens_por_comanda"]))
+        for id_item, _, _, valor in escolhidos:
+            quantidade_item = rng.choice((1, 1, 1, 2, 2, 3, 4))
+            pedido = abertura + duracao * rng.random()
+            linhas.append((
+                pedido.strftime("%Y-%m-%d %H:%M:%S"), valor, quantidade_item, id_comanda, id_item,
+            ))
+            subtotal += valor * quantidade_item
+
+        valor_total = subtotal * (1 + TAXA_SERVICO / 100)
+        comandas.append((
+            id_comanda, TAXA_SERVICO, fechamento.strftime("%Y-%m-%d %H:%M:%S"),
+            abertura.strftime("%Y-%m-%d %H:%M:%S"), valor_total,
+            rng.randint(1, escala["funcionarios"]), rng.randint(1, escala["mesas"]),
+        ))
+
+        # Parte das contas é paga por clientes identificados, às vezes dividida
+        if rng.random() < 0.6:
+            pagantes = rng.sample(range(1, escala["clientes"] + 1), rng.choice((1, 1, 1, 2, 3)))
+            for cliente_id in pagantes:
+                pagamentos.append((round(valor_total / len(pagantes), 2), cliente_id, id_comanda))
+    return comandas, linhas, pagamentos, proximo_id
+
+def gerar_dados(caminho, escala="pequena", semente=SEMENTE_PADRAO, data_final=DATA_FINAL_PADRAO,
+                comandas_abertas=None):
+    """
+    Cria um banco novo em 'caminho' e o preenche com dados sintéticos.
+
+    Ao final, reconstrói o resumo diário de vendas. Para isso o pool global
+    passa a apontar para o banco gerado (configurar_pool).
+
+    Args:
+        caminho (Path | str): Arquivo do banco a criar (não pode existir)
+        escala (str | dict): Nome de uma escala de ESCALAS ou dict com as mesmas chaves
+        semente (int): Semente do gerador de números aleatórios
+        data_final (date): Último dia com comandas fechadas
+        comandas_abertas (int): Comandas ainda abertas, uma por mesa
+                                (padrão: metade das mesas)
+
+    Returns:
+        dict: Escala, semente, período gerado, contagens por tabela e IDs
+              das comandas abertas
+
+    Raises:
+        FileExistsError: Se o arquivo já existir
+        ValueError: Se a escala não existir
+    """
+    caminho = Path(caminho)
+    if caminho.exists():
+        raise FileExistsError(f"O banco {caminho} já existe")
+    if isinstance(escala, str):
+        if escala not in ESCALAS:
+            raise ValueError(f"Escala '{escala}' desconhecida. Opções: {', '.join(ESCALAS)}")
+        nome_escala, escala = escala, ESCALAS[escala]
+    else:
+        nome_escala = "personalizada"
+    if comandas_abertas is None:
+        comandas_abertas = escala["mesas"] // 2
+
+    rng = random.Random(semente)
+    create_database(caminho)
+    itens, funcionarios, mesas, clientes = _gerar_cadastros(rng, escala)
+    # Popularidade dos itens em cauda longa: poucos pratos concentram as vendas
+    pesos_itens = [1 / posicao for posicao in range(1, len(itens) + 1)]
+    rng.shuffle(pesos_itens)
+
+    contagens = {"comanda": 0, "comanda_item_cardapio": 0, "comanda_cliente": 0}
+    primeiro_dia = data_final - timedelta(days=escala["dias"] - 1)
+    conexao = sqlite3.connect(caminho)
+    try:
+        # Carga inicial em arquivo novo: uma queda no meio só exige gerar de novo
+        conexao.execute("PRAGMA synchronous = OFF")
+        with conexao:
+            conexao.executemany(
+                "INSERT INTO item_cardapio (id_item, descricao, sub_descricao, valor_unitario) "
+                "VALUES (?, ?, ?, ?)", itens
+            )
+            conexao.executemany(
+                "INSERT INTO funcionario (id_funcionario, cpf, nome) VALUES (?, ?, ?)", funcionarios
+            )
+            conexao.executemany(
+                "INSERT INTO mesa (id_mesa, status, capacidade) VALUES (?, ?, ?)", mesas
+            )
+            conexao.executemany(
+                "INSERT INTO cliente (id_cliente, cpf, nome, telefone) VALUES (?, ?, ?, ?)", clientes
+            )
+
+        proximo_id = 1
+        for inicio in range(0, escala["dias"], DIAS_POR_TRANSACAO):
+            comandas, linhas, pagamentos = [], [], []
+            for deslocamento in range(inicio, min(inicio + DIAS_POR_TRANSACAO, escala["dias"])):
+                dia = primeiro_dia + timedelta(days=deslocamento)
+                c, l, p, proximo_id = _gerar_dia(rng, escala, dia, itens, pesos_itens, proximo_id)
+                comandas += c
+                linhas += l
+                pagamentos += p
+            with conexao:
+                conexao.executemany("""
+                    INSERT INTO comanda (id_comanda, taxa_servico, horario_fechamento,
+                                         horario_abertura, valor_total, funcionario_id, mesa_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, comandas)
+                # Os gatilhos de subtotal preenchem subtotal_itens/quantidade_itens.
+                # Pedidos de comandas fechadas já foram servidos: ficam fora da
+                # fila da cozinha
+                conexao.executemany("""
+                    INSERT INTO comanda_item_cardapio (horario_pedido, valor_unitario_momento,
+                                                       quantidade_item, comanda_id, item_cardapio_id,
+                                                       status_preparo)
+                    VALUES (?, ?, ?, ?, ?, 'pronto')
+                """, linhas)
+                conexao.executemany(
+                    "INSERT INTO comanda_cliente (valor_pago, cliente_id, comanda_id) VALUES (?, ?, ?)",
+                    pagamentos,
+                )
+            contagens["comanda"] += len(comandas)
+            contagens["comanda_item_cardapio"] += len(linhas)
+            contagens["comanda_cliente"] += len(pagamentos)
+
+        # Comandas em andamento no fim do último dia, cada uma em uma mesa ocupada
+        ids_abertas = []
+        abertura = datetime.combine(data_final, datetime.min.time()).replace(hour=21)
+        with conexao:
+            for id_mesa in rng.sample(range(1, escala["mesas"] + 1), min(comandas_abertas, escala["mesas"])):
+                conexao.execute("""
+                    INSERT INTO comanda (id_comanda, taxa_servico, horario_abertura, funcionario_id, mesa_id)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (proximo_id, TAXA_SERVICO, abertura.strftime("%Y-%m-%d %H:%M:%S"),
+                      rng.randint(1, escala["funcionarios"]), id_mesa))
+                escolhidos = rng.choices(itens, weights=pesos_itens, k=rng.randint(1, escala["itens_por_comanda"]))
+                conexao.executemany("""
+                    INSERT INTO comanda_item_cardapio (horario_pedido, valor_unitario_momento,
+                                                       quantidade_item, comanda_id, item_cardapio_id)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [(abertura.strftime("%Y-%m-%d %H:%M:%S"), valor, 1, proximo_id, id_item)
+                      for id_item, _, _, valor in escolhidos])
+                conexao.execute("UPDATE mesa SET status = 'ocupada' WHERE id_mesa = ?", (id_mesa,))
+                ids_abertas.append(proximo_id)
+                proximo_id += 1
+        # Estatísticas para o planejador de consultas, como em um banco em produção
+        conexao.execute("ANALYZE")
+    finally:
+        conexao.close()
+
+    configurar_pool(caminho=caminho)
+    reconstruir_resumos()
+
+    return {
+        "escala": nome_escala,
+        "semente": semente,
+        "parametros": dict(escala),
+        "periodo": (primeiro_dia.isoformat(), data_final.isoformat()),
+        "contagens": dict(
+            contagens,
+            item_cardapio=len(itens),
+            funcionario=len(funcionarios),
+            mesa=len(mesas),
+            cliente=len(clientes),
+        ),
+        "comandas_abertas": ids_abertas,
+    }
+
+def main(argumentos=None):
+    """
+    Gera um banco a partir dos argumentos da linha de comando.
+
+    Returns:
+        int: Código de saída (0 = ok, 1 = erro)
+    """
+    parser = argparse.ArgumentParser(description="Gera um banco do restaurante com dados sintéticos")
+    parser.add_argument("caminho", help="Arquivo do banco a criar")
+    parser.add_argument("--escala", choices=list(ESCALAS), default="pequena")
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--data-final", type=date.fromisoformat, default=DATA_FINAL_PADRAO,
+                        help="Último dia com vendas, AAAA-MM-DD (padrão: %(default)s)")
+    args = parser.parse_args(argumentos)
+
+    inicio = time.perf_counter()
+    try:
+        dados = gerar_dados(args.caminho, args.escala, args.semente, args.data_final)
+    except (FileExistsError, sqlite3.Error) as e:
+        print(f"Erro ao gerar dados: {e}")
+        return 1
+    print(f"Banco {args.caminho} gerado em {time.perf_counter() - inicio:.1f} s "
+          f"(escala {dados['escala']}, período {dados['periodo'][0]} a {dados['periodo'][1]}):")
+    for tabela, quantidade in dados["contagens"].items():
+        print(f"  {tabela}: {quantidade}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,454 @@
+# Benchmarks/simulador_carga.py
+"""
+Simulador de carga concorrente: vários terminais usando o sistema ao mesmo tempo.
+
+Cada terminal (thread ou processo) repete o ciclo de uma mesa em uma sexta à
+noite: abre uma comanda, lança algumas rodadas de pedidos consultando o salão
+entre elas, confere o total e fecha a conta. Todos gravam no mesmo arquivo
+SQLite, pelos mesmos controllers usados pelo Streamlit.
+
+Ao final são informados a vazão (comandas fechadas e operações por segundo),
+os percentis de latência de cada operação, os erros "database is locked",
+as novas tentativas feitas pelo terminal e os totais que não conferem.
+Serve para validar mudanças de journal, perfil e pool em db_connection.
+
+Uso:
+    python Benchmarks/simulador_carga.py                       # 8 threads, 20 s
+    python Benchmarks/simulador_carga.py --terminais 16 --modo processo
+    python Benchmarks/simulador_carga.py --perfil compatibilidade --saida carga.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, redirect_stdout
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+
+# Permite executar este arquivo diretamente e importar os módulos do projeto
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from Benchmarks.benchmark_controllers import commit_atual, percentil
+from Benchmarks.gerador_dados import ESCALAS, gerar_dados
+from Controllers.db_connection import (
+    POOL_TAMANHO, PERFIL_PADRAO, PERFIS_DESEMPENHO, aplicar_perfil, configurar_pool,
+    estatisticas_pool, fechar_pool, obter_conexao, obter_perfil,
+)
+from Controllers.ComandaController import (
+    abrir_comanda, adicionar_itens_comanda, calcular_total_comanda, fechar_comanda, obter_comanda,
+)
+from Controllers.MesaController import consultar_mesas_com_comanda
+from Controllers.escritor import (
+    ESCRITOR_ATIVO, encerrar_escritor, estatisticas_escritor, thread_origem,
+)
+
+# Operações medidas, na ordem do ciclo de uma comanda
+OPERACOES = (
+    "abrir_comanda", "adicionar_itens_comanda", "consultar_mesas_com_comanda",
+    "calcular_total_comanda", "fechar_comanda",
+)
+# Rodadas de pedidos por comanda e itens por rodada (mínimo, máximo)
+RODADAS = (2, 5)
+ITENS_POR_RODADA = (1, 4)
+# Novas tentativas de uma operação que encontrou o banco bloqueado
+TENTATIVAS_PADRAO = 3
+ESPERA_RETENTATIVA = 0.05
+# Diferença máxima aceita entre o total esperado e o gravado (R$)
+TOLERANCIA = 0.005
+# Mensagens do SQLite que indicam disputa pelo lock de escrita
+_MENSAGENS_LOCK = ("database is locked", "database is busy", "database table is locked")
+
+
+class _SaidaPorThread:
+    """
+    Substitui sys.stdout para guardar o que cada terminal imprime.
+    Os controllers informam erros com print(): é assim que o simulador sabe
+    que uma operação falhou e por quê. Threads sem buffer escrevem na saída original.
+    """
+
+    def __init__(self, original):
+        self.original = original
+        self._buffers = {}  # ID da thread -> lista de textos
+
+    def iniciar(self):
+        self._buffers[threading.get_ident()] = []
+
+    def coletar(self):
+        """Retorna e esvazia o texto impresso pela thread atual."""
+        buffer = self._buffers[threading.get_ident()]
+        texto = "".join(buffer)
+        buffer.clear()
+        return texto
+
+    def write(self, texto):
+        # Escritas rodam na thread do escritor único: o texto é de quem as submeteu
+        thread = thread_origem() or threading.get_ident()
+        buffer = self._buffers.get(thread)
+        if buffer is None:
+            return self.original.write(texto)
+        buffer.append(texto)
+        return len(texto)
+
+    def flush(self):
+        self.original.flush()
+
+
+class _Terminal:
+    """Um terminal do salão: executa o ciclo das comandas e registra as medições."""
+
+    def __init__(self, config, saida):
+        self.config = config
+        self.saida = saida
+        self.rng = random.Random(f"{config['semente']}:{config['terminal']}")
+        self.latencias = {operacao: [] for operacao in OPERACOES}
+        self.contadores = Counter()
+
+    def executar(self, operacao, funcao, *argumentos, escrita=True):
+        """
+        Executa uma operação, tentando de novo se o banco estiver bloqueado.
+        A latência registrada inclui as novas tentativas (tempo visto pelo garçom).
+
+        Returns:
+            O retorno do controller, ou None se a operação falhou
+        """
+        inicio = time.perf_counter()
+        for tentativa in range(self.config["tentativas"]):
+            if tentativa:
+                self.contadores["retentativas"] += 1
+                time.sleep(ESPERA_RETENTATIVA * 2 ** (tentativa - 1) * (0.5 + self.rng.random()))
+            self.saida.coletar()
+            try:
+                resultado = funcao(*argumentos)
+                erro = None
+            except sqlite3.Error as e:
+                # Ex.: pool esgotado, lançado fora do try dos controllers de leitura
+                resultado, erro = None, str(e)
+            texto = self.saida.coletar()
+            if erro is None and "Erro" in texto:
+                erro = texto.strip()
+            if erro is None and escrita and resultado in (None, False):
+                erro = "operação não concluída"
+            if erro is None:
+                self.latencias[operacao].append((time.perf_counter() - inicio) * 1000)
+                return resultado
+            if not any(mensagem in erro for mensagem in _MENSAGENS_LOCK):
+                self.contadores["outros_erros"] += 1
+                break
+            self.contadores["database_locked"] += 1
+        self.contadores["falhas"] += 1
+        self.contadores[f"falhas_{operacao}"] += 1
+        return None
+
+    def pausa(self):
+        """Intervalo entre ações do garçom."""
+        if self.config["pausa_ms"]:
+            time.sleep(self.rng.uniform(0.5, 1.5) * self.config["pausa_ms"] / 1000)
+
+    def ciclo_comanda(self, precos):
+        """Abre, atende e fecha uma comanda. Retorna True se a comanda foi fechada."""
+        rng = self.rng
+        id_comanda = self.executar(
+            "abrir_comanda", abrir_comanda,
+            rng.randint(1, self.config["funcionarios"]), rng.randint(1, self.config["mesas"]),
+        )
+        if not id_comanda:
+            return False
+
+        subtotal_esperado = 0.0
+        for _ in range(rng.randint(*RODADAS)):
+            self.pausa()
+            itens = [
+                (rng.choice(list(precos)), rng.randint(1, 3))
+                for _ in range(rng.randint(*ITENS_POR_RODADA))
+            ]
+            if self.executar("adicionar_itens_comanda", adicionar_itens_comanda, id_comanda, itens):
+                subtotal_esperado += sum(precos[id_item] * qtd for id_item, qtd in itens)
+            self.executar("consultar_mesas_com_comanda", consultar_mesas_com_comanda, escrita=False)
+
+        totais = self.executar("calcular_total_comanda", calcular_total_comanda, id_comanda)
+        if totais and abs(totais["subtotal"] - subtotal_esperado) > TOLERANCIA:
+            self.contadores["totais_divergentes"] += 1
+        self.pausa()
+        if not self.executar("fechar_comanda", fechar_comanda, id_comanda):
+            return False
+
+        # Confere o valor gravado no fechamento (fora da medição)
+        comanda = obter_comanda(id_comanda)
+        self.saida.coletar()
+        if comanda:
+            valor_esperado = subtotal_esperado * (1 + (comanda[5] or 0) / 100)
+            if abs((comanda[6] or 0) - valor_esperado) > TOLERANCIA:
+                self.contadores["totais_divergentes"] += 1
+        return True
+
+
+def _preparar_journal(banco, perfil):
+    """
+    Aplica o perfil ao arquivo do banco uma única vez, antes de os terminais
+    abrirem suas conexões, e confere o journal_mode que ficou valendo.
+
+    Trocar entre WAL e os modos de rollback exige o banco sem outras conexões:
+    se cada terminal tentasse, só o primeiro conseguiria e o resultado seria
+    atribuído a um perfil que não estava em vigor.
+
+    Returns:
+        str: journal_mode em vigor no arquivo
+
+    Raises:
+        sqlite3.OperationalError: Se o journal_mode do perfil não puder ser aplicado
+    """
+    esperado = obter_perfil(perfil)["journal_mode"].lower()
+    with closing(sqlite3.connect(banco)) as conexao:
+        aplicar_perfil(conexao, perfil)
+    # Relê por outra conexão: o modo gravado no arquivo é o que os terminais verão
+    with closing(sqlite3.connect(banco)) as conexao:
+        (modo,) = conexao.execute("PRAGMA journal_mode").fetchone()
+    if modo.lower() != esperado:
+        raise sqlite3.OperationalError(
+            f"o perfil {perfil} pede journal_mode={esperado}, mas o banco está em {modo}"
+        )
+    return modo.lower()
+
+
+def _executar_terminal(config):
+    """
+    Roda um terminal até o fim da duração (ou do limite de comandas).
+    Em modo processo, configura o pool e a captura de saída do próprio processo
+    (o journal_mode já foi aplicado ao arquivo por simular()).
+
+    Returns:
+        dict: terminal, comandas_fechadas, latencias (ms por operação) e contadores
+    """
+    if config["modo"] == "processo":
+        configurar_pool(caminho=config["banco"], tamanho=config["tamanho_pool"], perfil=config["perfil"])
+        sys.stdout = _SaidaPorThread(sys.stdout)
+    saida = sys.stdout
+    terminal = _Terminal(config, saida)
+    saida.iniciar()
+
+    with obter_conexao() as conexao:
+        precos = dict(conexao.execute("SELECT id_item, valor_unitario FROM item_cardapio"))
+
+    # Todos os terminais começam juntos
+    time.sleep(max(0.0, config["inicio"] - time.time()))
+    fim = config["inicio"] + config["duracao"]
+    fechadas = 0
+    while time.time() < fim:
+        if config["comandas"] is not None and fechadas >= config["comandas"]:
+            break
+        if terminal.ciclo_comanda(precos):
+            fechadas += 1
+
+    return {
+        "terminal": config["terminal"],
+        "comandas_fechadas": fechadas,
+        "termino": time.time(),
+        "latencias": terminal.latencias,
+        "contadores": dict(terminal.contadores),
+    }
+
+
+def _resumir_latencias(valores):
+    """Percentis de uma lista de latências em ms."""
+    if not valores:
+        return {"quantidade": 0}
+    valores = sorted(valores)
+    return {
+        "quantidade": len(valores),
+        "p50_ms": round(percentil(valores, 0.50), 3),
+        "p95_ms": round(percentil(valores, 0.95), 3),
+        "p99_ms": round(percentil(valores, 0.99), 3),
+        "max_ms": round(valores[-1], 3),
+    }
+
+
+def simular(banco, terminais=8, modo="thread", duracao=20.0, comandas=None, perfil=None,
+            tamanho_pool=None, pausa_ms=20, tentativas=TENTATIVAS_PADRAO, semente=42):
+    """
+    Executa a simulação e consolida os resultados de todos os terminais.
+
+    Args:
+        banco (Path | str): Banco já populado (é alterado pela simulação)
+        terminais (int): Quantidade de terminais simultâneos
+        modo (str): 'thread' (um processo, um pool compartilhado) ou
+                    'processo' (um processo e um pool por terminal)
+        duracao (float): Duração máxima em segundos
+        comandas (int): Limite de comandas fechadas por terminal (opcional)
+        perfil (str): Perfil de desempenho do banco (padrão: PERFIL_PADRAO)
+        tamanho_pool (int): Conexões por pool (padrão: POOL_TAMANHO)
+        pausa_ms (float): Intervalo médio entre as ações de um terminal
+        tentativas (int): Tentativas por operação quando o banco está bloqueado
+        semente (int): Semente das escolhas de mesas, itens e quantidades
+
+    Returns:
+        dict: Configuração (com o journal_mode em vigor), vazão, latências por
+              operação e contadores de erro
+
+    Raises:
+        sqlite3.OperationalError: Se o journal_mode do perfil não puder ser aplicado
+    """
+    perfil = perfil or PERFIL_PADRAO
+    tamanho_pool = tamanho_pool or POOL_TAMANHO
+    fechar_pool()
+    journal_mode = _preparar_journal(banco, perfil)
+    with closing(sqlite3.connect(banco)) as conexao:
+        funcionarios = conexao.execute("SELECT MAX(id_funcionario) FROM funcionario").fetchone()[0]
+        mesas = conexao.execute("SELECT MAX(id_mesa) FROM mesa").fetchone()[0]
+    if not funcionarios or not mesas:
+        raise ValueError(f"O banco {banco} não tem funcionários e mesas cadastrados")
+
+    # Processos precisam de mais tempo para iniciar antes da largada
+    inicio = time.time() + (3.0 if modo == "processo" else 0.2)
+    configs = [{
+        "terminal": i, "modo": modo, "banco": str(banco), "perfil": perfil,
+        "tamanho_pool": tamanho_pool, "inicio": inicio, "duracao": duracao, "comandas": comandas,
+        "pausa_ms": pausa_ms, "tentativas": max(1, tentativas), "semente": semente,
+        "funcionarios": funcionarios, "mesas": mesas,
+    } for i in range(terminais)]
+
+    estatisticas = escritor = None
+    if modo == "processo":
+        contexto = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=terminais, mp_context=contexto) as executor:
+            resultados = list(executor.map(_executar_terminal, configs))
+    else:
+        configurar_pool(caminho=banco, tamanho=tamanho_pool, perfil=perfil)
+        saida_original = sys.stdout
+        sys.stdout = _SaidaPorThread(saida_original)
+        try:
+            with ThreadPoolExecutor(max_workers=terminais) as executor:
+                resultados = list(executor.map(_executar_terminal, configs))
+            estatisticas = estatisticas_pool()
+            escritor = estatisticas_escritor() if ESCRITOR_ATIVO else None
+        finally:
+            sys.stdout = saida_original
+            encerrar_escritor()
+            fechar_pool()
+
+    tempo = max(r["termino"] for r in resultados) - inicio
+    latencias = {operacao: [] for operacao in OPERACOES}
+    contadores = Counter()
+    for r in resultados:
+        for operacao, valores in r["latencias"].items():
+            latencias[operacao].extend(valores)
+        contadores.update(r["contadores"])
+    fechadas = sum(r["comandas_fechadas"] for r in resultados)
+    operacoes = sum(len(v) for v in latencias.values())
+
+    return {
+        "commit": commit_atual(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "configuracao": {
+            "terminais": terminais, "modo": modo, "perfil": perfil, "journal_mode": journal_mode,
+            "tamanho_pool": tamanho_pool,
+            "duracao_s": duracao, "comandas_por_terminal": comandas, "pausa_ms": pausa_ms,
+            "tentativas": tentativas, "semente": semente, "escritor_unico": ESCRITOR_ATIVO,
+        },
+        "tempo_s": round(tempo, 3),
+        "comandas_fechadas": fechadas,
+        "comandas_por_s": round(fechadas / tempo, 2) if tempo > 0 else 0.0,
+        "operacoes_por_s": round(operacoes / tempo, 2) if tempo > 0 else 0.0,
+        "latencias": {operacao: _resumir_latencias(v) for operacao, v in latencias.items()},
+        "erros": {
+            "database_locked": contadores["database_locked"],
+            "retentativas": contadores["retentativas"],
+            "falhas": contadores["falhas"],
+            "outros_erros": contadores["outros_erros"],
+            "totais_divergentes": contadores["totais_divergentes"],
+            "falhas_por_operacao": {
+                operacao: contadores[f"falhas_{operacao}"]
+                for operacao in OPERACOES if contadores[f"falhas_{operacao}"]
+            },
+        },
+        "pool": estatisticas,
+        "escritor": escritor,
+    }
+
+
+def imprimir_resultado(resultado):
+    """Mostra o resumo da simulação no terminal."""
+    config = resultado["configuracao"]
+    print(f"\n{config['terminais']} terminal(is) em modo {config['modo']}, perfil {config['perfil']} "
+          f"(journal_mode={config['journal_mode']}), "
+          f"pool de {config['tamanho_pool']} conexão(ões), {resultado['tempo_s']:.1f} s")
+    print(f"Comandas fechadas: {resultado['comandas_fechadas']} "
+          f"({resultado['comandas_por_s']:.1f}/s, {resultado['operacoes_por_s']:.1f} operações/s)")
+    print(f"\n  {'operação':<30}{'qtd':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'máx ms':>10}")
+    for operacao, dados in resultado["latencias"].items():
+        if not dados["quantidade"]:
+            print(f"  {operacao:<30}{0:>8}")
+            continue
+        print(f"  {operacao:<30}{dados['quantidade']:>8}{dados['p50_ms']:>10.2f}{dados['p95_ms']:>10.2f}"
+              f"{dados['p99_ms']:>10.2f}{dados['max_ms']:>10.2f}")
+    erros = resultado["erros"]
+    print(f"\n'database is locked': {erros['database_locked']}   novas tentativas: {erros['retentativas']}"
+          f"   falhas: {erros['falhas']}   outros erros: {erros['outros_erros']}"
+          f"   totais divergentes: {erros['totais_divergentes']}")
+    if resultado["pool"]:
+        pool = resultado["pool"]
+        print(f"Pool: {pool['criadas']} conexão(ões) criada(s), {pool['esperas']} espera(s) por conexão livre")
+    if resultado.get("escritor"):
+        escritor = resultado["escritor"]
+        print(f"Escritor único: {escritor['operacoes']} escrita(s) em {escritor['lotes']} commit(s) "
+              f"(média {escritor['media_lote']:.1f}, maior lote {escritor['maior_lote']})")
+
+
+def main(argumentos=None):
+    """
+    Executa a simulação a partir dos argumentos da linha de comando.
+
+    Returns:
+        int: Código de saída (0 = ok, 1 = houve falhas ou totais divergentes)
+    """
+    parser = argparse.ArgumentParser(description="Simulador de carga concorrente do restaurante")
+    parser.add_argument("--db", type=Path,
+                        help="Banco a usar (é alterado). Padrão: um banco sintético novo em diretório temporário")
+    parser.add_argument("--escala", choices=list(ESCALAS), default="pequena", help="Escala do banco gerado quando --db não é informado")
+    parser.add_argument("--terminais", type=int, default=8)
+    parser.add_argument("--modo", choices=["thread", "processo"], default="thread")
+    parser.add_argument("--duracao", type=float, default=20.0, help="Segundos de simulação")
+    parser.add_argument("--comandas", type=int, help="Limite de comandas fechadas por terminal")
+    parser.add_argument("--perfil", choices=list(PERFIS_DESEMPENHO), default=PERFIL_PADRAO)
+    parser.add_argument("--tamanho-pool", type=int, default=POOL_TAMANHO)
+    parser.add_argument("--pausa-ms", type=float, default=20, help="Intervalo médio entre ações (ms)")
+    parser.add_argument("--tentativas", type=int, default=TENTATIVAS_PADRAO)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", type=Path, help="Arquivo JSON com os resultados")
+    args = parser.parse_args(argumentos)
+
+    with tempfile.TemporaryDirectory(prefix="restaurante_carga_") as diretorio:
+        banco = args.db
+        if banco is None:
+            banco = Path(diretorio) / "carga.db"
+            print(f"Gerando banco sintético (escala {args.escala})...")
+            with redirect_stdout(StringIO()):
+                gerar_dados(banco, args.escala, args.semente)
+            fechar_pool()
+        resultado = simular(
+            banco, args.terminais, args.modo, args.duracao, args.comandas, args.perfil,
+            args.tamanho_pool, args.pausa_ms, args.tentativas, args.semente,
+        )
+
+    imprimir_resultado(resultado)
+    if args.saida:
+        args.saida.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Resultados gravados em {args.saida}")
+    erros = resultado["erros"]
+    return 1 if erros["falhas"] or erros["totais_divergentes"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# Benchmarks/verificar_planos.py
+"""
+Verificação dos planos de execução das consultas dos controllers.
+
+Executa uma vez cada caso do benchmark (Benchmarks/benchmark_controllers.py),
+que cobre as funções dos controllers, sobre um banco sintético. A
+instrumentação registra todos os comandos SQL emitidos; cada comando distinto
+passa por EXPLAIN QUERY PLAN. Se um comando do atendimento (qualquer função
+fora de ROTINAS_MANUTENCAO) ler por inteiro uma tabela grande, como comanda
+ou comanda_item_cardapio, ou não puder ser explicado, a verificação falha.
+
+Uso:
+    python Benchmarks/verificar_planos.py            # código de saída 1 se houver varredura
+    python Benchmarks/verificar_planos.py --todos    # mostra o plano de cada comando
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+# Permite executar este arquivo diretamente e importar os módulos do projeto
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+# A verificação analisa os comandos registrados pela instrumentação: liga-a,
+# sem amostragem, antes de importar os controllers
+os.environ["RESTAURANTE_INSTRUMENTACAO"] = "1"
+os.environ["RESTAURANTE_INSTRUMENTACAO_AMOSTRA"] = "1"
+
+from Benchmarks.benchmark_controllers import CASOS, criar_contexto, medir_caso
+from Benchmarks.gerador_dados import ESCALAS, SEMENTE_PADRAO, gerar_dados
+from Controllers.db_connection import configurar_pool, fechar_pool
+from Controllers.HistoricoController import historico_anexado
+from Controllers.instrumentacao import (
+    AMOSTRA_INSTRUMENTACAO, INSTRUMENTACAO_ATIVA, LIMITE_REGISTROS, TABELAS_GRANDES,
+    comando_explicavel, consultas_recentes, limpar_registros, plano_consulta, varreduras_completas,
+)
+
+# Funções que leem tudo de propósito (conferências, reconstruções,
+# arquivamento e listagem completa): suas varreduras são informadas, mas não
+# reprovam a verificação
+ROTINAS_MANUTENCAO = {
+    "Controllers.ClienteController.consultar_clientes",
+    "Controllers.ComandaController.verificar_subtotais",
+    "Controllers.ResumoVendasController._divergencias",
+    "Controllers.ResumoVendasController._reconstruir",
+    "Controllers.HistoricoController.arquivar_comandas",
+    "Controllers.HistoricoController._copiar_para_historico",
+    "Controllers.HistoricoController._remover_do_principal",
+}
+
+def coletar_comandos(escala, semente):
+    """
+    Gera um banco sintético, executa os casos do benchmark e retorna os
+    comandos SQL distintos registrados pela instrumentação.
+
+    Returns:
+        dict: SQL -> conjunto de funções que o executaram
+    """
+    comandos = {}
+    with tempfile.TemporaryDirectory(prefix="restaurante_planos_") as diretorio:
+        banco = Path(diretorio) / "planos.db"
+        with redirect_stdout(StringIO()):
+            dados = gerar_dados(banco, escala, semente)
+        configurar_pool(caminho=banco)
+        ctx = criar_contexto(banco, dados)
+        for caso in CASOS:
+            limpar_registros()
+            medicao = medir_caso(caso, ctx, 1, semente)
+            if "erro" in medicao:
+                print(f"Aviso: o caso {caso[0]} falhou: {medicao['erro']}")
+            registros = consultas_recentes()
+            if len(registros) >= LIMITE_REGISTROS:
+                print(f"Aviso: o caso {caso[0]} excedeu o buffer de instrumentação; "
+                      f"aumente RESTAURANTE_INSTRUMENTACAO_LIMITE")
+            for registro in registros:
+                if comando_explicavel(registro["sql"]):
+                    comandos.setdefault(registro["sql"], set()).add(registro["chamador"])
+
+        # O plano depende das estatísticas do banco: analisa antes de descartá-lo
+        resultado = {}
+        # As views *_geral só existem em conexões com o histórico anexado
+        with historico_anexado() as conexao:
+            for sql, chamadores in comandos.items():
+                try:
+                    plano = plano_consulta(conexao, sql)
+                except sqlite3.Error as e:
+                    plano = [f"(plano indisponível: {e})"]
+                resultado[sql] = (sorted(c or "?" for c in chamadores), plano,
+                                  varreduras_completas(plano, sql))
+        fechar_pool()
+    return resultado
+
+def main(argumentos=None):
+    """
+    Executa a verificação a partir dos argumentos da linha de comando.
+
+    Returns:
+        int: Código de saída (0 = ok, 1 = varredura completa ou comando sem
+             plano no atendimento)
+    """
+    parser = argparse.ArgumentParser(description="Confere os planos de execução das consultas")
+    parser.add_argument("--escala", choices=list(ESCALAS), default="pequena")
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--todos", action="store_true", help="Mostra o plano de todos os comandos")
+    args = parser.parse_args(argumentos)
+
+    if not INSTRUMENTACAO_ATIVA or AMOSTRA_INSTRUMENTACAO < 1:
+        print("A verificação depende da instrumentação de todos os comandos "
+              "(RESTAURANTE_INSTRUMENTACAO=1, sem amostragem).")
+        return 1
+
+    resultado = coletar_comandos(args.escala, args.semente)
+    reprovados = 0
+    informados = 0
+    for sql, (chamadores, plano, varreduras) in resultado.items():
+        manutencao = all(c in ROTINAS_MANUTENCAO for c in chamadores)
+        if plano and plano[0].startswith("(plano indisponível"):
+            # Um comando do atendimento sem plano não pode ser conferido: reprova
+            if manutencao:
+                informados += 1
+                situacao = "sem plano (manutenção)"
+            else:
+                reprovados += 1
+                situacao = "SEM PLANO"
+        elif varreduras and not manutencao:
+            reprovados += 1
+            situacao = "VARREDURA"
+        elif varreduras:
+            informados += 1
+            situacao = "varredura (manutenção)"
+        elif args.todos:
+            situacao = "ok"
+        else:
+            continue
+        print(f"\n[{situacao}] {', '.join(chamadores)}")
+        print(f"  {sql}")
+        for passo in plano:
+            print(f"    {passo}")
+
+    print(f"\n{len(resultado)} comando(s) analisado(s); tabelas grandes: {', '.join(TABELAS_GRANDES)}.")
+    if informados:
+        print(f"{informados} varredura(s) ou comando(s) sem plano em rotinas de manutenção (permitidos).")
+    if reprovados:
+        print(f"{reprovados} comando(s) do atendimento leem uma tabela grande inteira "
+              f"ou não puderam ser explicados.")
+        return 1
+    print("Nenhuma varredura completa de tabela grande no atendimento.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
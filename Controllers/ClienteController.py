@@ -4,49 +4,196 @@ Controller para gerenciar operações CRUD de Clientes.
 Realiza inserção, consulta, alteração e exclusão de clientes no banco de dados.
 """
 
+import re
 import sqlite3
-from Controllers.db_connection import conecta_bd
+from Controllers.db_connection import obter_conexao, transacao
+from Controllers.escritor import via_escritor
 from Models.Cliente import Cliente
+from Models.hidratacao import hidratar_linhas, hidratar_um
 
+def normalizar_cpf(cpf):
+    """
+    Mantém apenas os dígitos de um CPF ('123.456.789-01' -> '12345678901').
+    Todo CPF é gravado e buscado nesse formato.
+    
+    Args:
+        cpf (str): CPF digitado, com ou sem pontuação
+        
+    Returns:
+        str: Somente os dígitos do CPF
+    """
+    return re.sub(r"\D", "", cpf or "")
+
+@via_escritor
 def incluir_cliente(cliente):
     """
     Insere um novo cliente no banco de dados.
+    O CPF é normalizado (apenas dígitos) e deve ser único.
     
     Args:
         cliente (Cliente): Objeto Cliente com os dados a serem inseridos
+        
+    Returns:
+        bool: True se sucesso, False se erro (ex: CPF já cadastrado)
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("""
-            INSERT INTO cliente (cpf, nome, telefone) VALUES (?, ?, ?)
-        """, (cliente.get_cpf(), cliente.get_nome(), cliente.get_telefone()))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("""
+                INSERT INTO cliente (cpf, nome, telefone) VALUES (?, ?, ?)
+            """, (normalizar_cpf(cliente.get_cpf()), cliente.get_nome(), cliente.get_telefone()))
+        return True
+    except sqlite3.IntegrityError:
+        print(f"Erro ao inserir cliente: CPF {cliente.get_cpf()} já cadastrado")
+        return False
     except sqlite3.Error as e:
         print(f"Erro ao inserir cliente: {e}")
-    finally:
-        conexao.close()
+        return False
 
-def consultar_clientes():
+def consultar_clientes(como_modelo=False):
     """
     Recupera todos os clientes cadastrados, ordenados por nome.
     
+    Args:
+        como_modelo (bool): Se True, retorna instâncias de Cliente em vez de tuplas
+        
     Returns:
         list: Lista de tuplas (id, cpf, nome, telefone) ordenadas por nome
               Retorna lista vazia se houver erro
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
-    try:
-        cursor.execute("SELECT * FROM cliente ORDER BY nome")
-        # Retorna lista de tuplas (id, cpf, nome, telefone)
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        print(f"Erro ao consultar clientes: {e}")
-        return []
-    finally:
-        conexao.close()
+    with obter_conexao() as conexao:
+        cursor = conexao.cursor()
+        try:
+            cursor.execute("SELECT * FROM cliente ORDER BY nome")
+            if como_modelo:
+                colunas = [descricao[0] for descricao in cursor.description]
+                return hidratar_linhas(cursor.fetchall(), colunas, Cliente)
+            # Retorna lista de tuplas (id, cpf, nome, telefone)
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar clientes: {e}")
+            return []
+
+# Chave de ordenação da listagem; deve ser idêntica à expressão do índice
+# idx_cliente_nome para que a paginação e a busca por prefixo usem o índice
+_CHAVE_NOME = "IFNULL(nome, '') COLLATE NOCASE"
+# Maior caractere Unicode: limite superior das buscas por prefixo
+_FIM_PREFIXO = "\U0010ffff"
+
+def consultar_clientes_pagina(apos=None, limite=50, nome=None, cpf=None, telefone=None,
+                              como_modelo=False):
+    """
+    Recupera uma página de clientes ordenados por nome, com filtros opcionais.
+    
+    Usa paginação por chave (keyset): em vez de OFFSET, cada página começa
+    logo após o último cliente da página anterior, com custo constante
+    mesmo nas últimas páginas de uma base grande.
+    
+    Args:
+        apos (tuple): Cursor (nome, id_cliente) retornado pela página anterior;
+                      None para a primeira página
+        limite (int): Quantidade máxima de clientes na página
+        nome (str): Prefixo do nome (sem diferenciar maiúsculas/minúsculas)
+        cpf (str): CPF exato
+        telefone (str): Prefixo do telefone
+        como_modelo (bool): Se True, a página traz instâncias de Cliente em vez de tuplas
+        
+    Returns:
+        tuple: (lista de tuplas (id, cpf, nome, telefone), cursor da próxima página)
+               O cursor é None quando não há mais páginas.
+               Retorna ([], None) se houver erro
+    """
+    condicoes = []
+    parametros = []
+    if nome:
+        condicoes.append(f"{_CHAVE_NOME} >= ? AND {_CHAVE_NOME} < ?")
+        parametros += [nome, nome + _FIM_PREFIXO]
+    if cpf:
+        # "cpf <> ''" permite usar o índice único parcial de CPF
+        condicoes.append("cpf = ? AND cpf <> ''")
+        parametros.append(normalizar_cpf(cpf))
+    if telefone:
+        condicoes.append("telefone >= ? AND telefone < ?")
+        parametros += [telefone, telefone + _FIM_PREFIXO]
+    if apos is not None:
+        nome_cursor, id_cursor = apos
+        # A primeira condição (redundante) permite ao SQLite posicionar no índice;
+        # a comparação de tuplas desempata clientes com o mesmo nome
+        condicoes.append(f"{_CHAVE_NOME} >= ? AND ({_CHAVE_NOME}, id_cliente) > (?, ?)")
+        parametros += [nome_cursor, nome_cursor, id_cursor]
+
+    consulta = "SELECT id_cliente, cpf, nome, telefone FROM cliente"
+    if condicoes:
+        consulta += " WHERE " + " AND ".join(condicoes)
+    # Busca um registro a mais apenas para saber se existe próxima página
+    consulta += f" ORDER BY {_CHAVE_NOME}, id_cliente LIMIT ?"
+    parametros.append(limite + 1)
+
+    with obter_conexao() as conexao:
+        try:
+            cursor = conexao.execute(consulta, parametros)
+            linhas = cursor.fetchall()
+            colunas = [descricao[0] for descricao in cursor.description]
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar página de clientes: {e}")
+            return [], None
 
+    proximo_cursor = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        ultimo = linhas[-1]
+        proximo_cursor = (ultimo[2] or "", ultimo[0])
+    if como_modelo:
+        linhas = hidratar_linhas(linhas, colunas, Cliente)
+    return linhas, proximo_cursor
+
+def obter_cliente(id_cliente, como_modelo=False):
+    """
+    Recupera um único cliente pelo ID.
+    
+    Args:
+        id_cliente (int): ID do cliente
+        como_modelo (bool): Se True, retorna uma instância de Cliente em vez da tupla
+        
+    Returns:
+        tuple: (id, cpf, nome, telefone), ou None se não encontrado ou erro
+    """
+    with obter_conexao() as conexao:
+        try:
+            cursor = conexao.execute(
+                "SELECT id_cliente, cpf, nome, telefone FROM cliente WHERE id_cliente = ?",
+                (id_cliente,)
+            )
+            return hidratar_um(cursor, Cliente) if como_modelo else cursor.fetchone()
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar cliente: {e}")
+            return None
+
+def buscar_cliente_por_cpf(cpf):
+    """
+    Localiza um cliente pelo CPF (busca no índice único, O(log n)).
+    
+    Args:
+        cpf (str): CPF com ou sem pontuação
+        
+    Returns:
+        tuple: (id, cpf, nome, telefone), ou None se não encontrado ou erro
+    """
+    cpf = normalizar_cpf(cpf)
+    if not cpf:
+        return None
+    with obter_conexao() as conexao:
+        try:
+            # "cpf <> ''" permite usar o índice único parcial idx_cliente_cpf_unico
+            return conexao.execute(
+                "SELECT id_cliente, cpf, nome, telefone FROM cliente WHERE cpf = ? AND cpf <> ''",
+                (cpf,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Erro ao buscar cliente por CPF: {e}")
+            return None
+
+@via_escritor
 def excluir_cliente(id_cliente):
     """
     Remove um cliente do banco de dados pelo ID.
@@ -54,36 +201,40 @@ def excluir_cliente(id_cliente):
     Args:
         id_cliente (int): ID do cliente a ser removido
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("DELETE FROM cliente WHERE id_cliente = ?", (id_cliente,))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("DELETE FROM cliente WHERE id_cliente = ?", (id_cliente,))
     except sqlite3.Error as e:
         print(f"Erro ao excluir cliente: {e}")
-    finally:
-        conexao.close()
 
+@via_escritor
 def alterar_cliente(cliente):
     """
     Atualiza os dados de um cliente existente no banco de dados.
+    O CPF é normalizado (apenas dígitos) e deve continuar único.
     
     Args:
         cliente (Cliente): Objeto Cliente com os novos dados (deve conter o id_cliente)
+        
+    Returns:
+        bool: True se sucesso, False se erro (ex: CPF de outro cliente)
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("""
-            UPDATE cliente SET cpf = ?, nome = ?, telefone = ? WHERE id_cliente = ?
-        """, (
-            cliente.get_cpf(),
-            cliente.get_nome(),
-            cliente.get_telefone(),
-            cliente.get_id_cliente()
-        ))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("""
+                UPDATE cliente SET cpf = ?, nome = ?, telefone = ? WHERE id_cliente = ?
+            """, (
+                normalizar_cpf(cliente.get_cpf()),
+                cliente.get_nome(),
+                cliente.get_telefone(),
+                cliente.get_id_cliente()
+            ))
+        return True
+    except sqlite3.IntegrityError:
+        print(f"Erro ao alterar cliente: CPF {cliente.get_cpf()} já cadastrado")
+        return False
     except sqlite3.Error as e:
         print(f"Erro ao alterar cliente: {e}")
-    finally:
-        conexao.close()
\ No newline at end of file
+        return False
@@ -3,16 +3,30 @@
 Controller para gerenciar operações de Comandas.
 Uma comanda representa o pedido de um cliente em uma mesa.
 Operações principais: abrir, adicionar itens, calcular total, fechar.
+
+Cada operação de escrita roda como uma unidade de trabalho (transacao()):
+todas as alterações de uma operação (ex: comanda + status da mesa) são
+confirmadas juntas, com um único commit, ou desfeitas juntas. As escritas
+são executadas pelo escritor único (Controllers/escritor.py), que agrupa as
+operações de vários terminais em um mesmo commit.
 """
 
 import sqlite3
-from Controllers.db_connection import conecta_bd, get_db_connection
-from Controllers.MesaController import alterar_status_mesa
+from Controllers.db_connection import obter_conexao, transacao
+from Controllers.escritor import via_escritor
+from Controllers.cache import invalidar
+from Controllers.CozinhaController import retirar_comanda_da_fila
+from Controllers.MesaController import registrar_status_mesa
+from Controllers.ResumoVendasController import registrar_resumo_comanda
+from Models.Comanda import Comanda
+from Models.hidratacao import hidratar_um
 from datetime import datetime
 
+@via_escritor
 def abrir_comanda(funcionario_id, mesa_id):
     """
     Cria uma nova comanda e atualiza o status da mesa para ocupada.
+    As duas alterações são gravadas na mesma transação.
     
     Args:
         funcionario_id (int): ID do funcionário que abre a comanda
@@ -21,33 +35,32 @@ def abrir_comanda(funcionario_id, mesa_id):
     Returns:
         int: ID da comanda criada, ou None se houve erro
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        # Registra o horário atual de abertura
-        horario_abertura = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Insere a nova comanda com taxa de serviço padrão de 10%
-        cursor.execute("""
-            INSERT INTO comanda (funcionario_id, mesa_id, horario_abertura, taxa_servico)
-            VALUES (?, ?, ?, ?)
-        """, (funcionario_id, mesa_id, horario_abertura, 10.0)) # Taxa de 10% por padrão
-        
-        # Obtém o ID da comanda recém-criada
-        id_comanda = cursor.lastrowid
-        conexao.commit()
-        
-        # Atualiza o status da mesa para 'ocupada'
-        alterar_status_mesa(mesa_id, 'ocupada')
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            # Registra o horário atual de abertura
+            horario_abertura = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            
+            # Insere a nova comanda com taxa de serviço padrão de 10%
+            cursor.execute("""
+                INSERT INTO comanda (funcionario_id, mesa_id, horario_abertura, taxa_servico)
+                VALUES (?, ?, ?, ?)
+            """, (funcionario_id, mesa_id, horario_abertura, 10.0)) # Taxa de 10% por padrão
+            
+            # Obtém o ID da comanda recém-criada
+            id_comanda = cursor.lastrowid
+            
+            # Atualiza o status da mesa para 'ocupada' (mesma transação)
+            registrar_status_mesa(conexao, mesa_id, 'ocupada')
         
         print(f"Comanda {id_comanda} aberta para mesa {mesa_id}")
         return id_comanda
     except sqlite3.Error as e:
         print(f"Erro ao abrir comanda: {e}")
-        conexao.rollback()
         return None
     finally:
-        conexao.close()
+        # A lista de mesas em cache traz a comanda aberta de cada mesa
+        invalidar("mesas")
 
 def adicionar_item_comanda(comanda_id, item_cardapio_id, quantidade):
     """
@@ -62,37 +75,64 @@ def adicionar_item_comanda(comanda_id, item_cardapio_id, quantidade):
     Returns:
         bool: True se sucesso, False se erro
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
-    try:
-        # 1. Buscar o valor unitário atual do item
-        cursor.execute(
-            "SELECT valor_unitario FROM item_cardapio WHERE id_item = ?",
-            (item_cardapio_id,)
-        )
-        resultado = cursor.fetchone()
-        if not resultado:
-            raise ValueError("Item de cardápio não encontrado")
+    return adicionar_itens_comanda(comanda_id, [(item_cardapio_id, quantidade)])
+
+@via_escritor
+def adicionar_itens_comanda(comanda_id, itens):
+    """
+    Adiciona vários itens do cardápio a uma comanda em uma única operação.
+    Os preços de todos os itens são buscados em uma só consulta e as linhas
+    são inseridas com executemany, na mesma transação: ou todo o pedido é
+    registrado, ou nada é.
+    
+    Args:
+        comanda_id (int): ID da comanda à qual adicionar os itens
+        itens (list): Lista de tuplas (item_cardapio_id, quantidade)
         
-        valor_unitario_momento = resultado[0]
+    Returns:
+        bool: True se sucesso, False se erro
+    """
+    try:
+        itens = [(int(id_item), int(qtd)) for id_item, qtd in itens]
+        if not itens:
+            raise ValueError("Nenhum item informado")
+        if any(qtd <= 0 for _, qtd in itens):
+            raise ValueError("A quantidade de cada item deve ser maior que zero")
         
-        # 2. Inserir na tabela de junção (comanda_item_cardapio)
-        # O valor_unitario_momento é armazenado para manter o histórico de preços
-        cursor.execute("""
-            INSERT INTO comanda_item_cardapio 
-            (comanda_id, item_cardapio_id, quantidade_item, valor_unitario_momento)
-            VALUES (?, ?, ?, ?)
-        """, (comanda_id, item_cardapio_id, quantidade, valor_unitario_momento))
+        with transacao() as conexao:
+            # 0. Itens só entram em comanda aberta: uma comanda fechada já foi
+            #    somada ao resumo de vendas e não pode mais mudar
+            aberta = conexao.execute(
+                "SELECT 1 FROM comanda WHERE id_comanda = ? AND horario_fechamento IS NULL",
+                (comanda_id,)
+            ).fetchone()
+            if not aberta:
+                raise ValueError("Comanda não encontrada ou já fechada.")
+
+            # 1. Buscar o valor unitário atual de todos os itens de uma vez
+            ids_distintos = sorted({id_item for id_item, _ in itens})
+            marcadores = ", ".join("?" for _ in ids_distintos)
+            precos = dict(conexao.execute(
+                f"SELECT id_item, valor_unitario FROM item_cardapio WHERE id_item IN ({marcadores})",
+                ids_distintos
+            ).fetchall())
+            faltando = [id_item for id_item in ids_distintos if id_item not in precos]
+            if faltando:
+                raise ValueError(f"Item de cardápio não encontrado: {faltando}")
+            
+            # 2. Inserir todas as linhas na tabela de junção (comanda_item_cardapio)
+            # O valor_unitario_momento é armazenado para manter o histórico de preços
+            conexao.executemany("""
+                INSERT INTO comanda_item_cardapio 
+                (comanda_id, item_cardapio_id, quantidade_item, valor_unitario_momento)
+                VALUES (?, ?, ?, ?)
+            """, [(comanda_id, id_item, qtd, precos[id_item]) for id_item, qtd in itens])
         
-        conexao.commit()
-        print(f"Item {item_cardapio_id} adicionado à comanda {comanda_id}")
+        print(f"{len(itens)} item(ns) adicionado(s) à comanda {comanda_id}")
         return True
     except (sqlite3.Error, ValueError) as e:
-        print(f"Erro ao adicionar item à comanda: {e}")
-        conexao.rollback()
+        print(f"Erro ao adicionar itens à comanda: {e}")
         return False
-    finally:
-        conexao.close()
 
 def consultar_itens_comanda(comanda_id):
     """
@@ -107,25 +147,151 @@ def consultar_itens_comanda(comanda_id):
               valor_unitario_momento, valor_total_item
               Retorna lista vazia se erro
     """
-    conn = get_db_connection()
-    try:
-        query = """
-            SELECT 
-                cic.id_comanda_item_cardapio,
-                ic.descricao,
-                cic.quantidade_item,
-                cic.valor_unitario_momento,
-                (cic.quantidade_item * cic.valor_unitario_momento) AS valor_total_item
-            FROM comanda_item_cardapio cic
-            JOIN item_cardapio ic ON cic.item_cardapio_id = ic.id_item
-            WHERE cic.comanda_id = ?
-        """
-        return conn.execute(query, (comanda_id,)).fetchall()
-    except sqlite3.Error as e:
-        print(f"Erro ao consultar itens da comanda: {e}")
-        return []
-    finally:
-        conn.close()
+    with obter_conexao(modo_dicionario=True) as conn:
+        try:
+            query = """
+                SELECT 
+                    cic.id_comanda_item_cardapio,
+                    ic.descricao,
+                    cic.quantidade_item,
+                    cic.valor_unitario_momento,
+                    (cic.quantidade_item * cic.valor_unitario_momento) AS valor_total_item
+                FROM comanda_item_cardapio cic
+                JOIN item_cardapio ic ON cic.item_cardapio_id = ic.id_item
+                WHERE cic.comanda_id = ?
+            """
+            return conn.execute(query, (comanda_id,)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar itens da comanda: {e}")
+            return []
+
+def obter_comanda(comanda_id, como_modelo=False):
+    """
+    Recupera os dados de uma comanda pelo ID.
+    
+    Args:
+        comanda_id (int): ID da comanda
+        como_modelo (bool): Se True, retorna uma instância de Comanda em vez da tupla
+        
+    Returns:
+        tuple: (id, funcionario_id, mesa_id, horario_abertura, horario_fechamento,
+               taxa_servico, valor_total), ou None se não encontrada ou erro
+    """
+    with obter_conexao() as conexao:
+        try:
+            cursor = conexao.execute("""
+                SELECT id_comanda, funcionario_id, mesa_id, horario_abertura,
+                       horario_fechamento, taxa_servico, valor_total
+                FROM comanda WHERE id_comanda = ?
+            """, (comanda_id,))
+            return hidratar_um(cursor, Comanda) if como_modelo else cursor.fetchone()
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar comanda: {e}")
+            return None
+
+# Limite de parâmetros por consulta ao filtrar por lista de IDs (IN)
+_TAMANHO_LOTE_IDS = 500
+
+def _calcular_totais_lote(conexao, ids_comanda=None):
+    """
+    Calcula subtotal, taxa de serviço e total de várias comandas em uma única
+    consulta (uma por lote de até _TAMANHO_LOTE_IDS IDs), lendo o subtotal
+    mantido na própria comanda.
+    
+    Args:
+        conexao (sqlite3.Connection): Conexão com row_factory = sqlite3.Row
+        ids_comanda (list): IDs das comandas; None para todas as comandas abertas
+        
+    Returns:
+        dict: id_comanda -> dict com subtotal, taxa_servico_valor, valor_total,
+              id_mesa, funcionario_id, horario_abertura e quantidade_itens
+    """
+    # subtotal_itens/quantidade_itens são mantidos por triggers a cada item
+    # incluído: ler o total é uma busca pela chave, sem somar as linhas
+    consulta = """
+        SELECT
+            c.id_comanda,
+            c.mesa_id,
+            c.funcionario_id,
+            c.horario_abertura,
+            c.quantidade_itens,
+            c.subtotal_itens AS subtotal,
+            c.subtotal_itens * COALESCE(c.taxa_servico, 0.0) / 100 AS taxa_servico_valor,
+            c.subtotal_itens * (1 + COALESCE(c.taxa_servico, 0.0) / 100) AS valor_total
+        FROM comanda c
+        WHERE {filtro}
+        ORDER BY c.id_comanda
+    """
+    if ids_comanda is None:
+        # O filtro coincide com o do índice parcial das comandas abertas
+        # (idx_comanda_mesa_aberta): o histórico não é percorrido. Quem
+        # garante o plano é o Benchmarks/verificar_planos.py, não uma dica
+        lotes = [(consulta.format(filtro="c.horario_fechamento IS NULL"), ())]
+    else:
+        ids = sorted({int(i) for i in ids_comanda})
+        lotes = []
+        for inicio in range(0, len(ids), _TAMANHO_LOTE_IDS):
+            lote = ids[inicio:inicio + _TAMANHO_LOTE_IDS]
+            marcadores = ", ".join("?" for _ in lote)
+            lotes.append((consulta.format(filtro=f"c.id_comanda IN ({marcadores})"), lote))
+
+    totais = {}
+    for sql, parametros in lotes:
+        for linha in conexao.execute(sql, parametros):
+            totais[linha["id_comanda"]] = {
+                "subtotal": linha["subtotal"],
+                "taxa_servico_valor": linha["taxa_servico_valor"],
+                "valor_total": linha["valor_total"],
+                "id_mesa": linha["mesa_id"],
+                "funcionario_id": linha["funcionario_id"],
+                "horario_abertura": linha["horario_abertura"],
+                "quantidade_itens": linha["quantidade_itens"],
+            }
+    return totais
+
+def _calcular_totais(conexao, comanda_id):
+    """
+    Calcula os totais de uma comanda usando a conexão informada.
+    Permite reutilizar o cálculo dentro de uma transação (ex: no fechamento).
+    
+    Args:
+        conexao (sqlite3.Connection): Conexão com row_factory = sqlite3.Row
+        comanda_id (int): ID da comanda
+        
+    Returns:
+        dict: subtotal, taxa_servico_valor, valor_total e id_mesa
+              (valores zerados e id_mesa None se a comanda não existir)
+    """
+    totais = _calcular_totais_lote(conexao, [comanda_id]).get(comanda_id)
+    if totais is None:
+        return {"subtotal": 0.0, "taxa_servico_valor": 0.0, "valor_total": 0.0, "id_mesa": None}
+    return {
+        "subtotal": totais["subtotal"],
+        "taxa_servico_valor": totais["taxa_servico_valor"],
+        "valor_total": totais["valor_total"],
+        "id_mesa": totais["id_mesa"]
+    }
+
+def calcular_totais_comandas(ids_comanda=None):
+    """
+    Calcula os totais de várias comandas de uma só vez (consulta única),
+    em vez de duas consultas por comanda.
+    Útil para a visão geral de todas as contas abertas do salão.
+    
+    Args:
+        ids_comanda (list): IDs das comandas; None (padrão) para todas as abertas
+        
+    Returns:
+        dict: id_comanda -> dict com subtotal, taxa_servico_valor, valor_total,
+              id_mesa, funcionario_id, horario_abertura e quantidade_itens
+              Retorna dicionário vazio se erro
+    """
+    with obter_conexao(modo_dicionario=True) as conn:
+        try:
+            return _calcular_totais_lote(conn, ids_comanda)
+        except sqlite3.Error as e:
+            print(f"Erro ao calcular totais das comandas: {e}")
+            return {}
 
 def calcular_total_comanda(comanda_id):
     """
@@ -142,48 +308,20 @@ def calcular_total_comanda(comanda_id):
             - id_mesa: ID da mesa associada à comanda
               Retorna None se erro
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        # 1. Calcular subtotal dos itens (soma de quantidade * valor)
-        cursor.execute("""
-            SELECT SUM(quantidade_item * valor_unitario_momento) 
-            FROM comanda_item_cardapio
-            WHERE comanda_id = ?
-        """, (comanda_id,))
-        subtotal_result = cursor.fetchone()
-        subtotal = subtotal_result[0] if subtotal_result[0] else 0.0
-
-        # 2. Obter taxa de serviço (ex: 10.0 para 10%) e mesa_id
-        cursor.execute(
-            "SELECT taxa_servico, mesa_id FROM comanda WHERE id_comanda = ?", 
-            (comanda_id,)
-        )
-        comanda_info = cursor.fetchone()
-        taxa_percentual = comanda_info["taxa_servico"] if comanda_info else 0.0
-        id_mesa = comanda_info["mesa_id"] if comanda_info else None
-
-        # 3. Calcular valor da taxa e total final
-        valor_taxa = (subtotal * taxa_percentual) / 100
-        valor_total = subtotal + valor_taxa
-        
-        return {
-            "subtotal": subtotal,
-            "taxa_servico_valor": valor_taxa,
-            "valor_total": valor_total,
-            "id_mesa": id_mesa
-        }
-
-    except sqlite3.Error as e:
-        print(f"Erro ao calcular total: {e}")
-        return None
-    finally:
-        conn.close()
+    with obter_conexao(modo_dicionario=True) as conn:
+        try:
+            return _calcular_totais(conn, comanda_id)
+        except sqlite3.Error as e:
+            print(f"Erro ao calcular total: {e}")
+            return None
 
+@via_escritor
 def fechar_comanda(comanda_id):
     """
     Fecha uma comanda aberta, calculando e registrando o valor total final.
     Também libera a mesa, marcando-a como 'livre'.
+    Cálculo, fechamento, resumo de vendas e liberação da mesa ocorrem em
+    uma única transação.
     
     Args:
         comanda_id (int): ID da comanda a fechar
@@ -191,36 +329,99 @@ def fechar_comanda(comanda_id):
     Returns:
         bool: True se sucesso, False se erro
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        # 1. Calcular o total final
-        totais = calcular_total_comanda(comanda_id)
-        if not totais:
-            raise Exception("Não foi possível calcular o total da comanda.")
+        with transacao(modo_dicionario=True) as conexao:
+            # 1. Calcular o total final (dentro da transação: nenhum item
+            #    pode ser incluído entre o cálculo e o fechamento)
+            totais = _calcular_totais(conexao, comanda_id)
+            valor_total_final = totais['valor_total']
+            id_mesa = totais['id_mesa']
+            
+            # 2. Atualizar a comanda com o total e o horário de fechamento
+            horario_fechamento = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            cursor = conexao.execute("""
+                UPDATE comanda
+                SET valor_total = ?, horario_fechamento = ?
+                WHERE id_comanda = ? AND horario_fechamento IS NULL
+            """, (valor_total_final, horario_fechamento, comanda_id))
+            if cursor.rowcount == 0:
+                raise ValueError("Comanda não encontrada ou já fechada.")
 
-        valor_total_final = totais['valor_total']
-        id_mesa = totais['id_mesa']
-        
-        # 2. Atualizar a comanda com o total e o horário de fechamento
-        horario_fechamento = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        cursor.execute("""
-            UPDATE comanda
-            SET valor_total = ?, horario_fechamento = ?
-            WHERE id_comanda = ?
-        """, (valor_total_final, horario_fechamento, comanda_id))
-        
-        conexao.commit()
+            # 3. Somar a comanda ao resumo diário de vendas (mesma transação)
+            registrar_resumo_comanda(conexao, comanda_id)
+
+            # 4. Retirar da fila da cozinha o que não chegou a ser preparado
+            retirar_comanda_da_fila(conexao, comanda_id)
 
-        # 3. Liberar a mesa
-        if id_mesa:
-            alterar_status_mesa(id_mesa, 'livre')
+            # 5. Liberar a mesa
+            if id_mesa:
+                registrar_status_mesa(conexao, id_mesa, 'livre')
             
         print(f"Comanda {comanda_id} fechada. Mesa {id_mesa} livre.")
         return True
-    except Exception as e:
+    except (sqlite3.Error, ValueError) as e:
         print(f"Erro ao fechar comanda: {e}")
-        conexao.rollback()
         return False
     finally:
-        conexao.close()
\ No newline at end of file
+        invalidar("mesas")
+
+def verificar_subtotais(corrigir=False):
+    """
+    Confere o subtotal e a quantidade de itens mantidos em cada comanda
+    contra a soma das linhas de comanda_item_cardapio.
+
+    A conferência só lê; o lock de escrita é reservado apenas para corrigir,
+    e as divergências são conferidas de novo dentro dele.
+    
+    Args:
+        corrigir (bool): Se True, reconstrói os valores das comandas divergentes
+        
+    Returns:
+        list: Lista de dicts com id_comanda, subtotal_itens, subtotal_calculado,
+              quantidade_itens e quantidade_calculada das comandas divergentes
+              Retorna None se erro
+    """
+    consulta = """
+        SELECT
+            c.id_comanda,
+            c.subtotal_itens,
+            COALESCE(s.subtotal, 0.0) AS subtotal_calculado,
+            c.quantidade_itens,
+            COALESCE(s.quantidade, 0) AS quantidade_calculada
+        FROM comanda c
+        LEFT JOIN (
+            SELECT
+                comanda_id,
+                SUM(quantidade_item * valor_unitario_momento) AS subtotal,
+                SUM(quantidade_item) AS quantidade
+            FROM comanda_item_cardapio
+            GROUP BY comanda_id
+        ) AS s ON s.comanda_id = c.id_comanda
+        WHERE ABS(c.subtotal_itens - COALESCE(s.subtotal, 0.0)) > 0.005
+           OR c.quantidade_itens <> COALESCE(s.quantidade, 0)
+        ORDER BY c.id_comanda
+    """
+    try:
+        with obter_conexao(modo_dicionario=True) as conexao:
+            # Uma só consulta, fora de transação: em WAL lê um retrato fixo
+            # do banco sem reservar o lock de escrita durante a varredura
+            divergentes = [dict(linha) for linha in conexao.execute(consulta)]
+            if corrigir and divergentes:
+                # Confirma sob o lock de escrita: itens podem ter sido lançados
+                # (ou outra correção concluída) desde a leitura
+                with transacao(modo_dicionario=True):
+                    divergentes = [dict(linha) for linha in conexao.execute(consulta)]
+                    conexao.executemany("""
+                        UPDATE comanda SET subtotal_itens = ?, quantidade_itens = ?
+                        WHERE id_comanda = ?
+                    """, [
+                        (d["subtotal_calculado"], d["quantidade_calculada"], d["id_comanda"])
+                        for d in divergentes
+                    ])
+        if divergentes:
+            acao = "corrigida(s)" if corrigir else "divergente(s)"
+            print(f"{len(divergentes)} comanda(s) com subtotal {acao}.")
+        return divergentes
+    except sqlite3.Error as e:
+        print(f"Erro ao verificar subtotais das comandas: {e}")
+        return None
@@ -0,0 +1,147 @@
+# Controllers/CozinhaController.py
+"""
+Controller da fila da cozinha.
+Cada linha de pedido (comanda_item_cardapio) incluída entra na fila como
+'pendente' e passa por 'preparando' até 'pronto'.
+
+Toda inclusão ou mudança de situação recebe um número de sequência
+crescente (seq_cozinha, mantido por triggers da migração 7). A tela da
+cozinha carrega uma vez as linhas em andamento e, a partir daí, pede apenas
+as linhas com sequência maior que a última vista: com nada de novo, cada
+consulta é uma única busca no índice, sem reler os pedidos já exibidos.
+
+Ao fechar a comanda, as linhas ainda pendentes ou em preparo saem da fila
+(status_preparo NULL) e também recebem um novo número de sequência: as
+telas as recebem na busca de alterações e as retiram.
+"""
+
+import sqlite3
+from Controllers.db_connection import obter_conexao, transacao
+from Controllers.escritor import via_escritor
+
+# Situações de preparo, na ordem em que a linha avança
+STATUS_PREPARO = ("pendente", "preparando", "pronto")
+
+# Máximo de linhas devolvidas por consulta de alterações
+LIMITE_ALTERACOES = 200
+
+_CONSULTA_LINHAS = """
+    SELECT
+        cic.id_comanda_item_cardapio,
+        cic.seq_cozinha,
+        cic.status_preparo,
+        cic.comanda_id,
+        c.mesa_id,
+        ic.descricao,
+        cic.quantidade_item,
+        cic.horario_pedido
+    FROM comanda_item_cardapio cic
+    JOIN comanda c ON c.id_comanda = cic.comanda_id
+    JOIN item_cardapio ic ON ic.id_item = cic.item_cardapio_id
+    WHERE {filtro}
+    ORDER BY cic.seq_cozinha
+"""
+
+def _linhas(cursor):
+    """Converte o resultado em uma lista de dicts."""
+    colunas = [descricao[0] for descricao in cursor.description]
+    return [dict(zip(colunas, linha)) for linha in cursor.fetchall()]
+
+def consultar_fila_cozinha():
+    """
+    Carga inicial da tela da cozinha: linhas pendentes ou em preparo de
+    comandas abertas. O filtro coincide com o do índice parcial das linhas
+    em andamento (idx_comanda_item_cozinha_ativos).
+
+    Returns:
+        tuple: (lista de dicts com id_comanda_item_cardapio, seq_cozinha,
+               status_preparo, comanda_id, mesa_id, descricao, quantidade_item
+               e horario_pedido; cursor para consultar_alteracoes_cozinha)
+               Retorna ([], None) se erro
+    """
+    with obter_conexao() as conexao:
+        try:
+            # O cursor é lido antes das linhas: o que for gravado entre as duas
+            # consultas fica acima dele e chega na próxima busca de alterações
+            (cursor_seq,) = conexao.execute("""
+                SELECT COALESCE(MAX(seq_cozinha), 0)
+                FROM comanda_item_cardapio WHERE seq_cozinha IS NOT NULL
+            """).fetchone()
+            linhas = _linhas(conexao.execute(_CONSULTA_LINHAS.format(
+                filtro="cic.status_preparo IN ('pendente', 'preparando') AND cic.seq_cozinha <= ? "
+                       "AND c.horario_fechamento IS NULL"
+            ), (cursor_seq,)))
+            return linhas, cursor_seq
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar fila da cozinha: {e}")
+            return [], None
+
+def consultar_alteracoes_cozinha(apos_seq, limite=LIMITE_ALTERACOES):
+    """
+    Retorna as linhas incluídas ou com situação alterada depois do cursor.
+    Uma linha que mudou de situação volta com a situação nova: 'pronto', ou
+    None quando a comanda foi fechada antes do preparo terminar. Nos dois
+    casos a tela retira a linha da fila.
+
+    Args:
+        apos_seq (int): Cursor devolvido pela consulta anterior
+        limite (int): Máximo de linhas; se vierem 'limite' linhas, pode haver mais
+
+    Returns:
+        tuple: (lista de dicts, no formato de consultar_fila_cozinha, novo cursor)
+               Retorna ([], apos_seq) se erro
+    """
+    with obter_conexao() as conexao:
+        try:
+            linhas = _linhas(conexao.execute(
+                _CONSULTA_LINHAS.format(filtro="cic.seq_cozinha > ?") + " LIMIT ?",
+                (apos_seq, limite)
+            ))
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar alterações da cozinha: {e}")
+            return [], apos_seq
+    return linhas, (linhas[-1]["seq_cozinha"] if linhas else apos_seq)
+
+def retirar_comanda_da_fila(conexao, comanda_id):
+    """
+    Retira da fila as linhas ainda pendentes ou em preparo de uma comanda
+    (status_preparo NULL). O trigger de situação dá a cada uma um novo
+    seq_cozinha, e assim as telas recebem a retirada na busca de alterações.
+    Não faz commit: deve ser chamada dentro da transação que fecha a comanda.
+
+    Args:
+        conexao (sqlite3.Connection): Conexão com a transação em andamento
+        comanda_id (int): ID da comanda
+    """
+    conexao.execute("""
+        UPDATE comanda_item_cardapio SET status_preparo = NULL
+        WHERE comanda_id = ? AND status_preparo IN ('pendente', 'preparando')
+    """, (comanda_id,))
+
+@via_escritor
+def alterar_status_preparo(id_linha, status):
+    """
+    Altera a situação de preparo de uma linha de pedido.
+
+    Args:
+        id_linha (int): ID da linha (id_comanda_item_cardapio)
+        status (str): Nova situação (uma de STATUS_PREPARO)
+
+    Returns:
+        bool: True se sucesso, False se erro
+    """
+    try:
+        if status not in STATUS_PREPARO:
+            raise ValueError(f"Situação de preparo inválida: {status}")
+        with transacao() as conexao:
+            # Linhas fora da fila (status NULL) não são da cozinha
+            cursor = conexao.execute("""
+                UPDATE comanda_item_cardapio SET status_preparo = ?
+                WHERE id_comanda_item_cardapio = ? AND status_preparo IS NOT NULL
+            """, (status, id_linha))
+            if cursor.rowcount == 0:
+                raise ValueError("Linha de pedido não encontrada ou fora da fila da cozinha.")
+        return True
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Erro ao alterar situação de preparo: {e}")
+        return False
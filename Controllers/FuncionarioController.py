@@ -5,48 +5,96 @@ Realiza inserção, consulta, alteração e exclusão de funcionários no banco
 """
 
 import sqlite3
-from Controllers.db_connection import conecta_bd
+from Controllers.db_connection import obter_conexao, transacao
+from Controllers.escritor import via_escritor
+from Controllers.cache import em_cache, invalidar
+from Controllers.ClienteController import normalizar_cpf
 from Models.Funcionario import Funcionario
+from Models.hidratacao import hidratar_linhas
 
+@via_escritor
 def incluir_funcionario(funcionario):
     """
     Insere um novo funcionário no banco de dados.
+    O CPF é normalizado (apenas dígitos) e deve ser único.
     
     Args:
         funcionario (Funcionario): Objeto Funcionario com os dados a serem inseridos
+        
+    Returns:
+        bool: True se sucesso, False se erro (ex: CPF já cadastrado)
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("""
-            INSERT INTO funcionario (cpf, nome) VALUES (?, ?)
-        """, (funcionario.get_cpf(), funcionario.get_nome()))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("""
+                INSERT INTO funcionario (cpf, nome) VALUES (?, ?)
+            """, (normalizar_cpf(funcionario.get_cpf()), funcionario.get_nome()))
+        return True
+    except sqlite3.IntegrityError:
+        print(f"Erro ao inserir funcionário: CPF {funcionario.get_cpf()} já cadastrado")
+        return False
     except sqlite3.Error as e:
         print(f"Erro ao inserir funcionário: {e}")
+        return False
     finally:
-        conexao.close()
+        invalidar("funcionarios")
+
+# Colunas lidas por consultar_funcionarios, na ordem das tuplas
+_COLUNAS_FUNCIONARIO = ("id_funcionario", "cpf", "nome")
 
-def consultar_funcionarios():
+@em_cache("funcionarios", tabelas=("funcionario",))
+def _linhas_funcionarios():
+    """Funcionários em tuplas (imutáveis), como ficam no cache compartilhado."""
+    with obter_conexao() as conexao:
+        try:
+            return conexao.execute(
+                f"SELECT {', '.join(_COLUNAS_FUNCIONARIO)} FROM funcionario ORDER BY nome"
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar funcionários: {e}")
+            return []
+
+def consultar_funcionarios(como_modelo=False):
     """
     Recupera todos os funcionários cadastrados, ordenados por nome.
+    Os modelos são criados a partir das tuplas em cache a cada chamada.
     
+    Args:
+        como_modelo (bool): Se True, retorna instâncias de Funcionario em vez de tuplas
+        
     Returns:
         list: Lista de tuplas (id, cpf, nome) ordenadas por nome
               Retorna lista vazia se houver erro
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
-    try:
-        cursor.execute("SELECT * FROM funcionario ORDER BY nome")
-        # Retorna lista de tuplas (id, cpf, nome)
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        print(f"Erro ao consultar funcionários: {e}")
-        return []
-    finally:
-        conexao.close()
+    linhas = _linhas_funcionarios()
+    return hidratar_linhas(linhas, _COLUNAS_FUNCIONARIO, Funcionario) if como_modelo else linhas
 
+def buscar_funcionario_por_cpf(cpf):
+    """
+    Localiza um funcionário pelo CPF (busca no índice único, O(log n)).
+    
+    Args:
+        cpf (str): CPF com ou sem pontuação
+        
+    Returns:
+        tuple: (id, cpf, nome), ou None se não encontrado ou erro
+    """
+    cpf = normalizar_cpf(cpf)
+    if not cpf:
+        return None
+    with obter_conexao() as conexao:
+        try:
+            # "cpf <> ''" permite usar o índice único parcial idx_funcionario_cpf_unico
+            return conexao.execute(
+                "SELECT id_funcionario, cpf, nome FROM funcionario WHERE cpf = ? AND cpf <> ''",
+                (cpf,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Erro ao buscar funcionário por CPF: {e}")
+            return None
+
+@via_escritor
 def excluir_funcionario(id_funcionario):
     """
     Remove um funcionário do banco de dados pelo ID.
@@ -54,35 +102,42 @@ def excluir_funcionario(id_funcionario):
     Args:
         id_funcionario (int): ID do funcionário a ser removido
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("DELETE FROM funcionario WHERE id_funcionario = ?", (id_funcionario,))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("DELETE FROM funcionario WHERE id_funcionario = ?", (id_funcionario,))
     except sqlite3.Error as e:
         print(f"Erro ao excluir funcionário: {e}")
-    finally:
-        conexao.close()
+    invalidar("funcionarios")
 
+@via_escritor
 def alterar_funcionario(funcionario):
     """
     Atualiza os dados de um funcionário existente no banco de dados.
+    O CPF é normalizado (apenas dígitos) e deve continuar único.
     
     Args:
         funcionario (Funcionario): Objeto Funcionario com os novos dados (deve conter o id_funcionario)
+        
+    Returns:
+        bool: True se sucesso, False se erro (ex: CPF de outro funcionário)
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("""
-            UPDATE funcionario SET cpf = ?, nome = ? WHERE id_funcionario = ?
-        """, (
-            funcionario.get_cpf(),
-            funcionario.get_nome(),
-            funcionario.get_id_funcionario()
-        ))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("""
+                UPDATE funcionario SET cpf = ?, nome = ? WHERE id_funcionario = ?
+            """, (
+                normalizar_cpf(funcionario.get_cpf()),
+                funcionario.get_nome(),
+                funcionario.get_id_funcionario()
+            ))
+        return True
+    except sqlite3.IntegrityError:
+        print(f"Erro ao alterar funcionário: CPF {funcionario.get_cpf()} já cadastrado")
+        return False
     except sqlite3.Error as e:
         print(f"Erro ao alterar funcionário: {e}")
+        return False
     finally:
-        conexao.close()
\ No newline at end of file
+        invalidar("funcionarios")
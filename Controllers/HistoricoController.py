@@ -0,0 +1,302 @@
+# Controllers/HistoricoController.py
+"""
+Controller do histórico de comandas (separação entre dados "quentes" e "frios").
+
+Comandas fechadas há mais de N dias, com seus itens e pagamentos, são movidas
+de restaurante.db para um banco de histórico separado. O banco principal fica
+só com o que o serviço usa no dia a dia (comandas recentes, mesas, cardápio):
+arquivo menor, índices mais rasos, cache mais eficiente e backups rápidos.
+
+Consultas que precisam de todo o período anexam o histórico à conexão
+(ATTACH) e leem as views temporárias *_geral, que unem as duas bases:
+
+    with historico_anexado() as conexao:
+        conexao.execute("SELECT ... FROM comanda_geral WHERE ...")
+
+O histórico é desanexado ao final do bloco: a conexão volta ao pool só com
+o banco principal, e as transações seguintes (BEGIN IMMEDIATE) não reservam
+também o lock do histórico.
+"""
+
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from Controllers import db_connection
+from Controllers.db_connection import obter_conexao, transacao, obter_perfil
+
+# Nome do banco de histórico dentro da conexão (ATTACH ... AS historico)
+ALIAS_HISTORICO = "historico"
+# Comandas fechadas há mais dias que isso são arquivadas
+DIAS_RETENCAO = int(os.environ.get("RESTAURANTE_ARQUIVAR_APOS_DIAS", "180"))
+# Comandas movidas por transação: mantém curto o lock de escrita do serviço
+TAMANHO_LOTE_ARQUIVO = 500
+
+# Linha de controle em contador_alteracao que suspende os incrementos por
+# linha dos triggers de remoção (migração 9) durante a remoção de um lote
+CONTROLE_REMOCAO_EM_LOTE = "remocao_em_lote"
+# Tabelas arquivadas com contador de alteração (ver alteracoes.py)
+TABELAS_CONTADAS = ("comanda", "comanda_item_cardapio")
+
+# Tabela arquivada -> coluna que a liga à comanda
+TABELAS_ARQUIVADAS = {
+    "comanda": "id_comanda",
+    "comanda_item_cardapio": "comanda_id",
+    "comanda_cliente": "comanda_id",
+}
+
+# Índices do histórico (consultas por período e por comanda)
+_INDICES_HISTORICO = (
+    "CREATE INDEX IF NOT EXISTS historico.idx_comanda_fechamento ON comanda (horario_fechamento)",
+    "CREATE INDEX IF NOT EXISTS historico.idx_comanda_item_comanda "
+    "ON comanda_item_cardapio (comanda_id, item_cardapio_id, quantidade_item, valor_unitario_momento)",
+    "CREATE INDEX IF NOT EXISTS historico.idx_comanda_cliente_comanda ON comanda_cliente (comanda_id)",
+)
+
+def _colunas(conexao, tabela, esquema="main"):
+    """Retorna os nomes das colunas de uma tabela, na ordem da definição."""
+    return [linha[1] for linha in conexao.execute(f"PRAGMA {esquema}.table_info({tabela})")]
+
+def _preparar_esquema_historico(conexao):
+    """
+    Cria no histórico as tabelas arquivadas, com a mesma definição do banco
+    principal, e acrescenta as colunas incluídas por migrações posteriores.
+    """
+    for tabela in TABELAS_ARQUIVADAS:
+        existentes = _colunas(conexao, tabela, ALIAS_HISTORICO)
+        if not existentes:
+            (sql,) = conexao.execute(
+                "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+            ).fetchone()
+            sql = re.sub(
+                r"^CREATE TABLE\s+(IF NOT EXISTS\s+)?[\"\[`]?\w+[\"\]`]?",
+                f"CREATE TABLE IF NOT EXISTS {ALIAS_HISTORICO}.{tabela}",
+                sql,
+            )
+            conexao.execute(sql)
+            continue
+        for coluna in conexao.execute(f"PRAGMA main.table_info({tabela})").fetchall():
+            _, nome, tipo, nao_nulo, padrao, _ = coluna
+            if nome in existentes:
+                continue
+            definicao = f"{nome} {tipo}"
+            if padrao is not None:
+                definicao += f" DEFAULT {padrao}"
+            if nao_nulo and padrao is not None:
+                definicao += " NOT NULL"
+            try:
+                conexao.execute(f"ALTER TABLE {ALIAS_HISTORICO}.{tabela} ADD COLUMN {definicao}")
+            except sqlite3.OperationalError as e:
+                # Outro processo pode ter incluído a coluna ao mesmo tempo
+                if "duplicate column" not in str(e):
+                    raise
+    for sql in _INDICES_HISTORICO:
+        conexao.execute(sql)
+
+def anexar_historico(conexao):
+    """
+    Anexa o banco de histórico à conexão e cria as views que unem as duas bases:
+    comanda_geral, comanda_item_cardapio_geral e comanda_cliente_geral.
+
+    Idempotente: em conexões que já anexaram o histórico não faz nada.
+    Deve ser chamada fora de transação (o SQLite não permite ATTACH dentro dela).
+    Prefira historico_anexado(), que também desanexa ao final.
+
+    Args:
+        conexao (sqlite3.Connection): Conexão com o banco principal
+
+    Returns:
+        bool: True se anexou agora, False se o histórico já estava anexado
+    """
+    if _historico_anexado(conexao):
+        return False
+
+    conexao.execute(
+        f"ATTACH DATABASE ? AS {ALIAS_HISTORICO}", (str(db_connection.DB_HISTORICO),)
+    )
+    try:
+        # O journal_mode do perfil vale por arquivo: aplica também ao histórico
+        modo = obter_perfil(db_connection.obter_pool().perfil)["journal_mode"]
+        conexao.execute(f"PRAGMA {ALIAS_HISTORICO}.journal_mode = {modo}").fetchone()
+        _preparar_esquema_historico(conexao)
+        for tabela, coluna in TABELAS_ARQUIVADAS.items():
+            colunas = ", ".join(_colunas(conexao, tabela))
+            # Entre a cópia e a remoção de um lote (arquivar_comandas) a comanda
+            # está nos dois bancos: a parte do histórico ignora as comandas que
+            # ainda estão no principal, para que nada seja contado duas vezes
+            conexao.execute(f"""
+                CREATE TEMP VIEW IF NOT EXISTS {tabela}_geral AS
+                SELECT {colunas} FROM main.{tabela}
+                UNION ALL
+                SELECT {colunas} FROM {ALIAS_HISTORICO}.{tabela} AS h
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM main.comanda AS m WHERE m.id_comanda = h.{coluna}
+                )
+            """)
+    except sqlite3.Error:
+        desanexar_historico(conexao)
+        raise
+    return True
+
+def _historico_anexado(conexao):
+    """Indica se o histórico está anexado à conexão."""
+    return ALIAS_HISTORICO in {linha[1] for linha in conexao.execute("PRAGMA database_list")}
+
+def desanexar_historico(conexao):
+    """
+    Remove da conexão as views *_geral e o banco de histórico anexado.
+    Uma transação ainda aberta na conexão é desfeita (DETACH não roda dentro dela).
+
+    Args:
+        conexao (sqlite3.Connection): Conexão com o histórico anexado
+    """
+    if conexao.in_transaction:
+        conexao.rollback()
+    for tabela in TABELAS_ARQUIVADAS:
+        conexao.execute(f"DROP VIEW IF EXISTS temp.{tabela}_geral")
+    if _historico_anexado(conexao):
+        conexao.execute(f"DETACH DATABASE {ALIAS_HISTORICO}")
+
+@contextmanager
+def historico_anexado(modo_dicionario=False):
+    """
+    Empresta uma conexão do pool com o histórico anexado (ver anexar_historico)
+    e o desanexa ao final do bloco, antes de a conexão voltar ao pool.
+
+    Blocos aninhados na mesma thread reutilizam a conexão; só o bloco que
+    anexou o histórico o desanexa.
+
+    Args:
+        modo_dicionario (bool): Se True, as linhas permitem acesso pelo nome da coluna
+
+    Yields:
+        sqlite3.Connection: Conexão com as views *_geral disponíveis
+    """
+    with obter_conexao(modo_dicionario) as conexao:
+        anexou = anexar_historico(conexao)
+        try:
+            yield conexao
+        finally:
+            if anexou:
+                desanexar_historico(conexao)
+
+def _copiar_para_historico(conexao, ids_comanda):
+    """Copia as comandas e suas linhas para o histórico (sem commit)."""
+    marcadores = ", ".join("?" for _ in ids_comanda)
+    copiadas = {}
+    for tabela, coluna in TABELAS_ARQUIVADAS.items():
+        colunas = ", ".join(_colunas(conexao, tabela))
+        # OR IGNORE: um lote interrompido antes da remoção pode ser copiado de novo
+        cursor = conexao.execute(f"""
+            INSERT OR IGNORE INTO {ALIAS_HISTORICO}.{tabela} ({colunas})
+            SELECT {colunas} FROM main.{tabela} WHERE {coluna} IN ({marcadores})
+        """, ids_comanda)
+        copiadas[tabela] = cursor.rowcount
+    return copiadas
+
+def _remover_do_principal(conexao, ids_comanda):
+    """
+    Remove do banco principal as comandas já copiadas (sem commit).
+    Os contadores de alteração sobem uma vez por tabela, não uma por linha.
+    """
+    marcadores = ", ".join("?" for _ in ids_comanda)
+    # Suspende os incrementos dos triggers de remoção (migração 9); a linha de
+    # controle some antes do commit, então nenhuma outra conexão a vê
+    conexao.execute(
+        "INSERT INTO main.contador_alteracao (tabela) VALUES (?)", (CONTROLE_REMOCAO_EM_LOTE,)
+    )
+    removidas = []
+    # A comanda sai primeiro: assim os gatilhos de subtotal disparados pela
+    # remoção dos itens não têm mais comanda a atualizar
+    for tabela, coluna in TABELAS_ARQUIVADAS.items():
+        cursor = conexao.execute(
+            f"DELETE FROM main.{tabela} WHERE {coluna} IN ({marcadores})", ids_comanda
+        )
+        if cursor.rowcount and tabela in TABELAS_CONTADAS:
+            removidas.append(tabela)
+    conexao.execute(
+        "DELETE FROM main.contador_alteracao WHERE tabela = ?", (CONTROLE_REMOCAO_EM_LOTE,)
+    )
+    for tabela in removidas:
+        conexao.execute(
+            "UPDATE main.contador_alteracao SET versao = versao + 1 WHERE tabela = ?", (tabela,)
+        )
+
+def arquivar_comandas(dias=None, lote=TAMANHO_LOTE_ARQUIVO):
+    """
+    Move para o banco de histórico as comandas fechadas há mais de 'dias' dias,
+    junto com seus itens (comanda_item_cardapio) e pagamentos (comanda_cliente).
+
+    Cada lote é copiado em uma transação e removido do banco principal em outra.
+    Como cada transação altera um único arquivo, uma interrupção no meio do
+    processo nunca perde dados: no pior caso o lote fica nos dois bancos e é
+    concluído na próxima execução. Enquanto isso, as views *_geral ignoram a
+    cópia do histórico das comandas ainda presentes no principal, então
+    leitores em outras conexões não contam o lote duas vezes. O resumo
+    diário de vendas permanece no banco principal, então os relatórios não
+    mudam.
+
+    Com o histórico anexado, o BEGIN IMMEDIATE de cada transação reserva o
+    lock de escrita dos dois arquivos: durante a cópia e durante a remoção
+    de um lote, as demais escritas esperam (busy_timeout). Lotes pequenos
+    mantêm essa espera curta.
+
+    Args:
+        dias (int): Idade mínima, em dias desde o fechamento (padrão: DIAS_RETENCAO)
+        lote (int): Comandas movidas por transação
+
+    Returns:
+        dict: Quantidade de linhas arquivadas por tabela, ou None se erro
+    """
+    dias = DIAS_RETENCAO if dias is None else dias
+    corte = (datetime.now() - timedelta(days=dias)).strftime("%Y-%m-%d %H:%M:%S")
+    totais = dict.fromkeys(TABELAS_ARQUIVADAS, 0)
+    try:
+        with historico_anexado() as conexao:
+            while True:
+                ids_comanda = [linha[0] for linha in conexao.execute("""
+                    SELECT id_comanda FROM main.comanda
+                    WHERE horario_fechamento IS NOT NULL AND horario_fechamento < ?
+                    ORDER BY horario_fechamento
+                    LIMIT ?
+                """, (corte, lote))]
+                if not ids_comanda:
+                    break
+                # 1. Copiar (a transação só altera o histórico)
+                with transacao():
+                    copiadas = _copiar_para_historico(conexao, ids_comanda)
+                # 2. Remover (a transação só altera o banco principal)
+                with transacao():
+                    _remover_do_principal(conexao, ids_comanda)
+                for tabela, quantidade in copiadas.items():
+                    totais[tabela] += quantidade
+        if totais["comanda"]:
+            print(
+                f"Arquivadas {totais['comanda']} comanda(s) fechadas antes de {corte} "
+                f"({totais['comanda_item_cardapio']} item(ns), "
+                f"{totais['comanda_cliente']} pagamento(s))."
+            )
+        return totais
+    except sqlite3.Error as e:
+        print(f"Erro ao arquivar comandas: {e}")
+        return None
+
+def compactar_banco_principal():
+    """
+    Devolve ao sistema de arquivos o espaço liberado pelo arquivamento (VACUUM).
+    Bloqueia o banco durante a execução: rodar fora do horário de atendimento.
+
+    Returns:
+        bool: True se sucesso, False se erro
+    """
+    try:
+        with obter_conexao() as conexao:
+            conexao.execute("VACUUM main")
+            # Em WAL o VACUUM grava no arquivo -wal; o checkpoint leva as
+            # páginas ao banco e trunca o arquivo
+            conexao.execute("PRAGMA main.wal_checkpoint(TRUNCATE)").fetchone()
+        return True
+    except sqlite3.Error as e:
+        print(f"Erro ao compactar o banco de dados: {e}")
+        return False
@@ -5,9 +5,13 @@ Realiza inserção, consulta, alteração e exclusão de itens no banco de dados
 """
 
 import sqlite3
-from Controllers.db_connection import conecta_bd
+from Controllers.db_connection import obter_conexao, obter_pool, transacao
+from Controllers.escritor import via_escritor
+from Controllers.cache import em_cache, invalidar
 from Models.ItemCardapio import ItemCardapio
+from Models.hidratacao import hidratar_linhas
 
+@via_escritor
 def incluir_item(item):
     """
     Insere um novo item no cardápio do banco de dados.
@@ -15,43 +19,120 @@ def incluir_item(item):
     Args:
         item (ItemCardapio): Objeto ItemCardapio com os dados a serem inseridos
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("""
-            INSERT INTO item_cardapio (descricao, sub_descricao, valor_unitario) 
-            VALUES (?, ?, ?)
-        """, (
-            item.get_descricao(), 
-            item.get_sub_descricao(), 
-            item.get_valor_unitario()
-        ))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("""
+                INSERT INTO item_cardapio (descricao, sub_descricao, valor_unitario) 
+                VALUES (?, ?, ?)
+            """, (
+                item.get_descricao(), 
+                item.get_sub_descricao(), 
+                item.get_valor_unitario()
+            ))
     except sqlite3.Error as e:
         print(f"Erro ao inserir item: {e}")
-    finally:
-        conexao.close()
+    invalidar("cardapio")
 
-def consultar_itens():
+# Colunas lidas por consultar_itens, na ordem das tuplas
+_COLUNAS_ITEM = ("id_item", "descricao", "sub_descricao", "valor_unitario")
+
+@em_cache("cardapio", tabelas=("item_cardapio",))
+def _linhas_itens():
+    """Itens do cardápio em tuplas (imutáveis), como ficam no cache compartilhado."""
+    with obter_conexao() as conexao:
+        try:
+            return conexao.execute(
+                f"SELECT {', '.join(_COLUNAS_ITEM)} FROM item_cardapio ORDER BY descricao"
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar itens: {e}")
+            return []
+
+def consultar_itens(como_modelo=False):
     """
     Recupera todos os itens do cardápio, ordenados por descrição.
+    Os modelos são criados a partir das tuplas em cache a cada chamada.
     
+    Args:
+        como_modelo (bool): Se True, retorna instâncias de ItemCardapio em vez de tuplas
+        
     Returns:
         list: Lista de tuplas (id, descricao, sub_descricao, valor_unitario) ordenadas por descrição
               Retorna lista vazia se houver erro
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
-    try:
-        cursor.execute("SELECT * FROM item_cardapio ORDER BY descricao")
-        # (id, desc, sub_desc, valor)
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        print(f"Erro ao consultar itens: {e}")
+    linhas = _linhas_itens()
+    return hidratar_linhas(linhas, _COLUNAS_ITEM, ItemCardapio) if como_modelo else linhas
+
+# (pool, bool): se o banco do pool possui o índice FTS5 do cardápio.
+# Verificado uma vez por pool: configurar_pool para outro banco refaz a verificação
+_fts_disponivel = (None, None)
+
+def _possui_fts(conexao):
+    """Verifica (uma vez por pool) se a tabela item_cardapio_fts existe no banco."""
+    global _fts_disponivel
+    pool = obter_pool()
+    pool_verificado, disponivel = _fts_disponivel
+    if pool_verificado is not pool:
+        disponivel = conexao.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'item_cardapio_fts'"
+        ).fetchone() is not None
+        _fts_disponivel = (pool, disponivel)
+    return disponivel
+
+def _consulta_fts(termo):
+    """
+    Converte o texto digitado em uma consulta FTS5 por prefixo.
+    Cada palavra vira um termo entre aspas com '*' (todas devem aparecer):
+    'pizza cal' -> '"pizza"* "cal"*'
+    """
+    palavras = termo.replace('"', ' ').split()
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+def buscar_itens(termo, limite=20):
+    """
+    Busca itens do cardápio por prefixo de palavras na descrição e na sub-descrição,
+    ordenados por relevância (BM25, com peso maior para a descrição).
+    Pensada para busca enquanto o usuário digita: 'cap' encontra 'Caipirinha'.
+    
+    Args:
+        termo (str): Texto digitado (uma ou mais palavras ou inícios de palavras)
+        limite (int): Quantidade máxima de itens retornados
+        
+    Returns:
+        list: Lista de tuplas (id, descricao, sub_descricao, valor_unitario) por relevância
+              Retorna lista vazia se o termo for vazio ou houver erro
+    """
+    consulta_fts = _consulta_fts(termo or "")
+    if not consulta_fts:
         return []
-    finally:
-        conexao.close()
+    
+    with obter_conexao() as conexao:
+        try:
+            if _possui_fts(conexao):
+                return conexao.execute("""
+                    SELECT ic.id_item, ic.descricao, ic.sub_descricao, ic.valor_unitario
+                    FROM item_cardapio_fts
+                    JOIN item_cardapio ic ON ic.id_item = item_cardapio_fts.rowid
+                    WHERE item_cardapio_fts MATCH ?
+                    ORDER BY bm25(item_cardapio_fts, 10.0, 1.0)
+                    LIMIT ?
+                """, (consulta_fts, limite)).fetchall()
+            
+            # Alternativa sem FTS5: LIKE por substring (sem índice)
+            padrao = f"%{termo.strip()}%"
+            return conexao.execute("""
+                SELECT id_item, descricao, sub_descricao, valor_unitario
+                FROM item_cardapio
+                WHERE descricao LIKE ? OR sub_descricao LIKE ?
+                ORDER BY descricao
+                LIMIT ?
+            """, (padrao, padrao, limite)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Erro ao buscar itens: {e}")
+            return []
 
+@via_escritor
 def excluir_item(id_item):
     """
     Remove um item do cardápio do banco de dados pelo ID.
@@ -59,16 +140,15 @@ def excluir_item(id_item):
     Args:
         id_item (int): ID do item a ser removido
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("DELETE FROM item_cardapio WHERE id_item = ?", (id_item,))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("DELETE FROM item_cardapio WHERE id_item = ?", (id_item,))
     except sqlite3.Error as e:
         print(f"Erro ao excluir item: {e}")
-    finally:
-        conexao.close()
+    invalidar("cardapio")
 
+@via_escritor
 def alterar_item(item):
     """
     Atualiza os dados de um item existente no cardápio do banco de dados.
@@ -76,21 +156,19 @@ def alterar_item(item):
     Args:
         item (ItemCardapio): Objeto ItemCardapio com os novos dados (deve conter o id_item)
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("""
-            UPDATE item_cardapio 
-            SET descricao = ?, sub_descricao = ?, valor_unitario = ? 
-            WHERE id_item = ?
-        """, (
-            item.get_descricao(),
-            item.get_sub_descricao(),
-            item.get_valor_unitario(),
-            item.get_id_item()
-        ))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("""
+                UPDATE item_cardapio 
+                SET descricao = ?, sub_descricao = ?, valor_unitario = ? 
+                WHERE id_item = ?
+            """, (
+                item.get_descricao(),
+                item.get_sub_descricao(),
+                item.get_valor_unitario(),
+                item.get_id_item()
+            ))
     except sqlite3.Error as e:
         print(f"Erro ao alterar item: {e}")
-    finally:
-        conexao.close()
\ No newline at end of file
+    invalidar("cardapio")
@@ -3,12 +3,25 @@
 Controller para gerenciar operações CRUD de Mesas.
 Realiza inserção, consulta, alteração e exclusão de mesas no banco de dados.
 Também gerencia o status (livre/ocupada/reservada) das mesas.
+
+As consultas de mesas ficam em cache e são refeitas apenas quando os
+contadores de alteração das tabelas lidas mudam (ver Controllers/alteracoes.py),
+o que inclui escritas de outros processos, como a API HTTP.
 """
 
 import sqlite3
-from Controllers.db_connection import conecta_bd, get_db_connection
+from Controllers.db_connection import obter_conexao, transacao
+from Controllers.escritor import via_escritor
+from Controllers.cache import em_cache, invalidar
 from Models.Mesa import Mesa
+from Models.hidratacao import hidratar_linhas
+
+# Tabelas cujas escritas mudam as consultas de mesas com suas comandas
+TABELAS_MESAS = ("mesa", "comanda")
+# O quadro do salão também mostra os itens lançados em cada comanda
+TABELAS_QUADRO_SALAO = TABELAS_MESAS + ("comanda_item_cardapio",)
 
+@via_escritor
 def incluir_mesa(mesa):
     """
     Insere uma nova mesa no banco de dados.
@@ -16,38 +29,48 @@ def incluir_mesa(mesa):
     Args:
         mesa (Mesa): Objeto Mesa com os dados a serem inseridos
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("""
-            INSERT INTO mesa (status, capacidade) VALUES (?, ?)
-        """, (mesa.get_status(), mesa.get_capacidade()))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("""
+                INSERT INTO mesa (status, capacidade) VALUES (?, ?)
+            """, (mesa.get_status(), mesa.get_capacidade()))
     except sqlite3.Error as e:
         print(f"Erro ao inserir mesa: {e}")
-    finally:
-        conexao.close()
+    invalidar("mesas")
+
+# Colunas lidas por consultar_mesas, na ordem das tuplas
+_COLUNAS_MESA = ("id_mesa", "status", "capacidade")
 
-def consultar_mesas():
+@em_cache("mesas", tabelas=("mesa",))
+def _linhas_mesas():
+    """Mesas em tuplas (imutáveis), como ficam no cache compartilhado."""
+    with obter_conexao() as conexao:
+        try:
+            return conexao.execute(
+                f"SELECT {', '.join(_COLUNAS_MESA)} FROM mesa ORDER BY id_mesa"
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar mesas: {e}")
+            return []
+
+def consultar_mesas(como_modelo=False):
     """
     Recupera todas as mesas cadastradas, ordenadas por ID.
+    As instâncias de Mesa são criadas a cada chamada: o cache guarda só as
+    tuplas, e alterar um modelo não afeta as outras sessões.
     
+    Args:
+        como_modelo (bool): Se True, retorna instâncias de Mesa em vez de tuplas
+        
     Returns:
         list: Lista de tuplas (id, status, capacidade) ordenadas por id
               Retorna lista vazia se houver erro
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
-    try:
-        cursor.execute("SELECT * FROM mesa ORDER BY id_mesa")
-        # (id, status, capacidade)
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        print(f"Erro ao consultar mesas: {e}")
-        return []
-    finally:
-        conexao.close()
+    linhas = _linhas_mesas()
+    return hidratar_linhas(linhas, _COLUNAS_MESA, Mesa) if como_modelo else linhas
 
+@em_cache("mesas", tabelas=TABELAS_MESAS)
 def consultar_mesas_com_comanda():
     """
     Consulta mesas e, se estiverem ocupadas, a comanda aberta associada.
@@ -57,25 +80,59 @@ def consultar_mesas_com_comanda():
         list: Lista de dicts com {id_mesa, status, capacidade, id_comanda}
               Retorna lista vazia se houver erro
     """
-    conn = get_db_connection()
-    try:
-        query = """
-            SELECT 
-                m.id_mesa, 
-                m.status, 
-                m.capacidade,
-                c.id_comanda
-            FROM mesa m
-            LEFT JOIN comanda c ON m.id_mesa = c.mesa_id AND c.horario_fechamento IS NULL
-            ORDER BY m.id_mesa
-        """
-        return conn.execute(query).fetchall()
-    except sqlite3.Error as e:
-        print(f"Erro ao consultar mesas com comanda: {e}")
-        return []
-    finally:
-        conn.close()
+    with obter_conexao(modo_dicionario=True) as conn:
+        try:
+            query = """
+                SELECT 
+                    m.id_mesa, 
+                    m.status, 
+                    m.capacidade,
+                    c.id_comanda
+                FROM mesa m
+                LEFT JOIN comanda c ON m.id_mesa = c.mesa_id AND c.horario_fechamento IS NULL
+                ORDER BY m.id_mesa
+            """
+            return conn.execute(query).fetchall()
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar mesas com comanda: {e}")
+            return []
 
+@em_cache("mesas", tabelas=TABELAS_QUADRO_SALAO)
+def consultar_quadro_salao():
+    """
+    Consulta o quadro do salão: cada mesa com a comanda aberta, a quantidade
+    de itens e o subtotal já lançados.
+    
+    O resultado fica em cache, compartilhado por todas as telas, e só é
+    consultado de novo quando mesas, comandas ou itens lançados mudam: uma tela que
+    atualiza o quadro sem que nada tenha mudado não lê nenhuma tabela.
+    
+    Returns:
+        list: Lista de sqlite3.Row com {id_mesa, status, capacidade, id_comanda,
+              horario_abertura, quantidade_itens, subtotal_itens}
+              (campos da comanda None em mesas sem comanda aberta)
+              Retorna lista vazia se houver erro
+    """
+    with obter_conexao(modo_dicionario=True) as conexao:
+        try:
+            return conexao.execute("""
+                SELECT
+                    m.id_mesa,
+                    m.status,
+                    m.capacidade,
+                    c.id_comanda,
+                    c.horario_abertura,
+                    c.quantidade_itens,
+                    c.subtotal_itens
+                FROM mesa m
+                LEFT JOIN comanda c ON m.id_mesa = c.mesa_id AND c.horario_fechamento IS NULL
+                ORDER BY m.id_mesa
+            """).fetchall()
+        except sqlite3.Error as e:
+            print(f"Erro ao consultar quadro do salão: {e}")
+            return []
+
+@via_escritor
 def excluir_mesa(id_mesa):
     """
     Remove uma mesa do banco de dados pelo ID.
@@ -83,16 +140,15 @@ def excluir_mesa(id_mesa):
     Args:
         id_mesa (int): ID da mesa a ser removida
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("DELETE FROM mesa WHERE id_mesa = ?", (id_mesa,))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("DELETE FROM mesa WHERE id_mesa = ?", (id_mesa,))
     except sqlite3.Error as e:
         print(f"Erro ao excluir mesa: {e}")
-    finally:
-        conexao.close()
+    invalidar("mesas")
 
+@via_escritor
 def alterar_mesa(mesa):
     """
     Atualiza os dados de uma mesa existente no banco de dados.
@@ -100,22 +156,37 @@ def alterar_mesa(mesa):
     Args:
         mesa (Mesa): Objeto Mesa com os novos dados (deve conter o id_mesa)
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute("""
-            UPDATE mesa SET status = ?, capacidade = ? WHERE id_mesa = ?
-        """, (
-            mesa.get_status(),
-            mesa.get_capacidade(),
-            mesa.get_id_mesa()
-        ))
-        conexao.commit()
+        with transacao() as conexao:
+            cursor = conexao.cursor()
+            cursor.execute("""
+                UPDATE mesa SET status = ?, capacidade = ? WHERE id_mesa = ?
+            """, (
+                mesa.get_status(),
+                mesa.get_capacidade(),
+                mesa.get_id_mesa()
+            ))
     except sqlite3.Error as e:
         print(f"Erro ao alterar mesa: {e}")
-    finally:
-        conexao.close()
+    invalidar("mesas")
+
+def registrar_status_mesa(conexao, id_mesa, novo_status):
+    """
+    Grava o novo status da mesa usando a conexão (e a transação) informada.
+    Não faz commit nem trata erros: serve para compor operações maiores,
+    como abrir e fechar comandas, dentro de uma única transação.
+    
+    Args:
+        conexao (sqlite3.Connection): Conexão com a transação em andamento
+        id_mesa (int): ID da mesa a ser atualizada
+        novo_status (str): Novo status ('livre', 'ocupada' ou 'reservada')
+    """
+    conexao.execute(
+        "UPDATE mesa SET status = ? WHERE id_mesa = ?", 
+        (novo_status, id_mesa)
+    )
 
+@via_escritor
 def alterar_status_mesa(id_mesa, novo_status):
     """
     Altera apenas o status de uma mesa (sem modificar capacidade).
@@ -125,15 +196,9 @@ def alterar_status_mesa(id_mesa, novo_status):
         id_mesa (int): ID da mesa a ser atualizada
         novo_status (str): Novo status ('livre', 'ocupada' ou 'reservada')
     """
-    conexao = conecta_bd()
-    cursor = conexao.cursor()
     try:
-        cursor.execute(
-            "UPDATE mesa SET status = ? WHERE id_mesa = ?", 
-            (novo_status, id_mesa)
-        )
-        conexao.commit()
+        with transacao() as conexao:
+            registrar_status_mesa(conexao, id_mesa, novo_status)
     except sqlite3.Error as e:
         print(f"Erro ao alterar status da mesa: {e}")
-    finally:
-        conexao.close()
\ No newline at end of file
+    invalidar("mesas")
@@ -0,0 +1,319 @@
+# Controllers/RelatorioController.py
+"""
+Controller de relatórios de vendas.
+Calcula faturamento por dia e por hora, ticket médio, itens mais vendidos
+e faturamento por funcionário a partir das comandas fechadas.
+
+Os relatórios leem as tabelas de resumo diário (resumo_vendas_*), mantidas
+pelo ResumoVendasController no fechamento de cada comanda: um período de
+um ano são algumas centenas de linhas por relatório, qualquer que seja o
+volume de itens vendidos. O banco devolve poucas linhas já agrupadas, e o
+pandas/NumPy completa os cálculos de forma vetorizada (sem laços em Python).
+
+A listagem detalhada de comandas lê o banco principal e o banco de histórico
+juntos (ATTACH), então comandas já arquivadas continuam aparecendo.
+"""
+
+import sqlite3
+from datetime import date, datetime, timedelta
+from Controllers.db_connection import obter_conexao
+from Controllers.HistoricoController import historico_anexado
+from Services.importacao import importar
+
+# Critérios aceitos para o ranking de itens
+CRITERIOS_ITENS = ("quantidade", "receita")
+
+def _limites(inicio, fim):
+    """
+    Converte o período nos limites da coluna 'dia' dos resumos.
+
+    Args:
+        inicio (date): Primeiro dia do período
+        fim (date): Último dia do período (inclusive)
+
+    Returns:
+        tuple: (primeiro dia, último dia) no formato 'AAAA-MM-DD'
+    """
+    if isinstance(inicio, datetime):
+        inicio = inicio.date()
+    if isinstance(fim, datetime):
+        fim = fim.date()
+    return inicio.isoformat(), fim.isoformat()
+
+def _consultar(consulta, parametros, tipos, historico=False):
+    """
+    Executa uma consulta de agregação e retorna o resultado como DataFrame.
+
+    Args:
+        consulta (str): SQL da agregação
+        parametros (tuple): Parâmetros da consulta
+        tipos (dict): Coluna -> dtype; garante colunas numéricas mesmo sem linhas
+        historico (bool): Se True, anexa o banco de histórico antes da consulta
+
+    Returns:
+        DataFrame: Resultado da consulta (vazio, com as colunas informadas, se erro)
+    """
+    pd = importar("pandas")
+    try:
+        with (historico_anexado() if historico else obter_conexao()) as conexao:
+            df = pd.read_sql_query(consulta, conexao, params=parametros)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        print(f"Erro ao consultar relatório: {e}")
+        df = pd.DataFrame(columns=list(tipos))
+    return df.astype(tipos)
+
+def vendas_por_dia(inicio, fim):
+    """
+    Totais de cada dia do período com comandas fechadas.
+    É a base dos relatórios por dia e do ticket médio.
+
+    Args:
+        inicio (date): Primeiro dia do período
+        fim (date): Último dia do período (inclusive)
+
+    Returns:
+        DataFrame: Colunas dia (datetime64), comandas, faturamento, subtotal, quantidade_itens
+    """
+    pd = importar("pandas")
+    df = _consultar("""
+        SELECT dia, comandas, faturamento, subtotal, quantidade_itens
+        FROM resumo_vendas_dia
+        WHERE dia BETWEEN ? AND ?
+    """, _limites(inicio, fim), {
+        "dia": "object", "comandas": "int64", "faturamento": "float64",
+        "subtotal": "float64", "quantidade_itens": "int64",
+    })
+    df["dia"] = pd.to_datetime(df["dia"])
+    return df
+
+def vendas_por_hora(inicio, fim):
+    """
+    Comandas e faturamento por hora de fechamento, somando os dias do período.
+
+    Args:
+        inicio (date): Primeiro dia do período
+        fim (date): Último dia do período (inclusive)
+
+    Returns:
+        DataFrame: Colunas hora (int), comandas, faturamento
+    """
+    return _consultar("""
+        SELECT hora, SUM(comandas) AS comandas, SUM(faturamento) AS faturamento
+        FROM resumo_vendas_hora
+        WHERE dia BETWEEN ? AND ?
+        GROUP BY hora
+    """, _limites(inicio, fim), {
+        "hora": "int64", "comandas": "int64", "faturamento": "float64",
+    })
+
+def faturamento_por_dia(inicio, fim, base=None):
+    """
+    Faturamento, quantidade de comandas e ticket médio de cada dia do período.
+    Dias sem vendas aparecem com zero.
+
+    Args:
+        inicio (date): Primeiro dia do período
+        fim (date): Último dia do período (inclusive)
+        base (DataFrame): Resultado de vendas_por_dia() já carregado (opcional)
+
+    Returns:
+        DataFrame: Índice dia; colunas comandas, faturamento, ticket_medio
+    """
+    pd = importar("pandas")
+    np = importar("numpy")
+    if base is None:
+        base = vendas_por_dia(inicio, fim)
+    dias = pd.date_range(pd.Timestamp(inicio), pd.Timestamp(fim), freq="D", name="dia")
+    df = (
+        base.set_index("dia")[["comandas", "faturamento"]]
+        .reindex(dias, fill_value=0)
+    )
+    df["ticket_medio"] = np.divide(
+        df["faturamento"].to_numpy(dtype=float),
+        df["comandas"].to_numpy(dtype=float),
+        out=np.zeros(len(df)),
+        where=df["comandas"].to_numpy() > 0,
+    )
+    return df
+
+def faturamento_por_hora(inicio, fim, base=None):
+    """
+    Faturamento e quantidade de comandas por hora do dia (0 a 23),
+    somando todos os dias do período.
+
+    Args:
+        inicio (date): Primeiro dia do período
+        fim (date): Último dia do período (inclusive)
+        base (DataFrame): Resultado de vendas_por_hora() já carregado (opcional)
+
+    Returns:
+        DataFrame: Índice hora; colunas comandas, faturamento
+    """
+    if base is None:
+        base = vendas_por_hora(inicio, fim)
+    return (
+        base.set_index("hora")[["comandas", "faturamento"]]
+        .reindex(range(24), fill_value=0)
+        .rename_axis("hora")
+    )
+
+def ticket_medio(inicio, fim, base=None):
+    """
+    Totais do período: faturamento, comandas e ticket médio.
+
+    Args:
+        inicio (date): Primeiro dia do período
+        fim (date): Último dia do período (inclusive)
+        base (DataFrame): Resultado de vendas_por_dia() já carregado (opcional)
+
+    Returns:
+        dict: faturamento, comandas, ticket_medio
+    """
+    if base is None:
+        base = vendas_por_dia(inicio, fim)
+    faturamento = float(base["faturamento"].sum())
+    comandas = int(base["comandas"].sum())
+    return {
+        "faturamento": faturamento,
+        "comandas": comandas,
+        "ticket_medio": faturamento / comandas if comandas else 0.0,
+    }
+
+def vendas_por_item(inicio, fim):
+    """
+    Quantidade e receita de cada item do cardápio vendido no período.
+
+    Args:
+        inicio (date): Primeiro dia do período
+        fim (date): Último dia do período (inclusive)
+
+    Returns:
+        DataFrame: Colunas id_item, descricao, quantidade, receita, participacao
+                   (fração da receita de itens do período)
+    """
+    df = _consultar("""
+        SELECT
+            r.item_cardapio_id AS id_item,
+            ic.descricao,
+            SUM(r.quantidade) AS quantidade,
+            SUM(r.receita) AS receita
+        FROM resumo_vendas_item r
+        LEFT JOIN item_cardapio ic ON ic.id_item = r.item_cardapio_id
+        WHERE r.dia BETWEEN ? AND ?
+        GROUP BY r.item_cardapio_id
+    """, _limites(inicio, fim), {
+        "id_item": "int64", "descricao": "object", "quantidade": "int64", "receita": "float64",
+    })
+    total = df["receita"].sum()
+    df["participacao"] = df["receita"] / total if total else 0.0
+    return df
+
+def itens_mais_vendidos(inicio, fim, limite=10, criterio="quantidade", base=None):
+    """
+    Ranking dos itens do cardápio vendidos no período.
+
+    Args:
+        inicio (date): Primeiro dia do período
+        fim (date): Último dia do período (inclusive)
+        limite (int): Quantidade de itens no ranking
+        criterio (str): 'quantidade' ou 'receita'
+        base (DataFrame): Resultado de vendas_por_item() já carregado (opcional)
+
+    Returns:
+        DataFrame: Mesmas colunas de vendas_por_item(), com os maiores valores do critério
+    """
+    if criterio not in CRITERIOS_ITENS:
+        raise ValueError(f"Critério inválido: {criterio}. Use {CRITERIOS_ITENS}.")
+    if base is None:
+        base = vendas_por_item(inicio, fim)
+    return base.nlargest(limite, criterio).reset_index(drop=True)
+
+def faturamento_por_funcionario(inicio, fim):
+    """
+    Faturamento, comandas e ticket médio de cada funcionário no período.
+
+    Args:
+        inicio (date): Primeiro dia do período
+        fim (date): Último dia do período (inclusive)
+
+    Returns:
+        DataFrame: Colunas funcionario_id, nome, comandas, faturamento, ticket_medio,
+                   ordenado pelo faturamento
+    """
+    df = _consultar("""
+        SELECT
+            r.funcionario_id,
+            f.nome,
+            SUM(r.comandas) AS comandas,
+            SUM(r.faturamento) AS faturamento
+        FROM resumo_vendas_funcionario r
+        LEFT JOIN funcionario f ON f.id_funcionario = r.funcionario_id
+        WHERE r.dia BETWEEN ? AND ?
+        GROUP BY r.funcionario_id
+    """, _limites(inicio, fim), {
+        "funcionario_id": "int64", "nome": "object", "comandas": "int64", "faturamento": "float64",
+    })
+    df["ticket_medio"] = df["faturamento"] / df["comandas"].where(df["comandas"] > 0)
+    df["ticket_medio"] = df["ticket_medio"].fillna(0.0)
+    return df.sort_values("faturamento", ascending=False).reset_index(drop=True)
+
+def consultar_comandas_fechadas(inicio, fim, limite=200):
+    """
+    Lista as comandas fechadas no período, das mais recentes para as mais antigas,
+    incluindo as já movidas para o banco de histórico.
+
+    Args:
+        inicio (date): Primeiro dia do período
+        fim (date): Último dia do período (inclusive)
+        limite (int): Quantidade máxima de comandas
+
+    Returns:
+        DataFrame: Colunas id_comanda, horario_abertura, horario_fechamento, mesa_id,
+                   funcionario, quantidade_itens, valor_total
+    """
+    primeiro_dia, ultimo_dia = _limites(inicio, fim)
+    dia_seguinte = (date.fromisoformat(ultimo_dia) + timedelta(days=1)).isoformat()
+    return _consultar("""
+        SELECT
+            c.id_comanda,
+            c.horario_abertura,
+            c.horario_fechamento,
+            c.mesa_id,
+            f.nome AS funcionario,
+            c.quantidade_itens,
+            c.valor_total
+        FROM comanda_geral c
+        LEFT JOIN funcionario f ON f.id_funcionario = c.funcionario_id
+        WHERE c.horario_fechamento >= ? AND c.horario_fechamento < ?
+        ORDER BY c.horario_fechamento DESC
+        LIMIT ?
+    """, (primeiro_dia, dia_seguinte, limite), {
+        "id_comanda": "int64", "horario_abertura": "object", "horario_fechamento": "object",
+        "mesa_id": "int64", "funcionario": "object", "quantidade_itens": "int64",
+        "valor_total": "float64",
+    }, historico=True)
+
+def resumo_vendas(inicio=None, fim=None, limite_itens=10):
+    """
+    Monta todos os relatórios do período, lendo cada base uma única vez.
+
+    Args:
+        inicio (date): Primeiro dia do período (padrão: 30 dias atrás)
+        fim (date): Último dia do período (padrão: hoje)
+        limite_itens (int): Tamanho do ranking de itens
+
+    Returns:
+        dict: totais, por_dia, por_hora, itens_quantidade, itens_receita, por_funcionario
+    """
+    fim = fim or date.today()
+    inicio = inicio or fim - timedelta(days=29)
+    dias = vendas_por_dia(inicio, fim)
+    itens = vendas_por_item(inicio, fim)
+    return {
+        "totais": ticket_medio(inicio, fim, dias),
+        "por_dia": faturamento_por_dia(inicio, fim, dias),
+        "por_hora": faturamento_por_hora(inicio, fim),
+        "itens_quantidade": itens_mais_vendidos(inicio, fim, limite_itens, "quantidade", itens),
+        "itens_receita": itens_mais_vendidos(inicio, fim, limite_itens, "receita", itens),
+        "por_funcionario": faturamento_por_funcionario(inicio, fim),
+    }
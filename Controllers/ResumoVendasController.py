@@ -0,0 +1,202 @@
+# Controllers/ResumoVendasController.py
+"""
+Controller do resumo diário de vendas.
+
+As tabelas resumo_vendas_* guardam os totais já agregados por dia (e por
+hora, item e funcionário). Elas são atualizadas de forma incremental dentro
+da transação de fechar_comanda, então os relatórios leem algumas centenas
+de linhas de resumo em vez de milhões de linhas de comanda_item_cardapio.
+
+Também oferece a reconstrução completa dos resumos a partir das tabelas
+originais e um verificador que compara as duas fontes
+(ver Services/resumo_vendas.py para a linha de comando).
+"""
+
+import sqlite3
+from Controllers.db_connection import transacao
+from Controllers.HistoricoController import historico_anexado
+
+# Tabela de resumo -> (colunas da chave, colunas somadas, SELECT agregado).
+# O SELECT recebe em {filtro} a condição sobre as comandas (c) a resumir e,
+# em {comanda}/{itens}, as tabelas de origem: as do banco principal no
+# fechamento, ou as views que incluem o histórico na reconstrução/verificação.
+_RESUMOS = {
+    "resumo_vendas_dia": (
+        ("dia",),
+        ("comandas", "faturamento", "subtotal", "quantidade_itens"),
+        """
+        SELECT substr(c.horario_fechamento, 1, 10), COUNT(*), COALESCE(SUM(c.valor_total), 0),
+               SUM(c.subtotal_itens), SUM(c.quantidade_itens)
+        FROM {comanda} c
+        WHERE {filtro}
+        GROUP BY 1
+        """,
+    ),
+    "resumo_vendas_hora": (
+        ("dia", "hora"),
+        ("comandas", "faturamento"),
+        """
+        SELECT substr(c.horario_fechamento, 1, 10), CAST(substr(c.horario_fechamento, 12, 2) AS INTEGER),
+               COUNT(*), COALESCE(SUM(c.valor_total), 0)
+        FROM {comanda} c
+        WHERE {filtro}
+        GROUP BY 1, 2
+        """,
+    ),
+    "resumo_vendas_item": (
+        ("dia", "item_cardapio_id"),
+        ("quantidade", "receita"),
+        """
+        SELECT substr(c.horario_fechamento, 1, 10), cic.item_cardapio_id,
+               SUM(cic.quantidade_item), SUM(cic.quantidade_item * cic.valor_unitario_momento)
+        FROM {comanda} c
+        JOIN {itens} cic ON cic.comanda_id = c.id_comanda
+        WHERE {filtro}
+        GROUP BY 1, 2
+        """,
+    ),
+    "resumo_vendas_funcionario": (
+        ("dia", "funcionario_id"),
+        ("comandas", "faturamento"),
+        """
+        SELECT substr(c.horario_fechamento, 1, 10), c.funcionario_id,
+               COUNT(*), COALESCE(SUM(c.valor_total), 0)
+        FROM {comanda} c
+        WHERE {filtro}
+        GROUP BY 1, 2
+        """,
+    ),
+}
+
+# Origens das comandas fechadas: só o banco principal, ou principal + histórico
+_ORIGEM_PRINCIPAL = {"comanda": "comanda", "itens": "comanda_item_cardapio"}
+_ORIGEM_COMPLETA = {"comanda": "comanda_geral", "itens": "comanda_item_cardapio_geral"}
+
+# Diferença máxima aceita entre valores em reais (arredondamento de REAL)
+_TOLERANCIA = 0.005
+
+def registrar_resumo_comanda(conexao, comanda_id):
+    """
+    Soma uma comanda recém-fechada às tabelas de resumo.
+    Não faz commit: deve ser chamada dentro da transação que fecha a comanda,
+    para que o fechamento e o resumo sejam gravados juntos.
+
+    Args:
+        conexao (sqlite3.Connection): Conexão com a transação em andamento
+        comanda_id (int): ID da comanda já marcada como fechada
+    """
+    filtro = "c.id_comanda = ? AND c.horario_fechamento IS NOT NULL"
+    for tabela, (chave, medidas, consulta) in _RESUMOS.items():
+        atualizacao = ", ".join(f"{m} = {m} + excluded.{m}" for m in medidas)
+        conexao.execute(f"""
+            INSERT INTO {tabela} ({", ".join(chave + medidas)})
+            {consulta.format(filtro=filtro, **_ORIGEM_PRINCIPAL)}
+            ON CONFLICT ({", ".join(chave)}) DO UPDATE SET {atualizacao}
+        """, (comanda_id,))
+
+def _reconstruir(conexao):
+    """
+    Apaga e recalcula todas as tabelas de resumo (sem commit).
+    A conexão deve ter o histórico anexado (historico_anexado).
+    """
+    for tabela, (chave, medidas, consulta) in _RESUMOS.items():
+        conexao.execute(f"DELETE FROM {tabela}")
+        conexao.execute(f"""
+            INSERT INTO {tabela} ({", ".join(chave + medidas)})
+            {consulta.format(filtro="c.horario_fechamento IS NOT NULL", **_ORIGEM_COMPLETA)}
+        """)
+
+def reconstruir_resumos():
+    """
+    Recalcula todas as tabelas de resumo a partir das comandas fechadas,
+    incluindo as já arquivadas no banco de histórico. Tudo roda em uma única
+    transação: os relatórios nunca veem o resumo pela metade.
+
+    Returns:
+        bool: True se sucesso, False se erro
+    """
+    try:
+        with historico_anexado() as conexao:
+            with transacao():
+                _reconstruir(conexao)
+        print("Resumo de vendas reconstruído.")
+        return True
+    except sqlite3.Error as e:
+        print(f"Erro ao reconstruir resumo de vendas: {e}")
+        return False
+
+def _divergencias(conexao, tabela):
+    """Compara uma tabela de resumo com o cálculo direto das tabelas originais."""
+    chave, medidas, consulta = _RESUMOS[tabela]
+    n = len(chave)
+    esperado = {
+        tuple(linha[:n]): tuple(linha[n:])
+        for linha in conexao.execute(
+            consulta.format(filtro="c.horario_fechamento IS NOT NULL", **_ORIGEM_COMPLETA)
+        )
+    }
+    gravado = {
+        tuple(linha[:n]): tuple(linha[n:])
+        for linha in conexao.execute(f"SELECT {', '.join(chave + medidas)} FROM {tabela}")
+    }
+    zeros = (0,) * len(medidas)
+    divergencias = []
+    for valor_chave in sorted(esperado.keys() | gravado.keys()):
+        calculado = esperado.get(valor_chave, zeros)
+        resumo = gravado.get(valor_chave, zeros)
+        if any(abs((a or 0) - (b or 0)) > _TOLERANCIA for a, b in zip(calculado, resumo)):
+            divergencias.append({
+                "tabela": tabela,
+                "chave": dict(zip(chave, valor_chave)),
+                "calculado": dict(zip(medidas, calculado)),
+                "resumo": dict(zip(medidas, resumo)),
+            })
+    return divergencias
+
+def _todas_divergencias(conexao):
+    """Divergências de todas as tabelas de resumo, na conexão informada."""
+    divergencias = []
+    for tabela in _RESUMOS:
+        divergencias.extend(_divergencias(conexao, tabela))
+    return divergencias
+
+def verificar_resumos(corrigir=False):
+    """
+    Confere cada tabela de resumo contra as tabelas originais de comandas
+    (banco principal e histórico).
+
+    A comparação roda em uma transação de leitura: em WAL ela lê um retrato
+    fixo dos bancos sem bloquear o fechamento de comandas. O lock de escrita
+    só é reservado para corrigir, e as divergências são conferidas de novo
+    dentro dele antes da reconstrução.
+
+    Args:
+        corrigir (bool): Se True e houver divergência, reconstrói os resumos
+
+    Returns:
+        list: Lista de dicts com tabela, chave, calculado e resumo de cada divergência
+              Retorna None se erro
+    """
+    try:
+        with historico_anexado() as conexao:
+            # BEGIN (deferred) mantém o mesmo retrato dos dados em todas as
+            # consultas, sem pedir o lock de escrita
+            conexao.execute("BEGIN")
+            try:
+                divergencias = _todas_divergencias(conexao)
+            finally:
+                conexao.rollback()
+            if corrigir and divergencias:
+                # Confirma sob o lock de escrita: outra comanda pode ter sido
+                # fechada (ou uma correção concluída) desde a leitura
+                with transacao():
+                    divergencias = _todas_divergencias(conexao)
+                    if divergencias:
+                        _reconstruir(conexao)
+        if divergencias:
+            acao = "corrigida(s)" if corrigir else "encontrada(s)"
+            print(f"{len(divergencias)} divergência(s) no resumo de vendas {acao}.")
+        return divergencias
+    except sqlite3.Error as e:
+        print(f"Erro ao verificar resumo de vendas: {e}")
+        return None
@@ -0,0 +1,148 @@
+# Controllers/alteracoes.py
+"""
+Detecção de alterações no banco, para telas que se atualizam sozinhas.
+
+As migrações 8 e 10 mantêm em contador_alteracao um contador por tabela
+acompanhada (mesa, comanda, comanda_item_cardapio, item_cardapio,
+funcionario), incrementado por triggers a cada inclusão, alteração ou
+remoção, venha a escrita deste processo ou de outro (ex: a API HTTP).
+Comparar os contadores com os da última leitura diz se uma consulta
+precisa ser refeita.
+
+Para que uma tela parada não leia nem essa tabela, os contadores são lidos
+por uma conexão própria, que nunca grava, e só quando PRAGMA data_version
+dessa conexão muda. O data_version muda a cada commit feito por qualquer
+outra conexão ao banco; verificá-lo não lê páginas do arquivo.
+
+Uso:
+
+    versao = versoes_tabelas("mesa", "comanda")
+    if versao != versao_exibida:
+        ...  # refaz a consulta
+"""
+
+import sqlite3
+import threading
+
+from Controllers.db_connection import obter_pool
+
+
+class DetectorAlteracoes:
+    """
+    Lê os contadores de alteração por tabela, reaproveitando a última
+    leitura enquanto nenhum commit tiver acontecido no banco.
+
+    A conexão é aberta na primeira verificação, fora do pool e sem
+    instrumentação (as telas verificam a cada poucos segundos). Se o pool
+    global for reconfigurado para outro banco, a conexão é reaberta.
+    """
+
+    def __init__(self):
+        """Cria o detector sem conexão; ela é aberta sob demanda."""
+        self._lock = threading.Lock()
+        self._conexao = None
+        self._pool = None
+        self._data_version = None
+        self._versoes = {}
+        self._estatisticas = {"verificacoes": 0, "leituras": 0}
+
+    def versoes(self, tabelas):
+        """
+        Retorna o contador de alterações de cada tabela.
+
+        Args:
+            tabelas (iterable): Nomes das tabelas
+
+        Returns:
+            tuple: Contadores, na ordem das tabelas (0 para tabela não acompanhada)
+
+        Raises:
+            sqlite3.Error: Se o banco não puder ser lido (ex: migração 8 não aplicada)
+        """
+        if not self._lock.acquire(blocking=False):
+            # Outra thread está verificando neste instante: em vez de esperar
+            # na fila do lock, usa a leitura anterior. Escritas deste processo
+            # já invalidam o cache explicitamente (ver cache.invalidar)
+            versoes = self._versoes
+            if versoes:
+                return tuple(versoes.get(tabela, 0) for tabela in tabelas)
+            self._lock.acquire()
+        try:
+            self._estatisticas["verificacoes"] += 1
+            conexao = self._obter_conexao()
+            (data_version,) = conexao.execute("PRAGMA data_version").fetchone()
+            if data_version != self._data_version:
+                # Lidos depois do data_version: um commit entre as duas
+                # consultas só antecipa a próxima releitura
+                self._versoes = dict(conexao.execute(
+                    "SELECT tabela, versao FROM contador_alteracao"
+                ).fetchall())
+                self._data_version = data_version
+                self._estatisticas["leituras"] += 1
+            return tuple(self._versoes.get(tabela, 0) for tabela in tabelas)
+        except sqlite3.Error:
+            self._fechar_conexao()
+            raise
+        finally:
+            self._lock.release()
+
+    def estatisticas(self):
+        """
+        Retorna contadores do detector.
+
+        Returns:
+            dict: verificacoes (chamadas) e leituras (vezes em que os contadores foram lidos)
+        """
+        with self._lock:
+            return dict(self._estatisticas)
+
+    def fechar(self):
+        """Fecha a conexão do detector (reaberta na próxima verificação)."""
+        with self._lock:
+            self._fechar_conexao()
+
+    def _obter_conexao(self):
+        pool = obter_pool()
+        if self._conexao is None or pool is not self._pool:
+            self._fechar_conexao()
+            self._conexao = pool.abrir_conexao_dedicada(instrumentada=False)
+            self._pool = pool
+        return self._conexao
+
+    def _fechar_conexao(self):
+        if self._conexao is not None:
+            try:
+                self._conexao.close()
+            except sqlite3.Error:
+                pass
+            self._conexao = None
+        self._data_version = None
+        self._versoes = {}
+
+
+# ===== DETECTOR GLOBAL DO PROCESSO =====
+_detector = DetectorAlteracoes()
+
+
+def versoes_tabelas(*tabelas):
+    """
+    Retorna o contador de alterações de cada tabela informada.
+    Sem commits no banco desde a última chamada, não faz nenhuma leitura.
+
+    Returns:
+        tuple: Contadores, na ordem das tabelas
+
+    Raises:
+        sqlite3.Error: Se o banco não puder ser lido
+    """
+    return _detector.versoes(tabelas)
+
+
+def fechar_detector():
+    """Fecha a conexão do detector global."""
+    _detector.fechar()
+
+
+def estatisticas_alteracoes():
+    """Retorna os contadores do detector global."""
+    return _detector.estatisticas()
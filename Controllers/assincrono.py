@@ -0,0 +1,335 @@
+# Controllers/assincrono.py
+"""
+Variantes assíncronas (asyncio) dos controllers.
+
+As funções dos controllers são bloqueantes: enquanto uma consulta roda, a
+thread que a chamou (ex: a do script do Streamlit) fica parada. Aqui cada
+chamada é enviada a um executor de threads limitado (no máximo
+RESTAURANTE_ASYNC_TRABALHADORES consultas ao mesmo tempo), de modo que
+leituras independentes, como cardápio, funcionários e mesas, rodam em
+paralelo, cada uma com sua conexão do pool. O módulo sqlite3 libera o GIL
+durante a execução das consultas.
+
+Cada chamada tem um tempo limite; ao expirar, ou se a tarefa for cancelada,
+a consulta em andamento é interrompida (sqlite3.Connection.interrupt) e a
+conexão volta ao pool.
+
+As funções de escrita (@via_escritor) são a exceção: vão direto para a fila
+do escritor único (Controllers/escritor.py), sem ocupar uma thread do
+executor nem uma conexão do pool enquanto esperam. O tempo limite e o
+cancelamento só retiram a escrita da fila se ela ainda não tiver começado.
+Uma escrita em andamento não é interrompida nem desfeita: o TimeoutError
+informa isso, e quem chamou deve conferir o resultado antes de repetir a
+operação (repetir um pedido lançaria os itens duas vezes).
+
+O envio de uma chamada a outra thread custa cerca de 0,1 ms: só compensa
+paralelizar consultas que levam mais que isso. As leituras da página de
+comandas, com índices e cache, ficam abaixo disso e continuam sequenciais
+(ver Benchmarks/benchmark_assincrono.py).
+
+Uso em código assíncrono (ex: um serviço):
+
+    from Controllers import assincrono
+    mesas, itens = await asyncio.gather(
+        assincrono.consultar_mesas_com_comanda(),
+        assincrono.consultar_itens(),
+    )
+
+Uso em código síncrono:
+
+    mesas, funcionarios = em_paralelo(consultar_mesas_com_comanda, consultar_funcionarios)
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from Controllers.db_connection import POOL_TAMANHO, obter_conexao
+from Controllers.escritor import ESCRITOR_ATIVO, submeter
+from Controllers import (
+    ClienteController, ComandaController, CozinhaController, FuncionarioController,
+    ItemCardapioController, MesaController, RelatorioController,
+)
+
+# ===== CONFIGURAÇÃO =====
+# Máximo de chamadas executadas ao mesmo tempo (cada uma ocupa uma conexão do pool)
+ASYNC_TRABALHADORES = int(os.environ.get("RESTAURANTE_ASYNC_TRABALHADORES", str(POOL_TAMANHO)))
+# Tempo limite padrão (segundos) de cada chamada; 0 desliga o limite
+ASYNC_TIMEOUT = float(os.environ.get("RESTAURANTE_ASYNC_TIMEOUT", "30"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def obter_executor():
+    """
+    Retorna o executor de threads do processo, criando-o na primeira chamada.
+
+    Returns:
+        ThreadPoolExecutor: Executor limitado a ASYNC_TRABALHADORES threads
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, ASYNC_TRABALHADORES), thread_name_prefix="restaurante-bd"
+                )
+    return _executor
+
+
+def encerrar_executor():
+    """Encerra o executor (as chamadas em andamento terminam antes)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+class _ChamadaBanco:
+    """
+    Uma chamada de controller executada em uma thread do executor.
+
+    A thread empresta a conexão do pool antes de chamar o controller: as
+    consultas do controller reutilizam essa conexão (chamada aninhada) e o
+    cancelamento sabe qual conexão interromper. O lock garante que a
+    interrupção só atinge a conexão enquanto ela pertence a esta chamada.
+    """
+
+    def __init__(self, funcao, args, kwargs):
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self._lock = threading.Lock()
+        self._conexao = None
+        self._cancelada = False
+
+    def executar(self):
+        with self._lock:
+            if self._cancelada:
+                raise asyncio.CancelledError()
+        with obter_conexao() as conexao:
+            with self._lock:
+                self._conexao = conexao
+            try:
+                return self.funcao(*self.args, **self.kwargs)
+            finally:
+                with self._lock:
+                    self._conexao = None
+
+    def cancelar(self):
+        """
+        Impede o início da chamada ou interrompe a consulta em andamento.
+
+        Returns:
+            bool: True (a consulta interrompida não tem efeito a desfazer)
+        """
+        with self._lock:
+            self._cancelada = True
+            if self._conexao is not None:
+                self._conexao.interrupt()
+        return True
+
+
+class _EscritaEnfileirada:
+    """
+    Uma chamada de função de escrita entregue diretamente ao escritor único.
+    Nenhuma thread do executor nem conexão do pool fica presa esperando o
+    escritor; cancelar só tem efeito antes de a escrita começar.
+    """
+
+    def __init__(self, funcao, args, kwargs):
+        self.funcao = funcao
+        # A função original (sem o decorador), como o próprio via_escritor submete
+        self.futuro = submeter(funcao.direta, *args, **kwargs)
+
+    def cancelar(self):
+        """
+        Retira a escrita da fila, se ainda não começou.
+
+        Returns:
+            bool: True se a escrita não será executada, False se já começou
+        """
+        return self.futuro.cancel()
+
+
+def _escrita_via_escritor(funcao):
+    """Indica se a função é de escrita (@via_escritor) e o escritor está ativo."""
+    return ESCRITOR_ATIVO and hasattr(funcao, "direta")
+
+
+def _iniciar(funcao, args, kwargs):
+    """
+    Inicia uma chamada: escritas vão para a fila do escritor e as demais
+    para o executor.
+
+    Returns:
+        tuple: (chamada com cancelar(), concurrent.futures.Future do resultado)
+    """
+    if _escrita_via_escritor(funcao):
+        chamada = _EscritaEnfileirada(funcao, args, kwargs)
+        return chamada, chamada.futuro
+    chamada = _ChamadaBanco(funcao, args, kwargs)
+    return chamada, obter_executor().submit(chamada.executar)
+
+
+async def executar(funcao, *args, timeout=None, **kwargs):
+    """
+    Executa uma função de controller no executor, sem bloquear o event loop.
+    Funções de escrita são enviadas ao escritor único (ver o início do módulo).
+
+    Args:
+        funcao (callable): Função de controller (síncrona)
+        *args, **kwargs: Argumentos da função
+        timeout (float): Tempo limite em segundos (padrão: ASYNC_TIMEOUT; 0 = sem limite)
+
+    Returns:
+        object: O retorno da função
+
+    Raises:
+        TimeoutError: Se a chamada exceder o tempo limite. Uma consulta é
+                      interrompida; uma escrita que ainda não começou é
+                      descartada, e uma que já começou será gravada mesmo assim
+    """
+    timeout = ASYNC_TIMEOUT if timeout is None else timeout
+    chamada, futuro = _iniciar(funcao, args, kwargs)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(futuro), timeout or None)
+    except asyncio.TimeoutError:
+        if not chamada.cancelar():
+            raise TimeoutError(
+                f"{funcao.__name__} excedeu o tempo limite, mas a escrita já estava em "
+                f"andamento e será gravada: confira o resultado antes de repetir"
+            ) from None
+        raise
+    except asyncio.CancelledError:
+        chamada.cancelar()
+        raise
+
+
+def versao_assincrona(funcao):
+    """
+    Cria a variante assíncrona de uma função de controller.
+    A variante aceita os mesmos argumentos e, opcionalmente, timeout=.
+
+    Args:
+        funcao (callable): Função de controller (síncrona)
+
+    Returns:
+        coroutine function: async def que executa a função no executor
+    """
+    # updated=(): não copia atributos como .sem_cache, que são da versão síncrona
+    @functools.wraps(funcao, updated=())
+    async def envoltorio(*args, timeout=None, **kwargs):
+        return await executar(funcao, *args, timeout=timeout, **kwargs)
+
+    envoltorio.sincrona = funcao
+    return envoltorio
+
+
+def em_paralelo(*chamadas, timeout=None):
+    """
+    Executa várias funções de controller ao mesmo tempo a partir de código
+    síncrono e espera todas terminarem.
+
+    Não cria um event loop: as chamadas vão direto para o executor (ou, as
+    escritas, para o escritor único), o que mantém o custo fixo em poucas
+    dezenas de microssegundos por chamada.
+    Segue o padrão dos controllers: uma chamada que falha ou excede o tempo
+    limite tem o erro exibido no terminal e resulta em None, sem impedir
+    as demais. Uma escrita que já começou não é desfeita pelo tempo limite.
+
+    Args:
+        *chamadas: Funções sem argumentos, ou tuplas (funcao, arg1, arg2, ...)
+        timeout (float): Tempo limite do conjunto (padrão: ASYNC_TIMEOUT; 0 = sem limite)
+
+    Returns:
+        list: Retornos das funções, na ordem das chamadas
+    """
+    timeout = ASYNC_TIMEOUT if timeout is None else timeout
+    pendentes = []
+    for chamada in chamadas:
+        funcao, *args = chamada if isinstance(chamada, tuple) else (chamada,)
+        pendentes.append(_iniciar(funcao, args, {}))
+
+    _, atrasadas = wait([futuro for _, futuro in pendentes], timeout=timeout or None)
+    resultados = []
+    for tarefa, futuro in pendentes:
+        if futuro in atrasadas:
+            futuro.cancel()
+            if not tarefa.cancelar():
+                print(f"Erro: {tarefa.funcao.__name__} excedeu o tempo limite "
+                      f"(a escrita já estava em andamento e será gravada)")
+            else:
+                print(f"Erro: {tarefa.funcao.__name__} excedeu o tempo limite")
+            resultados.append(None)
+        elif futuro.exception() is not None:
+            print(f"Erro ao executar {tarefa.funcao.__name__}: {futuro.exception()}")
+            resultados.append(None)
+        else:
+            resultados.append(futuro.result())
+    return resultados
+
+
+# ===== VARIANTES ASSÍNCRONAS DOS CONTROLLERS =====
+# Comandas
+abrir_comanda = versao_assincrona(ComandaController.abrir_comanda)
+adicionar_item_comanda = versao_assincrona(ComandaController.adicionar_item_comanda)
+adicionar_itens_comanda = versao_assincrona(ComandaController.adicionar_itens_comanda)
+consultar_itens_comanda = versao_assincrona(ComandaController.consultar_itens_comanda)
+obter_comanda = versao_assincrona(ComandaController.obter_comanda)
+calcular_totais_comandas = versao_assincrona(ComandaController.calcular_totais_comandas)
+calcular_total_comanda = versao_assincrona(ComandaController.calcular_total_comanda)
+fechar_comanda = versao_assincrona(ComandaController.fechar_comanda)
+
+# Cozinha
+consultar_fila_cozinha = versao_assincrona(CozinhaController.consultar_fila_cozinha)
+consultar_alteracoes_cozinha = versao_assincrona(CozinhaController.consultar_alteracoes_cozinha)
+alterar_status_preparo = versao_assincrona(CozinhaController.alterar_status_preparo)
+
+# Mesas
+incluir_mesa = versao_assincrona(MesaController.incluir_mesa)
+consultar_mesas = versao_assincrona(MesaController.consultar_mesas)
+consultar_mesas_com_comanda = versao_assincrona(MesaController.consultar_mesas_com_comanda)
+consultar_quadro_salao = versao_assincrona(MesaController.consultar_quadro_salao)
+excluir_mesa = versao_assincrona(MesaController.excluir_mesa)
+alterar_mesa = versao_assincrona(MesaController.alterar_mesa)
+alterar_status_mesa = versao_assincrona(MesaController.alterar_status_mesa)
+
+# Cardápio
+incluir_item = versao_assincrona(ItemCardapioController.incluir_item)
+consultar_itens = versao_assincrona(ItemCardapioController.consultar_itens)
+buscar_itens = versao_assincrona(ItemCardapioController.buscar_itens)
+excluir_item = versao_assincrona(ItemCardapioController.excluir_item)
+alterar_item = versao_assincrona(ItemCardapioController.alterar_item)
+
+# Funcionários
+incluir_funcionario = versao_assincrona(FuncionarioController.incluir_funcionario)
+consultar_funcionarios = versao_assincrona(FuncionarioController.consultar_funcionarios)
+buscar_funcionario_por_cpf = versao_assincrona(FuncionarioController.buscar_funcionario_por_cpf)
+excluir_funcionario = versao_assincrona(FuncionarioController.excluir_funcionario)
+alterar_funcionario = versao_assincrona(FuncionarioController.alterar_funcionario)
+
+# Clientes
+incluir_cliente = versao_assincrona(ClienteController.incluir_cliente)
+consultar_clientes = versao_assincrona(ClienteController.consultar_clientes)
+consultar_clientes_pagina = versao_assincrona(ClienteController.consultar_clientes_pagina)
+obter_cliente = versao_assincrona(ClienteController.obter_cliente)
+buscar_cliente_por_cpf = versao_assincrona(ClienteController.buscar_cliente_por_cpf)
+excluir_cliente = versao_assincrona(ClienteController.excluir_cliente)
+alterar_cliente = versao_assincrona(ClienteController.alterar_cliente)
+
+# Relatórios
+vendas_por_dia = versao_assincrona(RelatorioController.vendas_por_dia)
+vendas_por_hora = versao_assincrona(RelatorioController.vendas_por_hora)
+faturamento_por_dia = versao_assincrona(RelatorioController.faturamento_por_dia)
+faturamento_por_hora = versao_assincrona(RelatorioController.faturamento_por_hora)
+ticket_medio = versao_assincrona(RelatorioController.ticket_medio)
+vendas_por_item = versao_assincrona(RelatorioController.vendas_por_item)
+itens_mais_vendidos = versao_assincrona(RelatorioController.itens_mais_vendidos)
+faturamento_por_funcionario = versao_assincrona(RelatorioController.faturamento_por_funcionario)
+consultar_comandas_fechadas = versao_assincrona(RelatorioController.consultar_comandas_fechadas)
+resumo_vendas = versao_assincrona(RelatorioController.resumo_vendas)
@@ -0,0 +1,206 @@
+# Controllers/cache.py
+"""
+Cache em memória para dados de referência (cardápio, funcionários, mesas).
+
+Esses dados mudam poucas vezes ao dia, mas eram consultados no SQLite a cada
+interação do Streamlit. O cache é único por processo (compartilhado por todas
+as sessões), tem tempo de expiração (TTL) e é invalidado explicitamente pelas
+funções de escrita dos controllers.
+
+Essa invalidação só alcança as escritas do próprio processo. Para dados que
+outros processos também alteram (ex: mesas e comandas pela API HTTP, ou o
+cardápio e os funcionários pelo Streamlit enquanto a API os lista), o
+decorador aceita as tabelas de origem: a entrada só vale enquanto os
+contadores de alteração dessas tabelas não mudarem (ver alteracoes.py).
+
+O mesmo objeto em cache é entregue a todas as sessões, então as funções
+decoradas devem retornar apenas valores imutáveis (tuplas, sqlite3.Row);
+modelos e dicts são montados por quem chama, a cada chamada.
+
+Uso nos controllers:
+
+    @em_cache("cardapio", tabelas=("item_cardapio",))
+    def _linhas_itens():
+        ...  # tuplas
+
+    def consultar_itens(como_modelo=False):
+        linhas = _linhas_itens()
+        ...
+
+    def incluir_item(item):
+        ...
+        invalidar("cardapio")
+"""
+
+import functools
+import os
+import sqlite3
+import threading
+import time
+
+from Controllers.alteracoes import versoes_tabelas
+from Controllers.db_connection import apos_transacao
+
+# ===== CONFIGURAÇÃO =====
+# Tempo de vida (segundos) de uma entrada do cache
+CACHE_TTL = float(os.environ.get("RESTAURANTE_CACHE_TTL", "300"))
+# Permite desligar o cache (ex: para medições) com RESTAURANTE_CACHE_ATIVO=0
+CACHE_ATIVO = os.environ.get("RESTAURANTE_CACHE_ATIVO", "1") != "0"
+
+
+class CacheReferencia:
+    """
+    Cache com TTL organizado por namespace (ex: 'cardapio', 'mesas').
+
+    Cada namespace tem uma "geração": invalidar o namespace incrementa a
+    geração, e um resultado carregado antes da invalidação não é gravado,
+    evitando que uma leitura lenta reinsira dados desatualizados.
+    """
+
+    def __init__(self, ttl=CACHE_TTL):
+        """Inicializa o cache vazio."""
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entradas = {}  # (namespace, chave) -> (expira_em, versao, valor)
+        self._geracoes = {}  # namespace -> int
+        self._contadores = {}  # namespace -> {"acertos", "falhas", "invalidacoes"}
+
+    def _contador(self, namespace):
+        return self._contadores.setdefault(
+            namespace, {"acertos": 0, "falhas": 0, "invalidacoes": 0}
+        )
+
+    def obter(self, namespace, chave, carregar, ttl=None, versao=None):
+        """
+        Retorna o valor em cache ou o carrega com a função informada.
+
+        Args:
+            namespace (str): Grupo de dados (unidade de invalidação)
+            chave (hashable): Identifica a consulta dentro do namespace
+            carregar (callable): Função sem argumentos que busca o valor no banco
+            ttl (float): Tempo de vida da entrada (padrão: self.ttl)
+            versao (hashable): Versão dos dados de origem; uma entrada gravada
+                               com outra versão é recarregada
+
+        Returns:
+            object: Valor em cache ou recém-carregado
+        """
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get((namespace, chave))
+            if entrada is not None and entrada[0] > agora and entrada[1] == versao:
+                self._contador(namespace)["acertos"] += 1
+                return entrada[2]
+            self._contador(namespace)["falhas"] += 1
+            geracao = self._geracoes.get(namespace, 0)
+
+        # Consulta ao banco fora do lock: outras sessões não ficam bloqueadas
+        valor = carregar()
+
+        # Resultados vazios não são guardados (podem ser erro de consulta)
+        if valor:
+            with self._lock:
+                if self._geracoes.get(namespace, 0) == geracao:
+                    expira_em = time.monotonic() + (self.ttl if ttl is None else ttl)
+                    self._entradas[(namespace, chave)] = (expira_em, versao, valor)
+        return valor
+
+    def invalidar(self, *namespaces):
+        """
+        Descarta todas as entradas dos namespaces informados.
+
+        Args:
+            *namespaces (str): Namespaces a invalidar
+        """
+        with self._lock:
+            for namespace in namespaces:
+                self._geracoes[namespace] = self._geracoes.get(namespace, 0) + 1
+                self._contador(namespace)["invalidacoes"] += 1
+                for chave in [c for c in self._entradas if c[0] == namespace]:
+                    del self._entradas[chave]
+
+    def limpar(self):
+        """Remove todas as entradas e zera os contadores."""
+        with self._lock:
+            for namespace in list(self._geracoes):
+                self._geracoes[namespace] += 1
+            self._entradas.clear()
+            self._contadores.clear()
+
+    def estatisticas(self):
+        """
+        Retorna acertos, falhas, invalidações e entradas por namespace.
+
+        Returns:
+            dict: namespace -> {acertos, falhas, invalidacoes, entradas, taxa_acerto}
+        """
+        with self._lock:
+            dados = {}
+            for namespace, contador in self._contadores.items():
+                consultas = contador["acertos"] + contador["falhas"]
+                dados[namespace] = dict(
+                    contador,
+                    entradas=sum(1 for c in self._entradas if c[0] == namespace),
+                    taxa_acerto=(contador["acertos"] / consultas) if consultas else 0.0,
+                )
+            return dados
+
+
+# ===== CACHE GLOBAL DO PROCESSO =====
+_cache = CacheReferencia()
+
+
+def em_cache(namespace, ttl=None, tabelas=None):
+    """
+    Decorador que guarda no cache o resultado de uma função de consulta.
+    Os argumentos da chamada compõem a chave dentro do namespace.
+    A função original continua disponível em <funcao>.sem_cache.
+    O resultado é compartilhado entre sessões: a função deve retornar uma
+    lista de tuplas/sqlite3.Row ou outro valor imutável.
+
+    Args:
+        namespace (str): Namespace invalidado pelas escritas correspondentes
+        ttl (float): Tempo de vida das entradas (padrão: CACHE_TTL)
+        tabelas (tuple): Tabelas com contador de alteração lidas pela função;
+                         escritas nelas, inclusive de outros processos,
+                         tornam a entrada inválida
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            if not CACHE_ATIVO:
+                return funcao(*args, **kwargs)
+            chave = (funcao.__name__, args, tuple(sorted(kwargs.items())))
+            versao = None
+            if tabelas:
+                try:
+                    # Lida antes da consulta: uma escrita durante a carga
+                    # apenas faz a próxima chamada recarregar
+                    versao = versoes_tabelas(*tabelas)
+                except sqlite3.Error as e:
+                    print(f"Aviso: contadores de alteração indisponíveis ({e})")
+            valor = _cache.obter(namespace, chave, lambda: funcao(*args, **kwargs), ttl, versao)
+            # Cópia rasa: quem chama pode alterar a lista sem afetar o cache
+            return list(valor) if isinstance(valor, list) else valor
+
+        envoltorio.sem_cache = funcao
+        return envoltorio
+    return decorador
+
+
+def invalidar(*namespaces):
+    """
+    Invalida os namespaces informados no cache global.
+    Dentro de uma transação, a invalidação espera o fim dela (ver apos_transacao).
+    """
+    apos_transacao(lambda: _cache.invalidar(*namespaces))
+
+
+def limpar_cache():
+    """Esvazia o cache global e zera os contadores."""
+    _cache.limpar()
+
+
+def estatisticas_cache():
+    """Retorna os contadores de acertos/falhas do cache global."""
+    return _cache.estatisticas()
@@ -1,12 +1,37 @@
 # Controllers/db_connection.py
 """
 Módulo de conexão com banco de dados SQLite.
-Fornece funções para estabelecer conexões com o banco de dados do restaurante.
+Fornece um pool de conexões de longa duração para o banco de dados do restaurante.
+
+Em vez de abrir e fechar uma conexão a cada chamada de controller, as conexões
+ficam abertas no pool e são reaproveitadas, preservando o cache de páginas e o
+cache de statements do SQLite entre as execuções das páginas do Streamlit.
+
+Cada conexão é configurada com um perfil de desempenho (journal WAL,
+synchronous, mmap, cache, temp_store e busy_timeout), escolhido pela
+variável de ambiente RESTAURANTE_DB_PERFIL.
+
+Uso típico nos controllers:
+
+    # Leitura
+    with obter_conexao() as conexao:
+        conexao.execute("SELECT ...")
+
+    # Escrita: um único commit ao final do bloco (rollback em caso de erro)
+    with transacao() as conexao:
+        conexao.execute("INSERT ...")
+        conexao.execute("UPDATE ...")
 """
 
+import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
+from Controllers.instrumentacao import INSTRUMENTACAO_ATIVA, ConexaoInstrumentada
+
 # ===== CONFIGURAÇÃO DO CAMINHO DO BANCO DE DADOS =====
 # Constrói o caminho para o BD de forma robusta.
 # Path(__file__) -> é o caminho deste arquivo (db_connection.py)
@@ -16,18 +41,580 @@ from pathlib import Path
 ROOT_DIR = Path(__file__).parent.parent
 DB_NAME = ROOT_DIR / 'restaurante.db'
 
+# Banco de histórico: comandas antigas já fechadas, movidas pelo arquivamento
+# (ver Controllers/HistoricoController.py). Padrão: ao lado do banco principal.
+DB_HISTORICO = Path(
+    os.environ.get("RESTAURANTE_DB_HISTORICO", ROOT_DIR / 'restaurante_historico.db')
+)
+
+# ===== CONFIGURAÇÃO DO POOL DE CONEXÕES =====
+# Valores podem ser ajustados por variáveis de ambiente, sem alterar o código.
+# Tamanho máximo do pool (conexões abertas simultaneamente)
+POOL_TAMANHO = int(os.environ.get("RESTAURANTE_DB_POOL_TAMANHO", "5"))
+# Tempo máximo (segundos) de espera por uma conexão livre
+POOL_TIMEOUT = float(os.environ.get("RESTAURANTE_DB_POOL_TIMEOUT", "10"))
+# Conexões ociosas há mais tempo que isso (segundos) são testadas antes do uso
+POOL_INTERVALO_VERIFICACAO = float(os.environ.get("RESTAURANTE_DB_POOL_VERIFICACAO", "30"))
+
+# ===== PERFIS DE DESEMPENHO DO SQLITE =====
+# Cada perfil define os PRAGMAs aplicados ao abrir uma conexão.
+# - journal_mode: WAL permite leitores simultâneos a um escritor
+# - synchronous: NORMAL (com WAL) só faz fsync nos checkpoints; FULL a cada commit
+# - mmap_size: bytes do arquivo mapeados em memória (0 = desativado)
+# - cache_size: valores negativos indicam KiB (ex: -16000 = ~16 MB)
+# - temp_store: onde ficam tabelas/índices temporários (MEMORY ou DEFAULT)
+# - busy_timeout: milissegundos de espera por um lock antes de "database is locked"
+PERFIS_DESEMPENHO = {
+    # Comportamento original do SQLite (rollback journal, fsync a cada commit)
+    "compatibilidade": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    # Padrão: vários terminais gravando comandas ao mesmo tempo
+    "balanceado": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # WAL com fsync a cada commit (nenhuma comanda perdida em queda de energia)
+    "seguro": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+    # Servidor dedicado com muita memória e alto volume de pedidos
+    "alto_desempenho": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 15000,
+    },
+}
+PERFIL_PADRAO = os.environ.get("RESTAURANTE_DB_PERFIL", "balanceado")
+
+
+def obter_perfil(nome=None):
+    """
+    Retorna as configurações de um perfil de desempenho.
+
+    Args:
+        nome (str): Nome do perfil (padrão: RESTAURANTE_DB_PERFIL ou 'balanceado')
+
+    Returns:
+        dict: PRAGMAs do perfil
+
+    Raises:
+        ValueError: Se o perfil não existir
+    """
+    nome = nome or PERFIL_PADRAO
+    if nome not in PERFIS_DESEMPENHO:
+        raise ValueError(
+            f"Perfil de banco '{nome}' desconhecido. "
+            f"Opções: {', '.join(PERFIS_DESEMPENHO)}"
+        )
+    return PERFIS_DESEMPENHO[nome]
+
+
+def aplicar_perfil(conexao, perfil=None):
+    """
+    Aplica os PRAGMAs de um perfil de desempenho a uma conexão.
+
+    O journal_mode é gravado no próprio arquivo do banco (persistente);
+    os demais valem apenas para esta conexão.
+
+    Args:
+        conexao (sqlite3.Connection): Conexão a configurar
+        perfil (str): Nome do perfil (padrão: PERFIL_PADRAO)
+
+    Returns:
+        str: journal_mode em vigor no banco (o do perfil)
+
+    Raises:
+        sqlite3.OperationalError: Se o journal_mode do perfil não puder ser
+                                  aplicado (ex: outras conexões usando o banco
+                                  impedem a saída do WAL)
+    """
+    config = obter_perfil(perfil)
+    modo = config["journal_mode"]
+    # busy_timeout primeiro: a troca de journal_mode pode precisar esperar um lock
+    conexao.execute(f"PRAGMA busy_timeout = {int(config['busy_timeout'])}")
+    try:
+        (modo_atual,) = conexao.execute(f"PRAGMA journal_mode = {modo}").fetchone()
+    except sqlite3.OperationalError as e:
+        raise sqlite3.OperationalError(f"não foi possível definir journal_mode={modo}: {e}") from e
+    # Sem conseguir trocar, o SQLite apenas devolve o modo atual
+    if modo_atual.lower() != modo.lower():
+        raise sqlite3.OperationalError(
+            f"não foi possível definir journal_mode={modo}: o banco continua em {modo_atual}"
+        )
+    conexao.execute(f"PRAGMA synchronous = {config['synchronous']}")
+    conexao.execute(f"PRAGMA mmap_size = {int(config['mmap_size'])}")
+    conexao.execute(f"PRAGMA cache_size = {int(config['cache_size'])}")
+    conexao.execute(f"PRAGMA temp_store = {config['temp_store']}")
+    return modo_atual.lower()
+
+
+def _abrir_conexao(caminho, perfil=None, instrumentada=True):
+    """
+    Abre uma nova conexão SQLite com o perfil de desempenho configurado.
+
+    Args:
+        caminho (Path | str): Caminho do arquivo do banco de dados
+        perfil (str): Nome do perfil de desempenho (padrão: PERFIL_PADRAO)
+        instrumentada (bool): Se False, as consultas não são registradas
+                              mesmo com a instrumentação ligada
+
+    Returns:
+        sqlite3.Connection: Conexão aberta
+    """
+    config = obter_perfil(perfil)
+    # check_same_thread=False: a conexão pode ser usada por outra thread
+    # depois de devolvida ao pool (nunca por duas threads ao mesmo tempo)
+    # A fábrica instrumentada registra cada consulta (ver instrumentacao.py)
+    conexao = sqlite3.connect(
+        caminho,
+        timeout=config["busy_timeout"] / 1000,
+        check_same_thread=False,
+        factory=ConexaoInstrumentada if INSTRUMENTACAO_ATIVA and instrumentada else sqlite3.Connection,
+    )
+    try:
+        aplicar_perfil(conexao, perfil)
+    except sqlite3.Error:
+        conexao.close()
+        raise
+    return conexao
+
+
+class PoolConexoes:
+    """
+    Pool de conexões SQLite reutilizáveis e seguro para múltiplas threads.
+
+    As conexões livres são mantidas em pilha (LIFO), de modo que a conexão
+    usada mais recentemente, com o cache mais "quente", é entregue primeiro.
+
+    Atributos:
+        caminho: Caminho do arquivo do banco de dados
+        perfil: Nome do perfil de desempenho aplicado às conexões
+        tamanho: Número máximo de conexões abertas
+        timeout: Tempo máximo de espera por uma conexão livre (segundos)
+        intervalo_verificacao: Ociosidade (segundos) a partir da qual a conexão é testada
+    """
+
+    def __init__(self, caminho, tamanho=POOL_TAMANHO, timeout=POOL_TIMEOUT,
+                 intervalo_verificacao=POOL_INTERVALO_VERIFICACAO, perfil=None):
+        """Inicializa um pool vazio; as conexões são abertas sob demanda."""
+        if tamanho < 1:
+            raise ValueError("O tamanho do pool deve ser pelo menos 1")
+        obter_perfil(perfil)  # Valida o nome do perfil logo na criação
+        self.caminho = caminho
+        self.perfil = perfil or PERFIL_PADRAO
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self.intervalo_verificacao = intervalo_verificacao
+        self._condicao = threading.Condition()
+        self._livres = []  # Pilha de tuplas (conexao, instante_devolucao)
+        self._abertas = 0
+        self._fechado = False
+        self._estatisticas = {
+            "criadas": 0,
+            "reutilizadas": 0,
+            "substituidas": 0,
+            "esperas": 0,
+        }
+
+    def _conexao_saudavel(self, conexao):
+        """Executa uma consulta trivial para verificar se a conexão ainda funciona."""
+        try:
+            conexao.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _criar_conexao(self):
+        """Abre uma nova conexão; em caso de erro libera a vaga reservada no pool."""
+        try:
+            conexao = _abrir_conexao(self.caminho, self.perfil)
+        except sqlite3.Error as e:
+            print(f"Erro ao conectar ao banco de dados em {self.caminho}: {e}")
+            with self._condicao:
+                self._abertas -= 1
+                self._condicao.notify()
+            raise
+        with self._condicao:
+            self._estatisticas["criadas"] += 1
+        return conexao
+
+    def abrir_conexao_dedicada(self, instrumentada=True):
+        """
+        Abre uma conexão fora do pool, com o mesmo banco e perfil, que não
+        conta no tamanho do pool (ex: a conexão do escritor único).
+
+        Args:
+            instrumentada (bool): Se False, as consultas da conexão não são registradas
+
+        Returns:
+            sqlite3.Connection: Conexão aberta; quem a abriu deve fechá-la
+        """
+        return _abrir_conexao(self.caminho, self.perfil, instrumentada)
+
+    def adquirir(self):
+        """
+        Retira uma conexão do pool, abrindo uma nova se houver vaga.
+        Bloqueia até 'timeout' segundos se todas estiverem em uso.
+
+        Returns:
+            sqlite3.Connection: Conexão pronta para uso
+
+        Raises:
+            sqlite3.OperationalError: Se o pool estiver fechado ou esgotado
+        """
+        limite = time.monotonic() + self.timeout
+        with self._condicao:
+            while True:
+                if self._fechado:
+                    raise sqlite3.OperationalError("Pool de conexões fechado")
+                if self._livres:
+                    conexao, devolvida_em = self._livres.pop()
+                    self._estatisticas["reutilizadas"] += 1
+                    break
+                if self._abertas < self.tamanho:
+                    # Reserva a vaga e abre a conexão fora do lock
+                    self._abertas += 1
+                    conexao, devolvida_em = None, None
+                    break
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise sqlite3.OperationalError(
+                        f"Pool de conexões esgotado ({self.tamanho} conexões em uso)"
+                    )
+                self._estatisticas["esperas"] += 1
+                self._condicao.wait(restante)
+
+        if conexao is None:
+            return self._criar_conexao()
+
+        # Health check: só testa conexões que ficaram ociosas por muito tempo
+        if time.monotonic() - devolvida_em > self.intervalo_verificacao:
+            if not self._conexao_saudavel(conexao):
+                try:
+                    conexao.close()
+                except sqlite3.Error:
+                    pass
+                with self._condicao:
+                    self._estatisticas["substituidas"] += 1
+                conexao = self._criar_conexao()
+        return conexao
+
+    def devolver(self, conexao, descartar=False):
+        """
+        Devolve uma conexão ao pool.
+        Transações não confirmadas são desfeitas (rollback) antes da devolução.
+
+        Args:
+            conexao (sqlite3.Connection): Conexão obtida com adquirir()
+            descartar (bool): Se True, fecha a conexão em vez de reaproveitá-la
+        """
+        if not descartar:
+            try:
+                if conexao.in_transaction:
+                    conexao.rollback()
+                conexao.row_factory = None
+            except sqlite3.Error:
+                descartar = True
+
+        with self._condicao:
+            if descartar or self._fechado:
+                self._abertas -= 1
+            else:
+                self._livres.append((conexao, time.monotonic()))
+                conexao = None
+            self._condicao.notify()
+
+        if conexao is not None:
+            try:
+                conexao.close()
+            except sqlite3.Error:
+                pass
+
+    def fechar(self):
+        """Fecha todas as conexões livres e impede novas aquisições."""
+        with self._condicao:
+            self._fechado = True
+            livres, self._livres = self._livres, []
+            self._abertas -= len(livres)
+            self._condicao.notify_all()
+        for conexao, _ in livres:
+            try:
+                conexao.close()
+            except sqlite3.Error:
+                pass
+
+    def estatisticas(self):
+        """
+        Retorna contadores de uso do pool.
+
+        Returns:
+            dict: criadas, reutilizadas, substituidas, esperas, abertas, livres e tamanho
+        """
+        with self._condicao:
+            dados = dict(self._estatisticas)
+            dados["abertas"] = self._abertas
+            dados["livres"] = len(self._livres)
+            dados["tamanho"] = self.tamanho
+            dados["perfil"] = self.perfil
+            return dados
+
+
+# ===== POOL GLOBAL DO PROCESSO =====
+_pool = None
+_pool_lock = threading.Lock()
+# Conexão em uso pela thread atual (permite chamadas aninhadas de controllers)
+_local = threading.local()
+
+
+def obter_pool():
+    """
+    Retorna o pool global do processo, criando-o na primeira chamada.
+
+    Returns:
+        PoolConexoes: Pool de conexões do banco do restaurante
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PoolConexoes(DB_NAME)
+    return _pool
+
+
+def configurar_pool(caminho=None, tamanho=None, timeout=None, intervalo_verificacao=None,
+                    perfil=None, historico=None):
+    """
+    Recria o pool global com novos parâmetros, fechando as conexões atuais.
+    Útil para apontar o sistema para outro arquivo de banco (ex: scripts de carga).
+
+    Args:
+        caminho (Path | str): Novo caminho do banco (padrão: DB_NAME)
+        tamanho (int): Número máximo de conexões
+        timeout (float): Espera máxima por uma conexão livre (segundos)
+        intervalo_verificacao (float): Ociosidade que dispara o health check (segundos)
+        perfil (str): Nome do perfil de desempenho (padrão: PERFIL_PADRAO)
+        historico (Path | str): Caminho do banco de histórico (padrão: ao lado
+                                do novo banco, com o sufixo '_historico')
+
+    Returns:
+        PoolConexoes: O novo pool global
+    """
+    global _pool, DB_NAME, DB_HISTORICO
+    with _pool_lock:
+        if _pool is not None:
+            _pool.fechar()
+        if caminho is not None:
+            DB_NAME = Path(caminho)
+            DB_HISTORICO = DB_NAME.with_name(f"{DB_NAME.stem}_historico{DB_NAME.suffix}")
+        if historico is not None:
+            DB_HISTORICO = Path(historico)
+        _pool = PoolConexoes(
+            DB_NAME,
+            tamanho=tamanho if tamanho is not None else POOL_TAMANHO,
+            timeout=timeout if timeout is not None else POOL_TIMEOUT,
+            intervalo_verificacao=(
+                intervalo_verificacao if intervalo_verificacao is not None
+                else POOL_INTERVALO_VERIFICACAO
+            ),
+            perfil=perfil,
+        )
+        return _pool
+
+
+def fechar_pool():
+    """Fecha o pool global (ex: ao encerrar o processo)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.fechar()
+            _pool = None
+
+
+def estatisticas_pool():
+    """Retorna os contadores de uso do pool global."""
+    return obter_pool().estatisticas()
+
+
+@contextmanager
+def obter_conexao(modo_dicionario=False):
+    """
+    Context manager que empresta uma conexão do pool e a devolve ao final.
+
+    Chamadas aninhadas na mesma thread (ex: um controller que chama outro)
+    reutilizam a mesma conexão em vez de retirar outra do pool.
+    Alterações não confirmadas com commit() são desfeitas na devolução.
+
+    Args:
+        modo_dicionario (bool): Se True, as linhas permitem acesso pelo nome
+                                da coluna (row_factory = sqlite3.Row)
+
+    Yields:
+        sqlite3.Connection: Conexão emprestada do pool
+
+    Raises:
+        sqlite3.OperationalError: Se não houver conexão disponível no pool
+    """
+    fabrica = sqlite3.Row if modo_dicionario else None
+    conexao = getattr(_local, "conexao", None)
+
+    # Chamada aninhada: reutiliza a conexão já emprestada a esta thread
+    if conexao is not None:
+        fabrica_anterior = conexao.row_factory
+        conexao.row_factory = fabrica
+        try:
+            yield conexao
+        finally:
+            conexao.row_factory = fabrica_anterior
+        return
+
+    pool = obter_pool()
+    conexao = pool.adquirir()
+    conexao.row_factory = fabrica
+    _local.conexao = conexao
+    descartar = False
+    try:
+        yield conexao
+    except (sqlite3.ProgrammingError, sqlite3.InterfaceError):
+        # Conexão em estado inválido: não deve voltar ao pool
+        descartar = True
+        raise
+    finally:
+        _local.conexao = None
+        pool.devolver(conexao, descartar=descartar)
+
+
+@contextmanager
+def transacao(modo_dicionario=False):
+    """
+    Unidade de trabalho: executa um bloco inteiro em uma única transação.
+
+    A transação é iniciada com BEGIN IMMEDIATE (reserva o lock de escrita logo
+    no início) e confirmada com um único commit ao final do bloco. Qualquer
+    exceção desfaz tudo (rollback) e é propagada.
+
+    Transações aninhadas na mesma thread (ex: operações agrupadas pelo
+    escritor único, ver Controllers/escritor.py) participam da transação
+    externa como savepoints: apenas o bloco mais externo faz o commit, e um
+    erro no bloco interno desfaz só o que ele alterou.
+
+    Args:
+        modo_dicionario (bool): Se True, as linhas permitem acesso pelo nome da coluna
+
+    Yields:
+        sqlite3.Connection: Conexão com a transação aberta
+    """
+    with obter_conexao(modo_dicionario) as conexao:
+        # Já existe uma unidade de trabalho nesta thread: participa dela por
+        # meio de um savepoint, que desfaz apenas este bloco em caso de erro
+        if getattr(_local, "em_transacao", False):
+            nivel = _local.savepoints = getattr(_local, "savepoints", 0) + 1
+            nome = f"bloco_{nivel}"
+            conexao.execute(f"SAVEPOINT {nome}")
+            try:
+                yield conexao
+                conexao.execute(f"RELEASE {nome}")
+            except BaseException:
+                conexao.execute(f"ROLLBACK TO {nome}")
+                conexao.execute(f"RELEASE {nome}")
+                raise
+            finally:
+                _local.savepoints = nivel - 1
+            return
+
+        if not conexao.in_transaction:
+            conexao.execute("BEGIN IMMEDIATE")
+        _local.em_transacao = True
+        _local.apos_transacao = []
+        try:
+            yield conexao
+            conexao.commit()
+        except BaseException:
+            conexao.rollback()
+            raise
+        finally:
+            _local.em_transacao = False
+            pendentes, _local.apos_transacao = _local.apos_transacao, []
+            for funcao in pendentes:
+                funcao()
+
+
+def em_transacao():
+    """Indica se a thread atual está dentro de uma unidade de trabalho (transacao())."""
+    return getattr(_local, "em_transacao", False)
+
+
+def apos_transacao(funcao):
+    """
+    Executa uma função ao final da transação em andamento na thread atual
+    (depois do commit ou do rollback), ou imediatamente se não houver uma.
+
+    Usado para invalidar o cache só quando a alteração já está visível para
+    as outras conexões: invalidar antes do commit permitiria que uma leitura
+    concorrente recarregasse o dado antigo no cache.
+
+    Args:
+        funcao (callable): Função sem argumentos
+    """
+    if em_transacao():
+        _local.apos_transacao.append(funcao)
+    else:
+        funcao()
+
+
+@contextmanager
+def conexao_vinculada(conexao):
+    """
+    Usa uma conexão própria (fora do pool) como a conexão da thread atual:
+    obter_conexao() e transacao() passam a reutilizá-la dentro do bloco.
+
+    Args:
+        conexao (sqlite3.Connection): Conexão aberta com _abrir_conexao()
+
+    Yields:
+        sqlite3.Connection: A mesma conexão
+    """
+    anterior = getattr(_local, "conexao", None)
+    _local.conexao = conexao
+    try:
+        yield conexao
+    finally:
+        _local.conexao = anterior
+
+
+# ===== FUNÇÕES DE CONEXÃO AVULSA =====
+# Mantidas para scripts e ferramentas que precisam de uma conexão própria,
+# fora do pool. Os controllers devem usar obter_conexao().
+
 def conecta_bd():
     """
-    Conecta ao banco de dados SQLite no caminho correto.
-    
+    Conecta ao banco de dados SQLite no caminho correto (conexão avulsa, fora do pool).
+
     Returns:
         sqlite3.Connection: Conexão com o banco de dados
-        
+
     Raises:
         sqlite3.OperationalError: Se houver erro ao conectar ao banco
     """
     try:
-        return sqlite3.connect(DB_NAME)
+        return _abrir_conexao(DB_NAME)
     except sqlite3.OperationalError as e:
         print(f"Erro ao conectar ao banco de dados em {DB_NAME}: {e}")
         # Isto pode indicar um problema de permissão ou caminho inválido
@@ -35,21 +622,21 @@ def conecta_bd():
 
 def get_db_connection():
     """
-    Conecta ao banco de dados com modo dicionário ativado.
+    Conecta ao banco de dados com modo dicionário ativado (conexão avulsa, fora do pool).
     O modo dicionário permite acessar as colunas pelo nome em vez de índice.
-    
+
     Returns:
         sqlite3.Connection: Conexão com row_factory configurada
-        
+
     Raises:
         sqlite3.OperationalError: Se houver erro ao obter a conexão
     """
     try:
-        conn = sqlite3.connect(DB_NAME)
+        conn = _abrir_conexao(DB_NAME)
         # row_factory transforma as linhas em objetos que permitem acesso por nome de coluna
         # Ex: row["id_cliente"] em vez de row[0]
         conn.row_factory = sqlite3.Row
         return conn
     except sqlite3.OperationalError as e:
         print(f"Erro ao obter conexão (row_factory) ao banco {DB_NAME}: {e}")
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,315 @@
+# Controllers/escritor.py
+"""
+Escritor único: todas as escritas dos controllers passam por uma só thread.
+
+O SQLite aceita um escritor por vez. Com cada controller fazendo o próprio
+commit, terminais que gravam ao mesmo tempo disputam o lock de escrita
+(esperando o busy_timeout ou recebendo "database is locked") e cada um paga
+o seu commit. Aqui as funções de escrita são enfileiradas e executadas por
+uma thread dedicada, com uma conexão própria, que agrupa as operações da
+fila em uma única transação (group commit):
+
+    BEGIN IMMEDIATE
+      SAVEPOINT  abrir_comanda(...)            -> resultado da operação 1
+      SAVEPOINT  adicionar_itens_comanda(...)  -> resultado da operação 2
+      ...
+    COMMIT                                     -> um commit (e um fsync) para o lote
+
+Cada operação roda em um savepoint (ver transacao()): uma operação com erro
+desfaz apenas as próprias alterações, e as demais do lote são gravadas.
+Quem chamou recebe o resultado da sua operação só depois do commit.
+
+O agrupamento acontece sozinho: enquanto um lote é gravado, as operações
+que chegam esperam na fila e formam o próximo. Com pouca carga, cada
+operação é gravada assim que chega. RESTAURANTE_ESCRITOR_LATENCIA_MS faz o
+escritor, quando o lote anterior teve mais de uma operação, esperar um pouco
+mais antes do commit (como o commit_delay do PostgreSQL). Só compensa com
+commits caros (fsync em disco lento): no simulador de carga, esperar 2 ms
+reduziu a vazão, por isso o padrão é 0.
+
+Uso nos controllers:
+
+    @via_escritor
+    def abrir_comanda(funcionario_id, mesa_id):
+        with transacao() as conexao:
+            ...
+
+Chamadas feitas dentro de uma transação já aberta na thread (ou pela própria
+thread do escritor) são executadas diretamente, participando da transação
+em andamento.
+"""
+
+import functools
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from Controllers.db_connection import (
+    conexao_vinculada, em_transacao, obter_pool, transacao,
+)
+
+# ===== CONFIGURAÇÃO =====
+# Permite desligar o escritor único (cada chamada grava na própria thread)
+ESCRITOR_ATIVO = os.environ.get("RESTAURANTE_ESCRITOR_ATIVO", "1") != "0"
+# Espera máxima (ms) por mais operações antes do commit, quando há concorrência
+ESCRITOR_LATENCIA_MS = float(os.environ.get("RESTAURANTE_ESCRITOR_LATENCIA_MS", "0"))
+# Máximo de operações em uma transação
+ESCRITOR_LOTE_MAXIMO = int(os.environ.get("RESTAURANTE_ESCRITOR_LOTE", "64"))
+
+
+class _Operacao:
+    """Uma chamada de função de escrita aguardando o escritor."""
+
+    __slots__ = ("funcao", "args", "kwargs", "futuro", "origem", "resultado", "erro")
+
+    def __init__(self, funcao, args, kwargs):
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.futuro = Future()
+        self.origem = threading.get_ident()
+        self.resultado = None
+        self.erro = None
+
+
+class EscritorUnico:
+    """
+    Fila de operações de escrita consumida por uma thread dedicada.
+
+    A thread é iniciada na primeira operação e mantém uma conexão própria,
+    fora do pool (leitores nunca deixam o escritor sem conexão). Se o pool
+    global for reconfigurado para outro banco, a conexão é reaberta.
+
+    Atributos:
+        latencia: Espera máxima (segundos) por mais operações quando há concorrência
+        lote_maximo: Máximo de operações por transação
+    """
+
+    def __init__(self, latencia=ESCRITOR_LATENCIA_MS / 1000, lote_maximo=ESCRITOR_LOTE_MAXIMO):
+        """Cria o escritor parado; a thread é iniciada sob demanda."""
+        self.latencia = latencia
+        self.lote_maximo = max(1, lote_maximo)
+        self._fila = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._conexao = None
+        self._pool = None
+        self._ultimo_lote = 0
+        self._local = threading.local()
+        self._estatisticas = {
+            "operacoes": 0,
+            "lotes": 0,
+            "maior_lote": 0,
+            "reexecutadas": 0,
+        }
+
+    def submeter(self, funcao, *args, **kwargs):
+        """
+        Enfileira uma função de escrita.
+
+        Returns:
+            concurrent.futures.Future: Resultado da função, disponível após o commit
+        """
+        operacao = _Operacao(funcao, args, kwargs)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._executar, name="restaurante-escritor", daemon=True
+                )
+                self._thread.start()
+            self._fila.put(operacao)
+        return operacao.futuro
+
+    def na_thread_escritora(self):
+        """Indica se o código atual está rodando na thread do escritor."""
+        return self._thread is not None and threading.get_ident() == self._thread.ident
+
+    def thread_origem(self):
+        """
+        ID da thread que submeteu a operação em execução (apenas na thread do
+        escritor; None fora dela). Permite atribuir mensagens a quem chamou.
+        """
+        return getattr(self._local, "origem", None)
+
+    def encerrar(self):
+        """Grava as operações pendentes, encerra a thread e fecha a conexão."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None and thread.is_alive():
+                self._fila.put(None)
+        if thread is not None:
+            thread.join()
+
+    def estatisticas(self):
+        """
+        Retorna contadores do escritor.
+
+        Returns:
+            dict: operacoes, lotes, maior_lote, media_lote, reexecutadas e pendentes
+        """
+        with self._lock:
+            dados = dict(self._estatisticas)
+        dados["media_lote"] = round(dados["operacoes"] / dados["lotes"], 2) if dados["lotes"] else 0.0
+        dados["pendentes"] = self._fila.qsize()
+        return dados
+
+    # ===== THREAD DO ESCRITOR =====
+
+    def _executar(self):
+        try:
+            while True:
+                operacao = self._fila.get()
+                if operacao is None:
+                    return
+                lote = self._montar_lote(operacao)
+                encerrar = lote[-1] is None
+                if encerrar:
+                    lote.pop()
+                if lote:
+                    self._gravar(lote)
+                if encerrar:
+                    return
+        finally:
+            self._fechar_conexao()
+
+    def _montar_lote(self, primeira):
+        """Junta à primeira operação as que já estão na fila (e, com concorrência, as que chegarem logo)."""
+        lote = [primeira]
+        prazo = None
+        while len(lote) < self.lote_maximo:
+            try:
+                operacao = self._fila.get_nowait()
+            except queue.Empty:
+                # Sem concorrência não há por que esperar: grava já
+                if self.latencia <= 0 or (len(lote) == 1 and self._ultimo_lote <= 1):
+                    break
+                if prazo is None:
+                    prazo = time.monotonic() + self.latencia
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    operacao = self._fila.get(timeout=restante)
+                except queue.Empty:
+                    break
+            lote.append(operacao)
+            if operacao is None:
+                break
+        return lote
+
+    def _obter_conexao(self):
+        """Conexão do escritor, reaberta se o pool global mudou de banco."""
+        pool = obter_pool()
+        if self._conexao is None or pool is not self._pool:
+            self._fechar_conexao()
+            self._conexao = pool.abrir_conexao_dedicada()
+            self._pool = pool
+        return self._conexao
+
+    def _fechar_conexao(self):
+        if self._conexao is not None:
+            try:
+                self._conexao.close()
+            except sqlite3.Error:
+                pass
+            self._conexao = None
+
+    def _executar_operacao(self, operacao):
+        """Executa uma operação guardando o resultado ou a exceção."""
+        self._local.origem = operacao.origem
+        try:
+            # Savepoint da operação: uma exceção desfaz só o que ela alterou
+            with transacao():
+                operacao.resultado = operacao.funcao(*operacao.args, **operacao.kwargs)
+        except Exception as e:
+            operacao.erro = e
+        finally:
+            self._local.origem = None
+
+    def _gravar(self, lote):
+        """Executa o lote em uma transação; se o commit falhar, cada operação é refeita sozinha."""
+        lote = [op for op in lote if op.futuro.set_running_or_notify_cancel()]
+        if not lote:
+            return
+        try:
+            conexao = self._obter_conexao()
+            with conexao_vinculada(conexao):
+                with transacao():
+                    for operacao in lote:
+                        self._executar_operacao(operacao)
+                        # Um erro grave (ex: disco cheio) faz o SQLite desfazer a
+                        # transação inteira: as operações anteriores se perderam
+                        if not conexao.in_transaction:
+                            raise sqlite3.OperationalError("transação do lote desfeita pelo SQLite")
+        except sqlite3.Error as e:
+            # Nada do lote foi gravado (ex: lock mantido por outro processo):
+            # cada operação roda em transação própria e informa o próprio erro
+            print(f"Aviso: lote de {len(lote)} escrita(s) desfeito ({e}); gravando uma a uma")
+            with self._lock:
+                self._estatisticas["reexecutadas"] += len(lote)
+            for operacao in lote:
+                operacao.resultado = operacao.erro = None
+                try:
+                    with conexao_vinculada(self._obter_conexao()):
+                        self._executar_operacao(operacao)
+                except sqlite3.Error as erro_conexao:
+                    operacao.erro = erro_conexao
+
+        with self._lock:
+            self._estatisticas["operacoes"] += len(lote)
+            self._estatisticas["lotes"] += 1
+            self._estatisticas["maior_lote"] = max(self._estatisticas["maior_lote"], len(lote))
+        self._ultimo_lote = len(lote)
+        for operacao in lote:
+            if operacao.erro is not None:
+                operacao.futuro.set_exception(operacao.erro)
+            else:
+                operacao.futuro.set_result(operacao.resultado)
+
+
+# ===== ESCRITOR GLOBAL DO PROCESSO =====
+_escritor = EscritorUnico()
+
+
+def submeter(funcao, *args, **kwargs):
+    """
+    Enfileira uma função de escrita no escritor global.
+
+    Returns:
+        concurrent.futures.Future: Resultado da função, disponível após o commit
+    """
+    return _escritor.submeter(funcao, *args, **kwargs)
+
+
+def via_escritor(funcao):
+    """
+    Decorador das funções de escrita dos controllers: a chamada é executada
+    pelo escritor único e quem chamou espera o resultado (após o commit).
+    A função original continua disponível em <funcao>.direta.
+    """
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        if not ESCRITOR_ATIVO or em_transacao() or _escritor.na_thread_escritora():
+            return funcao(*args, **kwargs)
+        return _escritor.submeter(funcao, *args, **kwargs).result()
+
+    envoltorio.direta = funcao
+    return envoltorio
+
+
+def thread_origem():
+    """ID da thread que submeteu a escrita em execução no escritor (ou None)."""
+    return _escritor.thread_origem()
+
+
+def encerrar_escritor():
+    """Grava as operações pendentes e encerra a thread do escritor global."""
+    _escritor.encerrar()
+
+
+def estatisticas_escritor():
+    """Retorna os contadores do escritor global."""
+    return _escritor.estatisticas()
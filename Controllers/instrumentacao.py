@@ -0,0 +1,525 @@
+# Controllers/instrumentacao.py
+"""
+Instrumentação de consultas SQL e da renderização das páginas.
+
+A instrumentação é opcional (RESTAURANTE_INSTRUMENTACAO=1): ligada, as
+conexões do pool são criadas com ConexaoInstrumentada (ver
+db_connection._abrir_conexao) e cada comando executado gera um registro com
+o SQL, o formato dos parâmetros (tipos, nunca os valores), a duração, as
+linhas retornadas e a função do controller que o executou (o que exige
+percorrer a pilha a cada comando). Com RESTAURANTE_INSTRUMENTACAO_AMOSTRA
+menor que 1, só essa fração dos comandos é registrada. A renderização de
+cada página é medida em main.main() com medir_render(), e a das atualizações
+automáticas (st.fragment) das páginas Cozinha e Salão ao Vivo, em separado.
+
+Os registros ficam em buffers circulares em memória (os mais antigos são
+descartados) e, se RESTAURANTE_INSTRUMENTACAO_LOG estiver definida, também
+são gravados nesse arquivo, um JSON por linha. A página "Diagnóstico"
+exibe as consultas mais lentas e os percentis de renderização.
+
+Consultas que passam de RESTAURANTE_CONSULTA_LENTA_MS são guardadas também
+no registro de consultas lentas, com a saída de EXPLAIN QUERY PLAN e as
+varreduras completas (SCAN) de tabelas grandes, como comanda e
+comanda_item_cardapio.
+"""
+
+import functools
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Use RESTAURANTE_INSTRUMENTACAO=1 para abrir conexões com instrumentação
+INSTRUMENTACAO_ATIVA = os.environ.get("RESTAURANTE_INSTRUMENTACAO", "0") == "1"
+# Fração dos comandos registrados quando a instrumentação está ligada (0 a 1)
+AMOSTRA_INSTRUMENTACAO = float(os.environ.get("RESTAURANTE_INSTRUMENTACAO_AMOSTRA", "1"))
+# Quantidade de registros mantidos em memória (consultas e renderizações)
+LIMITE_REGISTROS = int(os.environ.get("RESTAURANTE_INSTRUMENTACAO_LIMITE", "2000"))
+# Arquivo de log opcional (JSON por linha)
+ARQUIVO_LOG = os.environ.get("RESTAURANTE_INSTRUMENTACAO_LOG")
+# Duração (ms) a partir da qual a consulta entra no registro de lentas
+LIMIAR_CONSULTA_LENTA_MS = float(os.environ.get("RESTAURANTE_CONSULTA_LENTA_MS", "100"))
+# Consultas lentas mantidas em memória (cada uma com o plano de execução)
+LIMITE_CONSULTAS_LENTAS = 200
+# Tabelas que crescem com o movimento: varrê-las inteiras é sempre suspeito
+TABELAS_GRANDES = ("comanda", "comanda_item_cardapio", "comanda_cliente", "cliente")
+
+# Módulos ignorados ao procurar quem executou a consulta
+_MODULOS_INTERNOS = ("Controllers.instrumentacao", "Controllers.db_connection", "contextlib")
+_PROFUNDIDADE_CHAMADOR = 20
+_ESPACOS = re.compile(r"\s+")
+# Comandos aceitos por EXPLAIN QUERY PLAN que fazem sentido analisar
+_EXPLICAVEIS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+# Tabela e apelido em FROM/JOIN (para traduzir "SCAN c" em "comanda")
+_ORIGENS = re.compile(r"\b(?:FROM|JOIN)\s+(?:\w+\.)?(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_PALAVRAS_RESERVADAS = {
+    "where", "join", "left", "inner", "cross", "on", "group", "order", "limit",
+    "indexed", "not", "using", "union", "natural", "outer", "set", "values",
+}
+# Passo do plano que lê a tabela inteira (SQLite >= 3.36: "SCAN x"; antes: "SCAN TABLE x")
+_VARREDURA = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?(.*)$")
+
+_lock = threading.Lock()
+_lock_log = threading.Lock()
+_consultas = deque(maxlen=LIMITE_REGISTROS)
+_renders = deque(maxlen=LIMITE_REGISTROS)
+_lentas = deque(maxlen=LIMITE_CONSULTAS_LENTAS)
+# Registros de cursores descartados pelo coletor de lixo, concluídos na
+# próxima consulta registrada (deque.append dispensa lock)
+_pendentes = deque(maxlen=LIMITE_REGISTROS)
+
+
+def _amostrar():
+    """Sorteia se o próximo comando será registrado (ver AMOSTRA_INSTRUMENTACAO)."""
+    return AMOSTRA_INSTRUMENTACAO >= 1 or random.random() < AMOSTRA_INSTRUMENTACAO
+
+
+def _chamador():
+    """Retorna 'modulo.funcao' do primeiro quadro da pilha fora da camada de banco."""
+    quadro = sys._getframe(2)
+    for _ in range(_PROFUNDIDADE_CHAMADOR):
+        if quadro is None:
+            break
+        modulo = quadro.f_globals.get("__name__", "")
+        if not modulo.startswith(_MODULOS_INTERNOS) and not modulo.startswith("pandas"):
+            return f"{modulo}.{quadro.f_code.co_name}"
+        quadro = quadro.f_back
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalizar_sql(sql):
+    """SQL em uma linha. Em cache: os registros do mesmo comando compartilham o texto."""
+    return _ESPACOS.sub(" ", sql).strip()
+
+
+def _formato_parametros(parametros):
+    """Descreve os parâmetros pelos tipos, sem expor os valores (ex: CPF)."""
+    if not parametros:
+        return ""
+    if isinstance(parametros, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parametros.items()) + "}"
+    return "(" + ", ".join(type(v).__name__ for v in parametros) + ")"
+
+
+def _gravar_log(registro):
+    """Acrescenta um registro ao arquivo de log, se configurado."""
+    if not ARQUIVO_LOG:
+        return
+    try:
+        with _lock_log, open(ARQUIVO_LOG, "a", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Erro ao gravar log de instrumentação: {e}")
+
+
+def plano_consulta(conexao, sql, parametros=None):
+    """
+    Executa EXPLAIN QUERY PLAN para um comando.
+
+    Args:
+        conexao (sqlite3.Connection): Conexão com o banco
+        sql (str): Comando a analisar
+        parametros (tuple | dict): Valores dos parâmetros; se None, todos são NULL
+                                   (o plano raramente depende dos valores)
+
+    Returns:
+        list: Texto de cada passo do plano (coluna 'detail'), na ordem do SQLite
+    """
+    if parametros is None:
+        # Conta os marcadores '?' fora de literais de texto
+        parametros = (None,) * re.sub(r"'[^']*'", "", sql).count("?")
+    # Cursor comum: a análise não deve gerar outro registro de instrumentação
+    cursor = conexao.cursor(sqlite3.Cursor)
+    try:
+        return [linha[3] for linha in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parametros)]
+    finally:
+        cursor.close()
+
+
+def varreduras_completas(plano, sql, tabelas=TABELAS_GRANDES):
+    """
+    Identifica no plano as leituras completas (SCAN sem índice) das tabelas grandes.
+
+    Args:
+        plano (list): Passos retornados por plano_consulta()
+        sql (str): Comando analisado (para traduzir apelidos em nomes de tabela)
+        tabelas (tuple): Tabelas consideradas grandes
+
+    Returns:
+        list: Nomes das tabelas grandes varridas por completo (sem repetição)
+    """
+    apelidos = {}
+    for tabela, apelido in _ORIGENS.findall(sql):
+        apelidos[tabela.lower()] = tabela.lower()
+        if apelido and apelido.lower() not in _PALAVRAS_RESERVADAS:
+            apelidos[apelido.lower()] = tabela.lower()
+    varridas = []
+    for passo in plano:
+        encontrado = _VARREDURA.match(passo)
+        if not encontrado:
+            continue
+        nome, apelido, resto = encontrado.groups()
+        # "SCAN x USING [COVERING] INDEX" percorre um índice, não a tabela
+        if "USING" in resto:
+            continue
+        tabela = apelidos.get(nome.lower(), nome.lower())
+        if apelido:
+            tabela = apelidos.get(apelido.lower(), tabela)
+        if tabela in tabelas and tabela not in varridas:
+            varridas.append(tabela)
+    return varridas
+
+
+def comando_explicavel(sql):
+    """Indica se o comando é uma consulta ou escrita analisável por EXPLAIN QUERY PLAN."""
+    return sql.lstrip("( \n\t").upper().startswith(_EXPLICAVEIS)
+
+
+def _registrar_lenta(conexao, registro, parametros):
+    """Guarda uma consulta lenta com o plano de execução e as varreduras encontradas."""
+    lenta = dict(registro)
+    lenta["plano"] = []
+    lenta["varreduras"] = []
+    if comando_explicavel(lenta["sql"]):
+        try:
+            lenta["plano"] = plano_consulta(conexao, registro["sql"], parametros)
+            lenta["varreduras"] = varreduras_completas(lenta["plano"], registro["sql"])
+        except sqlite3.Error as e:
+            lenta["plano"] = [f"(plano indisponível: {e})"]
+    with _lock:
+        _lentas.append(lenta)
+    _gravar_log(dict(lenta, tipo="consulta_lenta"))
+
+
+def _concluir_pendentes():
+    """
+    Conclui os registros de cursores descartados sem esgotar o resultado:
+    grava o log e, se lentos, guarda-os entre as consultas lentas sem o plano
+    (a conexão do cursor pode já estar em uso por outra thread).
+    """
+    while True:
+        try:
+            registro = _pendentes.popleft()
+        except IndexError:
+            return
+        _gravar_log(registro)
+        if registro["duracao_ms"] >= LIMIAR_CONSULTA_LENTA_MS and registro["erro"] is None:
+            lenta = dict(registro, varreduras=[],
+                         plano=["(plano não obtido: cursor descartado antes de esgotar o resultado)"])
+            with _lock:
+                _lentas.append(lenta)
+            _gravar_log(dict(lenta, tipo="consulta_lenta"))
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """
+    Cursor que mede cada execute/executemany.
+    O tempo gasto lendo as linhas (fetch*) é somado à duração do comando,
+    e o registro é finalizado ao esgotar o resultado, ao executar outro
+    comando ou ao fechar o cursor; comandos sem resultado (escritas) são
+    finalizados logo após o execute. Um cursor descartado antes disso tem
+    só o tempo registrado, sem o plano (ver __del__).
+    """
+
+    _registro = None
+    _parametros = None
+
+    def _iniciar(self, sql, formato, parametros):
+        if _pendentes:
+            _concluir_pendentes()
+        # Mantidos só até o fim do registro, para o EXPLAIN de uma consulta lenta
+        self._parametros = parametros
+        self._registro = {
+            "instante": datetime.now().isoformat(timespec="milliseconds"),
+            "sql": _normalizar_sql(sql),
+            "parametros": formato,
+            "chamador": _chamador(),
+            "duracao_ms": 0.0,
+            "linhas": 0,
+            "erro": None,
+        }
+        with _lock:
+            _consultas.append(self._registro)
+
+    def _medir(self, inicio, linhas=0):
+        registro = self._registro
+        if registro is not None:
+            registro["duracao_ms"] += (time.perf_counter() - inicio) * 1000
+            registro["linhas"] += linhas
+
+    def _finalizar(self):
+        registro, self._registro = self._registro, None
+        parametros, self._parametros = self._parametros, None
+        if registro is not None:
+            # Comandos de escrita: linhas afetadas em vez de linhas lidas
+            if not registro["linhas"] and self.rowcount > 0:
+                registro["linhas"] = self.rowcount
+            _gravar_log(registro)
+            if registro["duracao_ms"] >= LIMIAR_CONSULTA_LENTA_MS and registro["erro"] is None:
+                _registrar_lenta(self.connection, registro, parametros)
+
+    def _encerrar_execucao(self, inicio):
+        self._medir(inicio)
+        # Sem resultado a ler (escritas, erros): o registro já está completo
+        if self.description is None:
+            self._finalizar()
+
+    def execute(self, sql, parametros=()):
+        self._finalizar()
+        if not _amostrar():
+            return super().execute(sql, parametros)
+        self._iniciar(sql, _formato_parametros(parametros), parametros)
+        inicio = time.perf_counter()
+        try:
+            super().execute(sql, parametros)
+        except sqlite3.Error as e:
+            self._registro["erro"] = str(e)
+            raise
+        finally:
+            self._encerrar_execucao(inicio)
+        return self
+
+    def executemany(self, sql, sequencia):
+        self._finalizar()
+        if not _amostrar():
+            return super().executemany(sql, sequencia)
+        sequencia = list(sequencia)
+        formato = _formato_parametros(sequencia[0]) if sequencia else ""
+        self._iniciar(sql, f"{len(sequencia)} x {formato}", sequencia[0] if sequencia else None)
+        inicio = time.perf_counter()
+        try:
+            super().executemany(sql, sequencia)
+        except sqlite3.Error as e:
+            self._registro["erro"] = str(e)
+            raise
+        finally:
+            self._encerrar_execucao(inicio)
+        return self
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        self._medir(inicio, linha is not None)
+        if linha is None:
+            self._finalizar()
+        return linha
+
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        linhas = super().fetchmany(self.arraysize if size is None else size)
+        self._medir(inicio, len(linhas))
+        if not linhas:
+            self._finalizar()
+        return linhas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        self._medir(inicio, len(linhas))
+        self._finalizar()
+        return linhas
+
+    def __next__(self):
+        inicio = time.perf_counter()
+        try:
+            linha = super().__next__()
+        except StopIteration:
+            self._medir(inicio)
+            self._finalizar()
+            raise
+        self._medir(inicio, 1)
+        return linha
+
+    def close(self):
+        self._finalizar()
+        super().close()
+
+    def __del__(self):
+        # Roda no coletor de lixo, em qualquer thread: nada de EXPLAIN na
+        # conexão (que pode estar com outra thread), de arquivo ou de lock.
+        # O tempo medido até aqui já está no buffer; o resto fica para
+        # _concluir_pendentes()
+        registro = self._registro
+        if registro is not None:
+            _pendentes.append(registro)
+
+
+class ConexaoInstrumentada(sqlite3.Connection):
+    """
+    Conexão cujos cursores são instrumentados.
+    execute/executemany da conexão são redirecionados para um cursor próprio,
+    já que os métodos nativos não passam pelo cursor Python.
+    """
+
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, sequencia):
+        return self.cursor().executemany(sql, sequencia)
+
+
+# Módulos (conforme a versão do Streamlit) da exceção de controle de fluxo
+# lançada por st.rerun() e st.stop()
+_MODULOS_CONTROLE_STREAMLIT = (
+    "streamlit.runtime.scriptrunner_utils.exceptions",
+    "streamlit.runtime.scriptrunner.exceptions",
+)
+
+
+def _controle_streamlit(excecao):
+    """
+    Indica se a exceção é o controle de fluxo do Streamlit (st.rerun, st.stop).
+    Só consulta módulos já importados: sem Streamlit (ex: API HTTP), é sempre False.
+    """
+    for nome in _MODULOS_CONTROLE_STREAMLIT:
+        modulo = sys.modules.get(nome)
+        controle = getattr(modulo, "ScriptControlException", None)
+        if controle is not None and isinstance(excecao, controle):
+            return True
+    return False
+
+
+@contextmanager
+def medir_render(pagina):
+    """
+    Mede a renderização de uma página ou de um trecho reexecutado sozinho
+    (st.fragment). st.rerun() e st.stop() encerram a execução normalmente:
+    só as demais exceções são registradas como erro.
+
+    Uso:
+        with medir_render("Gestão de Comandas"):
+            show_comanda_page()
+    """
+    inicio = time.perf_counter()
+    erro = None
+    try:
+        yield
+    except BaseException as e:
+        if not _controle_streamlit(e):
+            erro = type(e).__name__
+        raise
+    finally:
+        registro = {
+            "instante": datetime.now().isoformat(timespec="milliseconds"),
+            "pagina": pagina,
+            "duracao_ms": (time.perf_counter() - inicio) * 1000,
+            "erro": erro,
+        }
+        with _lock:
+            _renders.append(registro)
+        _gravar_log(registro)
+
+
+def _percentil(valores, fracao):
+    """Percentil por vizinho mais próximo de uma lista ordenada."""
+    return valores[min(len(valores) - 1, int(round(fracao * (len(valores) - 1))))]
+
+
+def consultas_recentes(limite=None):
+    """
+    Retorna os registros de consulta em memória, do mais recente ao mais antigo.
+
+    Returns:
+        list: Cópias dos registros (instante, sql, parametros, chamador,
+              duracao_ms, linhas, erro)
+    """
+    _concluir_pendentes()
+    with _lock:
+        registros = [dict(r) for r in reversed(_consultas)]
+    return registros[:limite] if limite else registros
+
+
+def consultas_mais_lentas(limite=20):
+    """Retorna as execuções individuais mais lentas do buffer."""
+    return sorted(consultas_recentes(), key=lambda r: r["duracao_ms"], reverse=True)[:limite]
+
+
+def consultas_agrupadas(limite=20):
+    """
+    Agrupa as execuções do buffer por SQL e chamador.
+
+    Returns:
+        list: Dicts com sql, chamador, execucoes, total_ms, media_ms, p95_ms,
+              max_ms e linhas (média), ordenados pelo tempo total
+    """
+    grupos = {}
+    for registro in consultas_recentes():
+        grupos.setdefault((registro["sql"], registro["chamador"]), []).append(registro)
+    resultado = []
+    for (sql, chamador), registros in grupos.items():
+        duracoes = sorted(r["duracao_ms"] for r in registros)
+        resultado.append({
+            "sql": sql,
+            "chamador": chamador,
+            "execucoes": len(registros),
+            "total_ms": sum(duracoes),
+            "media_ms": sum(duracoes) / len(duracoes),
+            "p95_ms": _percentil(duracoes, 0.95),
+            "max_ms": duracoes[-1],
+            "linhas": sum(r["linhas"] for r in registros) / len(registros),
+        })
+    resultado.sort(key=lambda g: g["total_ms"], reverse=True)
+    return resultado[:limite]
+
+
+def consultas_lentas(limite=None):
+    """
+    Retorna as consultas que passaram de LIMIAR_CONSULTA_LENTA_MS, da mais recente
+    à mais antiga.
+
+    Returns:
+        list: Registros de consulta com, além dos campos usuais, plano (passos
+              do EXPLAIN QUERY PLAN) e varreduras (tabelas grandes lidas por inteiro)
+    """
+    _concluir_pendentes()
+    with _lock:
+        registros = [dict(r) for r in reversed(_lentas)]
+    return registros[:limite] if limite else registros
+
+
+def estatisticas_render():
+    """
+    Percentis do tempo de renderização de cada página.
+
+    Returns:
+        list: Dicts com pagina, renderizacoes, p50_ms, p95_ms, max_ms e ultima_ms,
+              ordenados pelo p95
+    """
+    with _lock:
+        registros = list(_renders)
+    por_pagina = {}
+    for registro in registros:
+        por_pagina.setdefault(registro["pagina"], []).append(registro["duracao_ms"])
+    resultado = []
+    for pagina, duracoes in por_pagina.items():
+        ordenadas = sorted(duracoes)
+        resultado.append({
+            "pagina": pagina,
+            "renderizacoes": len(duracoes),
+            "p50_ms": _percentil(ordenadas, 0.50),
+            "p95_ms": _percentil(ordenadas, 0.95),
+            "max_ms": ordenadas[-1],
+            "ultima_ms": duracoes[-1],
+        })
+    resultado.sort(key=lambda e: e["p95_ms"], reverse=True)
+    return resultado
+
+
+def limpar_registros():
+    """Esvazia os buffers de consultas, consultas lentas e renderizações."""
+    _pendentes.clear()
+    with _lock:
+        _consultas.clear()
+        _lentas.clear()
+        _renders.clear()
@@ -15,6 +15,8 @@ class Cliente:
         _telefone: Telefone de contato
     """
     
+    __slots__ = ("_id_cliente", "_cpf", "_nome", "_telefone")
+
     def __init__(self, id_cliente, cpf, nome, telefone):
         """Inicializa um novo cliente com seus dados."""
         self._id_cliente = id_cliente
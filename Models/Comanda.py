@@ -20,6 +20,11 @@ class Comanda:
         _valor_total: Valor final da comanda (incluindo taxa)
     """
     
+    __slots__ = (
+        "_id_comanda", "_funcionario_id", "_mesa_id", "_horario_abertura",
+        "_horario_fechamento", "_taxa_servico", "_valor_total",
+    )
+
     def __init__(self, id_comanda, funcionario_id, mesa_id, horario_abertura=None, 
                  horario_fechamento=None, taxa_servico=0.0, valor_total=0.0):
         """Inicializa uma nova comanda com seus dados."""
@@ -14,6 +14,8 @@ class Funcionario:
         _nome: Nome completo do funcionário
     """
     
+    __slots__ = ("_id_funcionario", "_cpf", "_nome")
+
     def __init__(self, id_funcionario, cpf, nome):
         """Inicializa um novo funcionário com seus dados."""
         self._id_funcionario = id_funcionario
@@ -15,6 +15,8 @@ class ItemCardapio:
         _valor_unitario: Preço do item em reais
     """
     
+    __slots__ = ("_id_item", "_descricao", "_sub_descricao", "_valor_unitario")
+
     def __init__(self, id_item, descricao, sub_descricao, valor_unitario):
         """Inicializa um novo item do cardápio."""
         self._id_item = id_item
@@ -15,6 +15,8 @@ class Mesa:
         _capacidade: Número máximo de assentos da mesa
     """
     
+    __slots__ = ("_id_mesa", "_status", "_capacidade")
+
     def __init__(self, id_mesa, status, capacidade):
         """Inicializa uma nova mesa com seus dados."""
         self._id_mesa = id_mesa
@@ -0,0 +1,85 @@
+# Models/hidratacao.py
+"""
+Construção de modelos diretamente a partir de cursores do SQLite.
+
+Os modelos usam __slots__ (sem __dict__ por instância), o que reduz bastante
+a memória de listagens grandes. As colunas do SELECT são associadas aos
+parâmetros do construtor pelo nome, então a consulta pode trazer as colunas
+em qualquer ordem (ou colunas a mais, que são ignoradas).
+
+Uso nos controllers:
+
+    linhas = conexao.execute("SELECT id_mesa, status, capacidade FROM mesa").fetchall()
+    mesas = hidratar_linhas(linhas, ("id_mesa", "status", "capacidade"), Mesa)
+"""
+
+import functools
+import inspect
+
+
+@functools.lru_cache(maxsize=None)
+def _parametros(classe):
+    """Retorna (nomes dos parâmetros, nomes obrigatórios) do construtor."""
+    parametros = list(inspect.signature(classe.__init__).parameters.values())[1:]
+    nomes = tuple(p.name for p in parametros)
+    obrigatorios = frozenset(p.name for p in parametros if p.default is inspect.Parameter.empty)
+    return nomes, obrigatorios
+
+
+@functools.lru_cache(maxsize=256)
+def _plano(classe, colunas):
+    """
+    Calcula, uma vez por (classe, colunas), como montar os argumentos.
+
+    Returns:
+        tuple: (parâmetros usados, índices das colunas, posicional). Se
+               posicional for True, as colunas já estão na ordem do
+               construtor e a linha é passada diretamente como *args.
+    """
+    nomes, obrigatorios = _parametros(classe)
+    posicoes = {coluna.lower(): i for i, coluna in enumerate(colunas)}
+    faltando = sorted(obrigatorios - posicoes.keys())
+    if faltando:
+        raise ValueError(
+            f"Consulta não traz as colunas {faltando} exigidas por {classe.__name__}"
+        )
+    usados = [nome for nome in nomes if nome in posicoes]
+    indices = tuple(posicoes[nome] for nome in usados)
+    posicional = indices == tuple(range(len(colunas))) and tuple(usados) == nomes[:len(usados)]
+    return tuple(usados), indices, posicional
+
+
+def _colunas(cursor):
+    return tuple(descricao[0] for descricao in cursor.description)
+
+
+def hidratar_linhas(linhas, colunas, classe):
+    """
+    Constrói instâncias da classe a partir de linhas já lidas.
+
+    Args:
+        linhas (list): Tuplas ou sqlite3.Row retornadas pelo cursor
+        colunas (tuple): Nomes das colunas, na ordem das linhas
+        classe (type): Modelo a construir (ex: Cliente)
+
+    Returns:
+        list: Lista de instâncias da classe
+    """
+    usados, indices, posicional = _plano(classe, tuple(colunas))
+    if posicional:
+        return [classe(*linha) for linha in linhas]
+    return [classe(**dict(zip(usados, (linha[i] for i in indices)))) for linha in linhas]
+
+
+def hidratar_um(cursor, classe):
+    """
+    Lê a próxima linha do cursor como instância do modelo.
+
+    Returns:
+        object: Instância da classe, ou None se não houver linha
+    """
+    linha = cursor.fetchone()
+    if linha is None:
+        return None
+    return hidratar_linhas([linha], _colunas(cursor), classe)[0]
+
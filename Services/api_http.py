@@ -0,0 +1,411 @@
+# Services/api_http.py
+"""
+API HTTP/JSON local para os terminais de pedido (comandeiras e POS).
+
+Expõe as operações de comanda, mesa, cardápio e cliente dos controllers sem
+passar pelo Streamlit: lançar um pedido custa uma requisição pequena, e não
+a reexecução de uma página inteira. Usa apenas a biblioteca padrão
+(http.server), uma thread por conexão, HTTP/1.1 com keep-alive e o mesmo
+pool de conexões do restaurante.
+
+Rotas:
+    GET  /saude
+    GET  /mesas                              mesas com a comanda aberta de cada uma
+    GET  /cardapio                           todos os itens
+    GET  /cardapio/busca?q=piz&limite=20     busca por prefixo de palavras
+    GET  /clientes?nome=&cpf=&telefone=&limite=&apos_nome=&apos_id=
+    GET  /clientes/<id>
+    POST /clientes                           {"cpf", "nome", "telefone"}
+    GET  /comandas/abertas                   totais de todas as comandas abertas
+    POST /comandas                           {"funcionario_id", "mesa_id"}
+    GET  /comandas/<id>                      comanda, totais e itens
+    GET  /comandas/<id>/total
+    POST /comandas/<id>/itens                {"itens": [{"item_cardapio_id", "quantidade"}, ...]}
+    POST /comandas/<id>/fechar
+    POST /lote                               {"operacoes": [{"metodo", "caminho", "corpo"}, ...]}
+
+Uso:
+    python Services/api_http.py                      # http://127.0.0.1:8600
+    python Services/api_http.py --host 0.0.0.0 --porta 8080 --db /dados/restaurante.db
+"""
+
+import argparse
+import json
+import re
+import sys
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# Permite executar este arquivo diretamente e importar os módulos do projeto
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from Controllers.db_connection import configurar_pool, PERFIS_DESEMPENHO
+from Controllers.ClienteController import (
+    buscar_cliente_por_cpf, consultar_clientes_pagina, incluir_cliente, normalizar_cpf,
+    obter_cliente,
+)
+from Controllers.ComandaController import (
+    abrir_comanda, adicionar_itens_comanda, calcular_total_comanda, calcular_totais_comandas,
+    consultar_itens_comanda, fechar_comanda, obter_comanda,
+)
+from Controllers.ItemCardapioController import buscar_itens, consultar_itens
+from Controllers.MesaController import consultar_mesas_com_comanda
+from Models.Cliente import Cliente
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8600
+# Tamanho máximo do corpo de uma requisição (bytes)
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+# Conexões keep-alive ociosas por mais tempo que isso (segundos) são encerradas
+TIMEOUT_CONEXAO = 30
+# Quantidade máxima de operações em uma chamada a /lote
+LIMITE_LOTE = 100
+# Tamanho máximo de uma página de clientes
+LIMITE_PAGINA_CLIENTES = 200
+# Máximo de itens devolvidos por uma busca no cardápio
+LIMITE_BUSCA_CARDAPIO = 50
+
+_CAMPOS_ITEM_CARDAPIO = ("id_item", "descricao", "sub_descricao", "valor_unitario")
+_CAMPOS_CLIENTE = ("id_cliente", "cpf", "nome", "telefone")
+_CAMPOS_COMANDA = ("id_comanda", "funcionario_id", "mesa_id", "horario_abertura",
+                   "horario_fechamento", "taxa_servico", "valor_total")
+
+
+class ErroAPI(Exception):
+    """Erro que vira uma resposta JSON {"erro": mensagem} com o status informado."""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+def _registro(campos, linha):
+    """Converte uma tupla do controller em dict com os nomes das colunas."""
+    return dict(zip(campos, linha)) if linha is not None else None
+
+
+def _inteiro(valor, nome, minimo=None):
+    """Converte um parâmetro em int, ou responde 400."""
+    try:
+        numero = int(valor)
+    except (TypeError, ValueError):
+        raise ErroAPI(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser um número inteiro")
+    if minimo is not None and numero < minimo:
+        raise ErroAPI(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser maior ou igual a {minimo}")
+    return numero
+
+
+def _campo(corpo, nome):
+    """Lê um campo obrigatório do corpo JSON, ou responde 400."""
+    if not isinstance(corpo, dict) or corpo.get(nome) is None:
+        raise ErroAPI(HTTPStatus.BAD_REQUEST, f"Campo obrigatório ausente: '{nome}'")
+    return corpo[nome]
+
+
+# ===== OPERAÇÕES =====
+# Cada operação recebe (parâmetros da rota, query string, corpo JSON) e
+# retorna (status HTTP, objeto JSON).
+
+def _saude(rota, consulta, corpo):
+    return HTTPStatus.OK, {"status": "ok"}
+
+
+def _listar_mesas(rota, consulta, corpo):
+    return HTTPStatus.OK, [dict(linha) for linha in consultar_mesas_com_comanda()]
+
+
+def _listar_cardapio(rota, consulta, corpo):
+    return HTTPStatus.OK, [_registro(_CAMPOS_ITEM_CARDAPIO, linha) for linha in consultar_itens()]
+
+
+def _buscar_cardapio(rota, consulta, corpo):
+    limite = _inteiro(consulta.get("limite", 20), "limite", 1)
+    itens = buscar_itens(consulta.get("q", ""), min(limite, LIMITE_BUSCA_CARDAPIO))
+    return HTTPStatus.OK, [_registro(_CAMPOS_ITEM_CARDAPIO, linha) for linha in itens]
+
+
+def _listar_clientes(rota, consulta, corpo):
+    limite = min(_inteiro(consulta.get("limite", 50), "limite", 1), LIMITE_PAGINA_CLIENTES)
+    apos = None
+    if "apos_id" in consulta:
+        apos = (consulta.get("apos_nome", ""), _inteiro(consulta["apos_id"], "apos_id"))
+    clientes, proximo = consultar_clientes_pagina(
+        apos=apos, limite=limite, nome=consulta.get("nome"), cpf=consulta.get("cpf"),
+        telefone=consulta.get("telefone"),
+    )
+    return HTTPStatus.OK, {
+        "clientes": [_registro(_CAMPOS_CLIENTE, linha) for linha in clientes],
+        # Parâmetros apos_nome/apos_id da próxima página (null na última)
+        "proxima_pagina": {"apos_nome": proximo[0], "apos_id": proximo[1]} if proximo else None,
+    }
+
+
+def _obter_cliente(rota, consulta, corpo):
+    cliente = obter_cliente(_inteiro(rota["id"], "id"))
+    if cliente is None:
+        raise ErroAPI(HTTPStatus.NOT_FOUND, "Cliente não encontrado")
+    return HTTPStatus.OK, _registro(_CAMPOS_CLIENTE, cliente)
+
+
+def _incluir_cliente(rota, consulta, corpo):
+    cpf = _campo(corpo, "cpf")
+    cpf = normalizar_cpf(cpf) if isinstance(cpf, str) else ""
+    if len(cpf) != 11:
+        raise ErroAPI(HTTPStatus.BAD_REQUEST, "CPF inválido: informe os 11 dígitos")
+    if not incluir_cliente(Cliente(None, cpf, corpo.get("nome"), corpo.get("telefone"))):
+        raise ErroAPI(HTTPStatus.CONFLICT, "Cliente não incluído (CPF já cadastrado)")
+    cliente = buscar_cliente_por_cpf(cpf)
+    if cliente is None:
+        raise ErroAPI(HTTPStatus.INTERNAL_SERVER_ERROR, "Cliente incluído, mas não encontrado")
+    return HTTPStatus.CREATED, _registro(_CAMPOS_CLIENTE, cliente)
+
+
+def _comandas_abertas(rota, consulta, corpo):
+    totais = calcular_totais_comandas()
+    return HTTPStatus.OK, [dict(dados, id_comanda=id_comanda) for id_comanda, dados in totais.items()]
+
+
+def _abrir_comanda(rota, consulta, corpo):
+    id_comanda = abrir_comanda(
+        _inteiro(_campo(corpo, "funcionario_id"), "funcionario_id", 1),
+        _inteiro(_campo(corpo, "mesa_id"), "mesa_id", 1),
+    )
+    if id_comanda is None:
+        raise ErroAPI(HTTPStatus.CONFLICT, "Não foi possível abrir a comanda")
+    return HTTPStatus.CREATED, {"id_comanda": id_comanda}
+
+
+def _comanda_existente(rota):
+    """Busca a comanda da rota, ou responde 404."""
+    comanda = obter_comanda(_inteiro(rota["id"], "id"))
+    if comanda is None:
+        raise ErroAPI(HTTPStatus.NOT_FOUND, "Comanda não encontrada")
+    return comanda
+
+
+def _obter_comanda(rota, consulta, corpo):
+    comanda = _registro(_CAMPOS_COMANDA, _comanda_existente(rota))
+    comanda["totais"] = calcular_total_comanda(comanda["id_comanda"])
+    comanda["itens"] = [dict(linha) for linha in consultar_itens_comanda(comanda["id_comanda"])]
+    return HTTPStatus.OK, comanda
+
+
+def _total_comanda(rota, consulta, corpo):
+    totais = calcular_total_comanda(_inteiro(rota["id"], "id"))
+    if not totais or totais["id_mesa"] is None:
+        raise ErroAPI(HTTPStatus.NOT_FOUND, "Comanda não encontrada")
+    return HTTPStatus.OK, totais
+
+
+def _adicionar_itens(rota, consulta, corpo):
+    id_comanda = _inteiro(rota["id"], "id")
+    # Aceita um pedido com vários itens ou um único item no próprio corpo
+    itens = corpo.get("itens", [corpo]) if isinstance(corpo, dict) else corpo
+    if not isinstance(itens, list) or not itens:
+        raise ErroAPI(HTTPStatus.BAD_REQUEST, "Informe 'itens' com pelo menos um item")
+    pedido = [
+        (_inteiro(_campo(item, "item_cardapio_id"), "item_cardapio_id", 1),
+         _inteiro(item.get("quantidade", 1), "quantidade", 1))
+        for item in itens
+    ]
+    if not adicionar_itens_comanda(id_comanda, pedido):
+        # A comanda pode não existir, estar fechada ou o item não existir no cardápio
+        _comanda_existente(rota)
+        raise ErroAPI(HTTPStatus.CONFLICT, "Itens não adicionados (comanda fechada ou item inexistente)")
+    return HTTPStatus.CREATED, {"id_comanda": id_comanda, "itens_adicionados": len(pedido)}
+
+
+def _fechar_comanda(rota, consulta, corpo):
+    id_comanda = _inteiro(rota["id"], "id")
+    if not fechar_comanda(id_comanda):
+        _comanda_existente(rota)
+        raise ErroAPI(HTTPStatus.CONFLICT, "Comanda já fechada")
+    return HTTPStatus.OK, _registro(_CAMPOS_COMANDA, obter_comanda(id_comanda))
+
+
+def _lote(rota, consulta, corpo):
+    """
+    Executa várias operações em uma única requisição, na ordem recebida.
+    Cada operação é independente: uma falha não desfaz as anteriores.
+    """
+    operacoes = _campo(corpo, "operacoes")
+    if not isinstance(operacoes, list):
+        raise ErroAPI(HTTPStatus.BAD_REQUEST, "'operacoes' deve ser uma lista")
+    if len(operacoes) > LIMITE_LOTE:
+        raise ErroAPI(HTTPStatus.BAD_REQUEST, f"No máximo {LIMITE_LOTE} operações por lote")
+    resultados = []
+    for operacao in operacoes:
+        if not isinstance(operacao, dict):
+            resultados.append({"status": HTTPStatus.BAD_REQUEST, "corpo": {"erro": "Operação inválida"}})
+            continue
+        status, resposta = despachar(
+            str(operacao.get("metodo", "GET")).upper(), str(operacao.get("caminho", "")),
+            operacao.get("corpo") or {}, permitir_lote=False,
+        )
+        resultados.append({"status": int(status), "corpo": resposta})
+    return HTTPStatus.OK, {"resultados": resultados}
+
+
+# Rota: (método, expressão do caminho, operação)
+ROTAS = [
+    ("GET", r"/saude", _saude),
+    ("GET", r"/mesas", _listar_mesas),
+    ("GET", r"/cardapio", _listar_cardapio),
+    ("GET", r"/cardapio/busca", _buscar_cardapio),
+    ("GET", r"/clientes", _listar_clientes),
+    ("POST", r"/clientes", _incluir_cliente),
+    ("GET", r"/clientes/(?P<id>\d+)", _obter_cliente),
+    ("GET", r"/comandas/abertas", _comandas_abertas),
+    ("POST", r"/comandas", _abrir_comanda),
+    ("GET", r"/comandas/(?P<id>\d+)", _obter_comanda),
+    ("GET", r"/comandas/(?P<id>\d+)/total", _total_comanda),
+    ("POST", r"/comandas/(?P<id>\d+)/itens", _adicionar_itens),
+    ("POST", r"/comandas/(?P<id>\d+)/fechar", _fechar_comanda),
+    ("POST", r"/lote", _lote),
+]
+_ROTAS_COMPILADAS = [(metodo, re.compile(padrao + r"/?"), operacao) for metodo, padrao, operacao in ROTAS]
+# Operações que aceitam uma lista JSON como corpo; as demais exigem um objeto
+_CORPO_LISTA = {_adicionar_itens}
+
+
+def despachar(metodo, caminho, corpo, permitir_lote=True):
+    """
+    Encontra a rota do caminho e executa a operação.
+
+    Args:
+        metodo (str): Método HTTP
+        caminho (str): Caminho com query string opcional (ex: '/cardapio/busca?q=piz')
+        corpo (dict | list): Corpo JSON já decodificado
+        permitir_lote (bool): False dentro de /lote (lotes não podem ser aninhados)
+
+    Returns:
+        tuple: (status HTTP, objeto JSON da resposta); erros inesperados da
+               operação (inclusive do banco) viram 500 com {"erro": ...}
+    """
+    partes = urlsplit(caminho)
+    consulta = {chave: valores[-1] for chave, valores in parse_qs(partes.query).items()}
+    metodos_do_caminho = []
+    for metodo_rota, padrao, operacao in _ROTAS_COMPILADAS:
+        encontrado = padrao.fullmatch(partes.path)
+        if not encontrado:
+            continue
+        metodos_do_caminho.append(metodo_rota)
+        if metodo_rota != metodo:
+            continue
+        if operacao is _lote and not permitir_lote:
+            return HTTPStatus.BAD_REQUEST, {"erro": "Lotes não podem ser aninhados"}
+        if not isinstance(corpo, dict) and not (isinstance(corpo, list) and operacao in _CORPO_LISTA):
+            return HTTPStatus.BAD_REQUEST, {"erro": "O corpo da requisição deve ser um objeto JSON"}
+        try:
+            return operacao(encontrado.groupdict(), consulta, corpo)
+        except ErroAPI as e:
+            return e.status, {"erro": e.mensagem}
+        except Exception as e:
+            # Ex: pool esgotado (sqlite3.OperationalError). A thread da conexão
+            # continua atendendo e o terminal recebe uma resposta JSON
+            print(f"Erro ao executar {metodo} {partes.path}: {type(e).__name__}: {e}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": "Erro interno do servidor"}
+    if metodos_do_caminho:
+        return HTTPStatus.METHOD_NOT_ALLOWED, {"erro": f"Use {', '.join(metodos_do_caminho)}"}
+    return HTTPStatus.NOT_FOUND, {"erro": f"Rota não encontrada: {partes.path}"}
+
+
+class ManipuladorAPI(BaseHTTPRequestHandler):
+    """Traduz requisições HTTP em chamadas a despachar() e respostas JSON."""
+
+    # HTTP/1.1: a conexão fica aberta entre requisições (keep-alive)
+    protocol_version = "HTTP/1.1"
+    timeout = TIMEOUT_CONEXAO
+    server_version = "RestauranteAPI/1.0"
+    registrar_requisicoes = False
+
+    def _ler_corpo(self):
+        try:
+            tamanho = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0:
+            raise ErroAPI(HTTPStatus.BAD_REQUEST, "Content-Length inválido")
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroAPI(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo da requisição muito grande")
+        if not tamanho:
+            return {}
+        try:
+            return json.loads(self.rfile.read(tamanho))
+        except (ValueError, UnicodeDecodeError):
+            raise ErroAPI(HTTPStatus.BAD_REQUEST, "Corpo não é um JSON válido")
+
+    def _responder(self, status, objeto):
+        dados = json.dumps(objeto, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _tratar(self, metodo):
+        try:
+            corpo = self._ler_corpo() if metodo == "POST" else {}
+        except ErroAPI as e:
+            # Um corpo recusado fica sem ler: a conexão não pode ser reaproveitada
+            self.close_connection = True
+            self._responder(e.status, {"erro": e.mensagem})
+            return
+        status, resposta = despachar(metodo, self.path, corpo)
+        self._responder(status, resposta)
+
+    def do_GET(self):
+        self._tratar("GET")
+
+    def do_POST(self):
+        self._tratar("POST")
+
+    def log_message(self, formato, *argumentos):
+        if self.registrar_requisicoes:
+            super().log_message(formato, *argumentos)
+
+
+def criar_servidor(host=HOST_PADRAO, porta=PORTA_PADRAO, registrar_requisicoes=False):
+    """
+    Cria o servidor HTTP (uma thread por conexão), sem iniciá-lo.
+
+    Returns:
+        ThreadingHTTPServer: Servidor pronto para serve_forever()
+    """
+    manipulador = type("Manipulador", (ManipuladorAPI,), {"registrar_requisicoes": registrar_requisicoes})
+    servidor = ThreadingHTTPServer((host, porta), manipulador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main(argumentos=None):
+    """Inicia a API a partir dos argumentos da linha de comando."""
+    parser = argparse.ArgumentParser(description="API HTTP/JSON do restaurante")
+    parser.add_argument("--host", default=HOST_PADRAO)
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--db", help="Caminho do banco (padrão: restaurante.db na raiz)")
+    parser.add_argument("--perfil", choices=list(PERFIS_DESEMPENHO), help="Perfil de desempenho do banco")
+    parser.add_argument("--tamanho-pool", type=int, help="Conexões no pool (padrão: RESTAURANTE_DB_POOL_TAMANHO)")
+    parser.add_argument("--registrar", action="store_true", help="Exibe cada requisição no terminal")
+    args = parser.parse_args(argumentos)
+
+    if args.db or args.perfil or args.tamanho_pool:
+        configurar_pool(caminho=args.db, perfil=args.perfil, tamanho=args.tamanho_pool)
+
+    servidor = criar_servidor(args.host, args.porta, args.registrar)
+    print(f"API do restaurante em http://{args.host}:{args.porta} (Ctrl+C para encerrar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# Services/arquivamento.py
+"""
+Arquivamento de comandas antigas no banco de histórico (restaurante_historico.db).
+
+Uso:
+    python Services/arquivamento.py                 # comandas fechadas há mais de 180 dias
+    python Services/arquivamento.py --dias 90
+    python Services/arquivamento.py --compactar     # também executa VACUUM no banco principal
+
+Pode ser agendado (ex: cron diário fora do horário de atendimento).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Permite executar este arquivo diretamente e importar os módulos do projeto
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from Controllers.db_connection import configurar_pool
+from Controllers.HistoricoController import (
+    DIAS_RETENCAO,
+    TAMANHO_LOTE_ARQUIVO,
+    arquivar_comandas,
+    compactar_banco_principal,
+)
+
+def main(argumentos=None):
+    """
+    Executa o arquivamento com os parâmetros da linha de comando.
+
+    Returns:
+        int: Código de saída (0 = ok, 1 = erro)
+    """
+    parser = argparse.ArgumentParser(description="Move comandas antigas para o banco de histórico")
+    parser.add_argument("--dias", type=int, default=DIAS_RETENCAO,
+                        help=f"Idade mínima das comandas fechadas (padrão: {DIAS_RETENCAO})")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_ARQUIVO,
+                        help=f"Comandas movidas por transação (padrão: {TAMANHO_LOTE_ARQUIVO})")
+    parser.add_argument("--compactar", action="store_true",
+                        help="Executa VACUUM no banco principal ao final")
+    parser.add_argument("--db", help="Caminho do banco principal (padrão: restaurante.db na raiz)")
+    parser.add_argument("--historico", help="Caminho do banco de histórico")
+    args = parser.parse_args(argumentos)
+
+    if args.db or args.historico:
+        configurar_pool(caminho=args.db, historico=args.historico)
+
+    totais = arquivar_comandas(dias=args.dias, lote=args.lote)
+    if totais is None:
+        return 1
+    if not totais["comanda"]:
+        print("Nenhuma comanda a arquivar.")
+    if args.compactar and not compactar_banco_principal():
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
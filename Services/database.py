@@ -1,19 +1,39 @@
 # Services/database.py
 import sqlite3
+import sys
 from pathlib import Path
 
 # Constrói o caminho para o BD no diretório raiz (um nível acima de 'Services')
 ROOT_DIR = Path(__file__).parent.parent
 DB_PATH = ROOT_DIR / 'restaurante.db'
 
-def create_database():
+# Permite executar este arquivo diretamente (python Services/database.py)
+# e ainda assim importar os módulos do projeto
+sys.path.append(str(ROOT_DIR))
+
+from Controllers.db_connection import aplicar_perfil
+from Services.migracoes import aplicar_migracoes
+
+def create_database(db_path=None, perfil=None):
     """
     Cria o banco de dados 'restaurante.db' na raiz do projeto
     e todas as tabelas.
+    Em seguida aplica as migrações pendentes (índices e evoluções do esquema),
+    o que permite atualizar um 'restaurante.db' existente sem perder dados.
+    Também grava no arquivo as configurações persistentes do perfil
+    de desempenho (ex: journal_mode=WAL).
+
+    Args:
+        db_path (Path | str): Caminho alternativo do banco (padrão: DB_PATH)
+        perfil (str): Perfil de desempenho (padrão: RESTAURANTE_DB_PERFIL)
     """
+    db_path = db_path or DB_PATH
+    conexao = None
     try:
         # Conecta ao BD no caminho correto
-        conexao = sqlite3.connect(DB_PATH) 
+        conexao = sqlite3.connect(db_path)
+        # O journal_mode fica gravado no arquivo: as próximas conexões já abrem em WAL
+        aplicar_perfil(conexao, perfil)
         cursor = conexao.cursor()
         
         # Tabela funcionario
@@ -96,7 +116,10 @@ def create_database():
         """)
 
         conexao.commit()
-        print(f"Banco de dados '{DB_PATH}' e tabelas criados com sucesso!")
+
+        # Evolui o esquema até a versão mais recente (PRAGMA user_version)
+        aplicar_migracoes(conexao)
+        print(f"Banco de dados '{db_path}' e tabelas criados com sucesso!")
 
     except sqlite3.Error as e:
         print(f"Erro ao criar o banco de dados: {e}")
@@ -0,0 +1,73 @@
+# Services/importacao.py
+"""
+Importação tardia de módulos com medição de tempo.
+
+Módulos pesados (pandas, páginas do Streamlit) são importados apenas quando
+usados pela primeira vez. O tempo gasto em cada primeira importação fica
+registrado para o relatório de inicialização exibido em main.py.
+
+Uso:
+
+    pd = importar("pandas")
+    df = pd.DataFrame(dados)
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+# Instante em que o processo começou a carregar a aplicação
+INICIO_PROCESSO = time.perf_counter()
+
+_lock = threading.Lock()
+_tempos = {}  # nome do módulo -> segundos gastos na primeira importação
+
+
+def importar(nome_modulo):
+    """
+    Importa um módulo sob demanda, registrando o tempo da primeira importação.
+
+    Args:
+        nome_modulo (str): Nome completo do módulo (ex: 'pandas', 'Views.PageCliente')
+
+    Returns:
+        module: Módulo importado
+    """
+    modulo = sys.modules.get(nome_modulo)
+    if modulo is not None:
+        return modulo
+
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nome_modulo)
+    with _lock:
+        _tempos.setdefault(nome_modulo, time.perf_counter() - inicio)
+    return modulo
+
+
+def registrar_tempo(nome, segundos):
+    """
+    Registra manualmente a duração de uma etapa da inicialização.
+
+    Args:
+        nome (str): Identificação da etapa (ex: 'banco de dados')
+        segundos (float): Duração medida
+    """
+    with _lock:
+        _tempos.setdefault(nome, segundos)
+
+
+def relatorio_importacoes():
+    """
+    Retorna os tempos de importação registrados, do mais lento ao mais rápido.
+
+    Returns:
+        list: Lista de tuplas (modulo, milissegundos)
+    """
+    with _lock:
+        itens = list(_tempos.items())
+    return sorted(
+        ((nome, segundos * 1000) for nome, segundos in itens),
+        key=lambda item: item[1],
+        reverse=True,
+    )
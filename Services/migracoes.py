@@ -0,0 +1,544 @@
+# Services/migracoes.py
+"""
+Migrações versionadas do esquema do banco de dados.
+
+A versão do esquema fica gravada no próprio arquivo, em PRAGMA user_version.
+Cada migração é uma função que recebe a conexão e roda dentro de uma
+transação junto com a atualização do user_version: ou a migração é aplicada
+por completo, ou o banco permanece na versão anterior.
+
+Para evoluir o esquema, basta acrescentar uma nova função ao final de
+MIGRACOES com o próximo número de versão. Migrações já publicadas nunca
+devem ser alteradas, pois bancos existentes não as executarão de novo.
+"""
+
+import re
+import sqlite3
+
+# ===== MIGRAÇÕES =====
+
+def _m001_indices_comanda(conexao):
+    """Índices secundários para as consultas quentes de comandas."""
+    # Comanda aberta de cada mesa (LEFT JOIN de consultar_mesas_com_comanda).
+    # Índice parcial: contém apenas as poucas comandas ainda abertas.
+    conexao.execute("""
+        CREATE INDEX IF NOT EXISTS idx_comanda_mesa_aberta
+        ON comanda (mesa_id)
+        WHERE horario_fechamento IS NULL
+    """)
+    # Comandas fechadas por período (relatórios e histórico)
+    conexao.execute("""
+        CREATE INDEX IF NOT EXISTS idx_comanda_fechamento
+        ON comanda (horario_fechamento)
+        WHERE horario_fechamento IS NOT NULL
+    """)
+    # Itens de uma comanda: índice de cobertura para a listagem e para o
+    # SUM(quantidade_item * valor_unitario_momento) sem ler a tabela
+    conexao.execute("""
+        CREATE INDEX IF NOT EXISTS idx_comanda_item_comanda
+        ON comanda_item_cardapio (comanda_id, item_cardapio_id, quantidade_item, valor_unitario_momento)
+    """)
+    # Clientes/pagamentos de uma comanda
+    conexao.execute("""
+        CREATE INDEX IF NOT EXISTS idx_comanda_cliente_comanda
+        ON comanda_cliente (comanda_id)
+    """)
+
+
+def _m002_subtotal_comanda(conexao):
+    """Subtotal e quantidade de itens mantidos na própria comanda."""
+    conexao.execute("""
+        ALTER TABLE comanda ADD COLUMN subtotal_itens REAL NOT NULL DEFAULT 0
+    """)
+    conexao.execute("""
+        ALTER TABLE comanda ADD COLUMN quantidade_itens INTEGER NOT NULL DEFAULT 0
+    """)
+    # Preenche as comandas existentes a partir das linhas de itens
+    conexao.execute("""
+        UPDATE comanda SET
+            subtotal_itens = COALESCE((
+                SELECT SUM(quantidade_item * valor_unitario_momento)
+                FROM comanda_item_cardapio
+                WHERE comanda_id = comanda.id_comanda
+            ), 0),
+            quantidade_itens = COALESCE((
+                SELECT SUM(quantidade_item)
+                FROM comanda_item_cardapio
+                WHERE comanda_id = comanda.id_comanda
+            ), 0)
+    """)
+    # Triggers mantêm os totais na mesma transação de qualquer escrita nos
+    # itens (inclusão, alteração ou remoção), seja qual for o caminho no código
+    conexao.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_comanda_item_subtotal_insert
+        AFTER INSERT ON comanda_item_cardapio
+        BEGIN
+            UPDATE comanda SET
+                subtotal_itens = subtotal_itens + NEW.quantidade_item * NEW.valor_unitario_momento,
+                quantidade_itens = quantidade_itens + NEW.quantidade_item
+            WHERE id_comanda = NEW.comanda_id;
+        END
+    """)
+    conexao.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_comanda_item_subtotal_delete
+        AFTER DELETE ON comanda_item_cardapio
+        BEGIN
+            UPDATE comanda SET
+                subtotal_itens = subtotal_itens - OLD.quantidade_item * OLD.valor_unitario_momento,
+                quantidade_itens = quantidade_itens - OLD.quantidade_item
+            WHERE id_comanda = OLD.comanda_id;
+        END
+    """)
+    conexao.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_comanda_item_subtotal_update
+        AFTER UPDATE OF quantidade_item, valor_unitario_momento, comanda_id
+        ON comanda_item_cardapio
+        BEGIN
+            UPDATE comanda SET
+                subtotal_itens = subtotal_itens - OLD.quantidade_item * OLD.valor_unitario_momento,
+                quantidade_itens = quantidade_itens - OLD.quantidade_item
+            WHERE id_comanda = OLD.comanda_id;
+            UPDATE comanda SET
+                subtotal_itens = subtotal_itens + NEW.quantidade_item * NEW.valor_unitario_momento,
+                quantidade_itens = quantidade_itens + NEW.quantidade_item
+            WHERE id_comanda = NEW.comanda_id;
+        END
+    """)
+
+
+def _m003_indices_cliente(conexao):
+    """Índices para a listagem paginada e a busca de clientes."""
+    # Ordem da listagem (nome sem diferenciar maiúsculas, desempate por ID):
+    # permite paginação por chave (keyset) e busca por prefixo do nome
+    conexao.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cliente_nome
+        ON cliente (IFNULL(nome, '') COLLATE NOCASE, id_cliente)
+    """)
+    conexao.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cliente_cpf
+        ON cliente (cpf)
+    """)
+    conexao.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cliente_telefone
+        ON cliente (telefone)
+    """)
+
+
+def _m004_busca_cardapio(conexao):
+    """Índice de texto completo (FTS5) sobre descrição e sub-descrição do cardápio."""
+    try:
+        # Tabela de conteúdo externo: o índice referencia as linhas de item_cardapio
+        # sem duplicar o texto; remove_diacritics faz "acai" encontrar "açaí"
+        conexao.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS item_cardapio_fts USING fts5(
+                descricao,
+                sub_descricao,
+                content='item_cardapio',
+                content_rowid='id_item',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        # SQLite compilado sem FTS5: a busca usa LIKE como alternativa
+        print(f"Aviso: FTS5 indisponível, busca do cardápio sem índice de texto: {e}")
+        return
+
+    # Triggers mantêm o índice sincronizado com qualquer escrita no cardápio
+    conexao.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_item_cardapio_fts_insert
+        AFTER INSERT ON item_cardapio
+        BEGIN
+            INSERT INTO item_cardapio_fts (rowid, descricao, sub_descricao)
+            VALUES (NEW.id_item, NEW.descricao, NEW.sub_descricao);
+        END
+    """)
+    conexao.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_item_cardapio_fts_delete
+        AFTER DELETE ON item_cardapio
+        BEGIN
+            INSERT INTO item_cardapio_fts (item_cardapio_fts, rowid, descricao, sub_descricao)
+            VALUES ('delete', OLD.id_item, OLD.descricao, OLD.sub_descricao);
+        END
+    """)
+    conexao.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_item_cardapio_fts_update
+        AFTER UPDATE OF descricao, sub_descricao ON item_cardapio
+        BEGIN
+            INSERT INTO item_cardapio_fts (item_cardapio_fts, rowid, descricao, sub_descricao)
+            VALUES ('delete', OLD.id_item, OLD.descricao, OLD.sub_descricao);
+            INSERT INTO item_cardapio_fts (rowid, descricao, sub_descricao)
+            VALUES (NEW.id_item, NEW.descricao, NEW.sub_descricao);
+        END
+    """)
+    # Indexa os itens já cadastrados
+    conexao.execute("INSERT INTO item_cardapio_fts (item_cardapio_fts) VALUES ('rebuild')")
+
+
+def _so_digitos(valor):
+    """Remove pontuação e espaços de um CPF ('123.456.789-01' -> '12345678901')."""
+    return re.sub(r"\D", "", valor or "")
+
+
+def _deduplicar_cpf(conexao, tabela, coluna_id, referencias):
+    """
+    Mantém um único registro por CPF (o de menor ID) em 'tabela'.
+    Campos vazios do registro mantido são completados com os dos duplicados,
+    e as referências (tabela, coluna) passam a apontar para o registro mantido.
+    """
+    duplicados = conexao.execute(f"""
+        SELECT cpf, MIN({coluna_id}) AS manter
+        FROM {tabela}
+        WHERE cpf <> ''
+        GROUP BY cpf
+        HAVING COUNT(*) > 1
+    """).fetchall()
+    colunas = [
+        linha[1] for linha in conexao.execute(f"PRAGMA table_info({tabela})")
+        if linha[1] not in (coluna_id, "cpf")
+    ]
+    for cpf, manter in duplicados:
+        remover = [linha[0] for linha in conexao.execute(
+            f"SELECT {coluna_id} FROM {tabela} WHERE cpf = ? AND {coluna_id} <> ? ORDER BY {coluna_id} DESC",
+            (cpf, manter)
+        )]
+        marcadores = ", ".join("?" for _ in remover)
+        for coluna in colunas:
+            # Preenche o campo vazio com o valor do duplicado mais recente
+            conexao.execute(f"""
+                UPDATE {tabela} SET {coluna} = (
+                    SELECT {coluna} FROM {tabela}
+                    WHERE {coluna_id} IN ({marcadores}) AND IFNULL({coluna}, '') <> ''
+                    ORDER BY {coluna_id} DESC LIMIT 1
+                )
+                WHERE {coluna_id} = ? AND IFNULL({coluna}, '') = ''
+                  AND EXISTS (
+                    SELECT 1 FROM {tabela}
+                    WHERE {coluna_id} IN ({marcadores}) AND IFNULL({coluna}, '') <> ''
+                  )
+            """, remover + [manter] + remover)
+        for tabela_ref, coluna_ref in referencias:
+            conexao.execute(
+                f"UPDATE {tabela_ref} SET {coluna_ref} = ? WHERE {coluna_ref} IN ({marcadores})",
+                [manter] + remover
+            )
+        conexao.execute(f"DELETE FROM {tabela} WHERE {coluna_id} IN ({marcadores})", remover)
+    return len(duplicados)
+
+
+def _m005_cpf_unico(conexao):
+    """Normaliza e deduplica CPFs de clientes e funcionários e cria índices únicos."""
+    # Função Python local à migração: migrações não devem depender de código
+    # da aplicação, que pode mudar depois de publicadas
+    conexao.create_function("so_digitos", 1, _so_digitos, deterministic=True)
+    for tabela in ("cliente", "funcionario"):
+        conexao.execute(f"UPDATE {tabela} SET cpf = so_digitos(cpf) WHERE cpf <> so_digitos(cpf)")
+
+    clientes = _deduplicar_cpf(
+        conexao, "cliente", "id_cliente", [("comanda_cliente", "cliente_id")]
+    )
+    funcionarios = _deduplicar_cpf(
+        conexao, "funcionario", "id_funcionario", [("comanda", "funcionario_id")]
+    )
+    if clientes or funcionarios:
+        print(f"CPFs duplicados unificados: {clientes} de clientes, {funcionarios} de funcionários")
+
+    # O índice comum de CPF (migração 3) é substituído pelo índice único.
+    # CPF vazio fica fora do índice: cadastros antigos sem CPF continuam válidos
+    conexao.execute("DROP INDEX IF EXISTS idx_cliente_cpf")
+    conexao.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_cliente_cpf_unico
+        ON cliente (cpf) WHERE cpf <> ''
+    """)
+    conexao.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_funcionario_cpf_unico
+        ON funcionario (cpf) WHERE cpf <> ''
+    """)
+
+
+def _m006_resumo_vendas(conexao):
+    """Tabelas de resumo diário de vendas, atualizadas no fechamento da comanda."""
+    # Chave primária composta e WITHOUT ROWID: a busca por período lê um
+    # trecho contíguo da própria tabela, sem índice separado
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS resumo_vendas_dia (
+            dia TEXT PRIMARY KEY,
+            comandas INTEGER NOT NULL DEFAULT 0,
+            faturamento REAL NOT NULL DEFAULT 0,
+            subtotal REAL NOT NULL DEFAULT 0,
+            quantidade_itens INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS resumo_vendas_hora (
+            dia TEXT NOT NULL,
+            hora INTEGER NOT NULL,
+            comandas INTEGER NOT NULL DEFAULT 0,
+            faturamento REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (dia, hora)
+        ) WITHOUT ROWID
+    """)
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS resumo_vendas_item (
+            dia TEXT NOT NULL,
+            item_cardapio_id INTEGER NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            receita REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (dia, item_cardapio_id)
+        ) WITHOUT ROWID
+    """)
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS resumo_vendas_funcionario (
+            dia TEXT NOT NULL,
+            funcionario_id INTEGER NOT NULL,
+            comandas INTEGER NOT NULL DEFAULT 0,
+            faturamento REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (dia, funcionario_id)
+        ) WITHOUT ROWID
+    """)
+
+    # Carga inicial com as comandas já fechadas
+    conexao.execute("""
+        INSERT OR REPLACE INTO resumo_vendas_dia (dia, comandas, faturamento, subtotal, quantidade_itens)
+        SELECT substr(horario_fechamento, 1, 10), COUNT(*), COALESCE(SUM(valor_total), 0),
+               SUM(subtotal_itens), SUM(quantidade_itens)
+        FROM comanda WHERE horario_fechamento IS NOT NULL
+        GROUP BY 1
+    """)
+    conexao.execute("""
+        INSERT OR REPLACE INTO resumo_vendas_hora (dia, hora, comandas, faturamento)
+        SELECT substr(horario_fechamento, 1, 10), CAST(substr(horario_fechamento, 12, 2) AS INTEGER),
+               COUNT(*), COALESCE(SUM(valor_total), 0)
+        FROM comanda WHERE horario_fechamento IS NOT NULL
+        GROUP BY 1, 2
+    """)
+    conexao.execute("""
+        INSERT OR REPLACE INTO resumo_vendas_item (dia, item_cardapio_id, quantidade, receita)
+        SELECT substr(c.horario_fechamento, 1, 10), cic.item_cardapio_id,
+               SUM(cic.quantidade_item), SUM(cic.quantidade_item * cic.valor_unitario_momento)
+        FROM comanda c
+        JOIN comanda_item_cardapio cic ON cic.comanda_id = c.id_comanda
+        WHERE c.horario_fechamento IS NOT NULL
+        GROUP BY 1, 2
+    """)
+    conexao.execute("""
+        INSERT OR REPLACE INTO resumo_vendas_funcionario (dia, funcionario_id, comandas, faturamento)
+        SELECT substr(horario_fechamento, 1, 10), funcionario_id,
+               COUNT(*), COALESCE(SUM(valor_total), 0)
+        FROM comanda WHERE horario_fechamento IS NOT NULL
+        GROUP BY 1, 2
+    """)
+
+
+def _m007_fila_cozinha(conexao):
+    """Situação de preparo das linhas de pedido e sequência de alterações da cozinha."""
+    # Linhas anteriores a esta versão (e as importadas já servidas) ficam com
+    # status_preparo NULL: não fazem parte da fila da cozinha
+    conexao.execute("""
+        ALTER TABLE comanda_item_cardapio ADD COLUMN status_preparo TEXT
+            CHECK (status_preparo IN ('pendente', 'preparando', 'pronto'))
+    """)
+    # Número crescente atribuído a cada inclusão ou mudança de situação: quem
+    # acompanha a fila guarda o último número visto e lê só o que veio depois
+    conexao.execute("""
+        ALTER TABLE comanda_item_cardapio ADD COLUMN seq_cozinha INTEGER
+    """)
+    conexao.execute("""
+        CREATE INDEX IF NOT EXISTS idx_comanda_item_seq_cozinha
+        ON comanda_item_cardapio (seq_cozinha)
+        WHERE seq_cozinha IS NOT NULL
+    """)
+    # Linhas ainda na cozinha (carga inicial da tela): índice parcial pequeno
+    conexao.execute("""
+        CREATE INDEX IF NOT EXISTS idx_comanda_item_cozinha_ativos
+        ON comanda_item_cardapio (seq_cozinha)
+        WHERE status_preparo IN ('pendente', 'preparando')
+    """)
+    # Toda linha incluída sem situação entra na fila como pendente. As
+    # escritas são serializadas (lock de escrita), então MAX + 1 é único
+    conexao.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_comanda_item_cozinha_insert
+        AFTER INSERT ON comanda_item_cardapio
+        WHEN NEW.status_preparo IS NULL
+        BEGIN
+            UPDATE comanda_item_cardapio SET
+                status_preparo = 'pendente',
+                seq_cozinha = (
+                    SELECT COALESCE(MAX(seq_cozinha), 0) + 1
+                    FROM comanda_item_cardapio WHERE seq_cozinha IS NOT NULL
+                )
+            WHERE id_comanda_item_cardapio = NEW.id_comanda_item_cardapio;
+        END
+    """)
+    # Mudança de situação de uma linha da fila ganha novo número de sequência
+    conexao.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_comanda_item_cozinha_status
+        AFTER UPDATE OF status_preparo ON comanda_item_cardapio
+        WHEN OLD.status_preparo IS NOT NULL AND NEW.status_preparo IS NOT OLD.status_preparo
+        BEGIN
+            UPDATE comanda_item_cardapio SET
+                seq_cozinha = (
+                    SELECT COALESCE(MAX(seq_cozinha), 0) + 1
+                    FROM comanda_item_cardapio WHERE seq_cozinha IS NOT NULL
+                )
+            WHERE id_comanda_item_cardapio = NEW.id_comanda_item_cardapio;
+        END
+    """)
+
+
+def _m008_contadores_alteracao(conexao):
+    """Contadores de alterações por tabela (detecção de mudanças pelas telas ao vivo)."""
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS contador_alteracao (
+            tabela TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    # Tabela -> colunas cuja alteração conta (None: qualquer coluna). Ficam de
+    # fora o subtotal e a quantidade da comanda, que mudam a cada item lançado
+    # (já contado em comanda_item_cardapio), e a situação de preparo, que tem
+    # a própria sequência (seq_cozinha)
+    acompanhadas = {
+        "mesa": None,
+        "comanda": "funcionario_id, mesa_id, horario_abertura, horario_fechamento, "
+                   "taxa_servico, valor_total",
+        "comanda_item_cardapio": "comanda_id, item_cardapio_id, quantidade_item, "
+                                 "valor_unitario_momento",
+    }
+    # Triggers: qualquer escrita, de qualquer processo, incrementa o contador
+    # da tabela na mesma transação
+    for tabela, colunas in acompanhadas.items():
+        conexao.execute("INSERT OR IGNORE INTO contador_alteracao (tabela) VALUES (?)", (tabela,))
+        eventos = {
+            "insert": "INSERT",
+            "delete": "DELETE",
+            "update": f"UPDATE OF {colunas}" if colunas else "UPDATE",
+        }
+        for sufixo, evento in eventos.items():
+            conexao.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{tabela}_alteracao_{sufixo}
+                AFTER {evento} ON {tabela}
+                BEGIN
+                    UPDATE contador_alteracao SET versao = versao + 1 WHERE tabela = '{tabela}';
+                END
+            """)
+
+
+def _m009_remocao_em_lote(conexao):
+    """Remoções em lote (arquivamento) sem incrementar os contadores a cada linha."""
+    # Enquanto existir em contador_alteracao a linha de controle
+    # 'remocao_em_lote', os triggers de remoção não incrementam os contadores:
+    # quem remove em lote (HistoricoController) grava essa linha, remove as
+    # linhas, apaga o controle e faz um único incremento por tabela, tudo na
+    # mesma transação. Outras conexões nunca veem a linha de controle
+    for tabela in ("mesa", "comanda", "comanda_item_cardapio"):
+        conexao.execute(f"DROP TRIGGER IF EXISTS trg_{tabela}_alteracao_delete")
+        conexao.execute(f"""
+            CREATE TRIGGER trg_{tabela}_alteracao_delete
+            AFTER DELETE ON {tabela}
+            WHEN NOT EXISTS (SELECT 1 FROM contador_alteracao WHERE tabela = 'remocao_em_lote')
+            BEGIN
+                UPDATE contador_alteracao SET versao = versao + 1 WHERE tabela = '{tabela}';
+            END
+        """)
+
+
+def _m010_contadores_cadastros(conexao):
+    """Contadores de alterações do cardápio e dos funcionários (cache entre processos)."""
+    # Cardápio e funcionários ficam em cache por até CACHE_TTL; com os
+    # contadores, escritas de outro processo (ex: Streamlit e API HTTP)
+    # invalidam o cache na próxima leitura. Mesmos triggers das migrações 8 e 9
+    for tabela in ("item_cardapio", "funcionario"):
+        conexao.execute("INSERT OR IGNORE INTO contador_alteracao (tabela) VALUES (?)", (tabela,))
+        eventos = {
+            "insert": ("INSERT", ""),
+            "update": ("UPDATE", ""),
+            "delete": ("DELETE", "WHEN NOT EXISTS (SELECT 1 FROM contador_alteracao "
+                                 "WHERE tabela = 'remocao_em_lote')"),
+        }
+        for sufixo, (evento, condicao) in eventos.items():
+            conexao.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{tabela}_alteracao_{sufixo}
+                AFTER {evento} ON {tabela}
+                {condicao}
+                BEGIN
+                    UPDATE contador_alteracao SET versao = versao + 1 WHERE tabela = '{tabela}';
+                END
+            """)
+
+
+# Lista ordenada de (versão, descrição, função)
+MIGRACOES = [
+    (1, "Índices de comandas abertas, fechamento e itens por comanda", _m001_indices_comanda),
+    (2, "Subtotal e quantidade de itens mantidos na comanda", _m002_subtotal_comanda),
+    (3, "Índices de nome, CPF e telefone de clientes", _m003_indices_cliente),
+    (4, "Busca de texto completo (FTS5) no cardápio", _m004_busca_cardapio),
+    (5, "CPF normalizado e único para clientes e funcionários", _m005_cpf_unico),
+    (6, "Resumo diário de vendas (dia, hora, item e funcionário)", _m006_resumo_vendas),
+    (7, "Fila da cozinha: situação de preparo e sequência das linhas de pedido", _m007_fila_cozinha),
+    (8, "Contadores de alterações de mesas, comandas e itens de comanda", _m008_contadores_alteracao),
+    (9, "Remoções em lote sem incremento dos contadores por linha", _m009_remocao_em_lote),
+    (10, "Contadores de alterações do cardápio e dos funcionários", _m010_contadores_cadastros),
+]
+
+
+# ===== MOTOR DE MIGRAÇÕES =====
+
+def versao_atual(conexao):
+    """
+    Retorna a versão do esquema gravada no banco.
+
+    Args:
+        conexao (sqlite3.Connection): Conexão com o banco
+
+    Returns:
+        int: Valor de PRAGMA user_version (0 para bancos nunca migrados)
+    """
+    return conexao.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migracoes(conexao, ate_versao=None):
+    """
+    Aplica, em ordem, todas as migrações ainda não aplicadas ao banco.
+
+    Args:
+        conexao (sqlite3.Connection): Conexão com o banco (sem transação aberta)
+        ate_versao (int): Versão máxima a aplicar (padrão: a mais recente)
+
+    Returns:
+        list: Versões aplicadas nesta chamada (vazia se o banco já estava atualizado)
+
+    Raises:
+        sqlite3.Error: Se uma migração falhar (o banco fica na última versão válida)
+    """
+    if conexao.in_transaction:
+        conexao.commit()
+
+    aplicadas = []
+    for versao, descricao, migracao in MIGRACOES:
+        if ate_versao is not None and versao > ate_versao:
+            break
+        if versao <= versao_atual(conexao):
+            continue
+
+        # IMMEDIATE: obtém o lock de escrita antes de reler a versão, evitando
+        # que dois processos apliquem a mesma migração ao mesmo tempo
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            if versao <= versao_atual(conexao):
+                conexao.rollback()
+                continue
+            migracao(conexao)
+            conexao.execute(f"PRAGMA user_version = {int(versao)}")
+            conexao.commit()
+        except sqlite3.Error as e:
+            conexao.rollback()
+            print(f"Erro ao aplicar migração {versao} ({descricao}): {e}")
+            raise
+        print(f"Migração {versao} aplicada: {descricao}")
+        aplicadas.append(versao)
+
+    if aplicadas:
+        # Atualiza as estatísticas do planejador para os novos índices
+        conexao.execute("PRAGMA optimize")
+    return aplicadas
@@ -0,0 +1,58 @@
+# Services/resumo_vendas.py
+"""
+Manutenção do resumo diário de vendas pela linha de comando.
+
+Uso:
+    python Services/resumo_vendas.py verificar             # lista divergências
+    python Services/resumo_vendas.py verificar --corrigir  # reconstrói se houver divergência
+    python Services/resumo_vendas.py reconstruir           # recalcula tudo
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Permite executar este arquivo diretamente e importar os módulos do projeto
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from Controllers.db_connection import configurar_pool
+from Controllers.ResumoVendasController import reconstruir_resumos, verificar_resumos
+
+# Quantidade máxima de divergências detalhadas na saída
+LIMITE_DETALHES = 20
+
+def main(argumentos=None):
+    """
+    Executa o comando informado.
+
+    Returns:
+        int: Código de saída (0 = ok, 1 = divergência ou erro)
+    """
+    parser = argparse.ArgumentParser(description="Manutenção do resumo diário de vendas")
+    parser.add_argument("comando", choices=["verificar", "reconstruir"])
+    parser.add_argument("--corrigir", action="store_true",
+                        help="Reconstrói os resumos se a verificação encontrar divergências")
+    parser.add_argument("--db", help="Caminho do banco (padrão: restaurante.db na raiz)")
+    args = parser.parse_args(argumentos)
+
+    if args.db:
+        configurar_pool(caminho=args.db)
+
+    if args.comando == "reconstruir":
+        return 0 if reconstruir_resumos() else 1
+
+    divergencias = verificar_resumos(corrigir=args.corrigir)
+    if divergencias is None:
+        return 1
+    if not divergencias:
+        print("Resumo de vendas confere com as comandas.")
+        return 0
+    for d in divergencias[:LIMITE_DETALHES]:
+        print(f"{d['tabela']} {d['chave']}: calculado={d['calculado']} resumo={d['resumo']}")
+    if len(divergencias) > LIMITE_DETALHES:
+        print(f"... e mais {len(divergencias) - LIMITE_DETALHES} divergência(s).")
+    return 0 if args.corrigir else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,7 @@ O cardápio é a lista de pratos/bebidas disponíveis no restaurante.
 """
 
 import streamlit as st
-import pandas as pd
+from Services.importacao import importar
 from Controllers.ItemCardapioController import (
     incluir_item, 
     consultar_itens, 
@@ -49,6 +49,7 @@ def show_cardapio_page():
         st.subheader("Itens do Cardápio")
         dados = consultar_itens()
         if dados:
+            pd = importar("pandas")
             df = pd.DataFrame(dados, columns=["ID", "Descrição", "Sub-descrição", "Valor (R$)"])
             st.dataframe(df, use_container_width=True, hide_index=True)
         else:
@@ -57,23 +58,23 @@ def show_cardapio_page():
     # ===== OPERAÇÃO: ALTERAR =====
     elif operacao == "Alterar":
         st.subheader("Alterar Item do Cardápio")
-        dados = consultar_itens()
+        dados = consultar_itens(como_modelo=True)
         if not dados:
             st.warning("Nenhum item para alterar.")
             return
 
-        df = pd.DataFrame(dados, columns=["ID", "Descrição", "Sub-descrição", "Valor (R$)"])
-        labels = [f"{row['ID']} - {row['Descrição']}" for index, row in df.iterrows()]
-        
-        selecao_label = st.selectbox("Selecione o item para alterar:", options=labels)
-        if selecao_label:
-            id_selecionado = int(selecao_label.split(" - ")[0])
-            dados_atuais = next((item for item in dados if item[0] == id_selecionado), None)
+        item_atual = st.selectbox(
+            "Selecione o item para alterar:",
+            options=dados,
+            format_func=lambda i: f"{i.get_id_item()} - {i.get_descricao()}"
+        )
+        if item_atual:
+            id_selecionado = item_atual.get_id_item()
             
             with st.form(key="form_alterar_item"):
-                desc = st.text_input("Descrição:", value=dados_atuais[1])
-                sub_desc = st.text_input("Sub-descrição:", value=dados_atuais[2])
-                valor = st.number_input("Valor Unitário (R$):", min_value=0.0, value=float(dados_atuais[3]), format="%.2f")
+                desc = st.text_input("Descrição:", value=item_atual.get_descricao())
+                sub_desc = st.text_input("Sub-descrição:", value=item_atual.get_sub_descricao())
+                valor = st.number_input("Valor Unitário (R$):", min_value=0.0, value=float(item_atual.get_valor_unitario()), format="%.2f")
                 
                 submit = st.form_submit_button("Salvar Alterações")
                 if submit:
@@ -88,20 +89,20 @@ def show_cardapio_page():
     # ===== OPERAÇÃO: EXCLUIR =====
     elif operacao == "Excluir":
         st.subheader("Excluir Item do Cardápio")
-        dados = consultar_itens()
+        dados = consultar_itens(como_modelo=True)
         if not dados:
             st.warning("Nenhum item para excluir.")
             return
             
-        df = pd.DataFrame(dados, columns=["ID", "Descrição", "Sub-descrição", "Valor (R$)"])
-        labels = [f"{row['ID']} - {row['Descrição']}" for index, row in df.iterrows()]
-        
-        selecao_label = st.selectbox("Selecione o item para excluir:", options=labels)
+        item_selecionado = st.selectbox(
+            "Selecione o item para excluir:",
+            options=dados,
+            format_func=lambda i: f"{i.get_id_item()} - {i.get_descricao()}"
+        )
         
         if st.button("Excluir", type="primary"):
             try:
-                id_selecionado = int(selecao_label.split(" - ")[0])
-                excluir_item(id_selecionado)
+                excluir_item(item_selecionado.get_id_item())
                 st.success("Item excluído com sucesso!")
                 st.rerun() 
             except Exception as e:
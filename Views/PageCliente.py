@@ -2,18 +2,81 @@
 """
 Página de Gerenciamento de Clientes.
 Interface Streamlit para realizar operações CRUD (Criar, Ler, Atualizar, Deletar) de clientes.
+As listagens são paginadas e filtradas no banco: apenas uma página de
+clientes é carregada por vez, mesmo com centenas de milhares de cadastros.
 """
 
 import streamlit as st
-import pandas as pd
+from Services.importacao import importar
 from Controllers.ClienteController import (
     incluir_cliente, 
-    consultar_clientes, 
+    buscar_cliente_por_cpf,
+    consultar_clientes_pagina, 
     excluir_cliente, 
     alterar_cliente
 )
 from Models.Cliente import Cliente
 
+# Quantidade de clientes exibida por página
+TAMANHO_PAGINA = 50
+
+def filtros_busca(operacao):
+    """
+    Exibe os campos de busca (nome, CPF e telefone) da operação informada.
+    
+    Args:
+        operacao (str): Nome da operação, usado para separar os widgets
+        
+    Returns:
+        dict: Filtros preenchidos (nome, cpf, telefone)
+    """
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        nome = st.text_input("Nome começa com:", key=f"busca_nome_{operacao}")
+    with col2:
+        cpf = st.text_input("CPF:", max_chars=11, key=f"busca_cpf_{operacao}")
+    with col3:
+        telefone = st.text_input("Telefone começa com:", max_chars=14, key=f"busca_tel_{operacao}")
+    return {"nome": nome.strip(), "cpf": cpf.strip(), "telefone": telefone.strip()}
+
+def pagina_clientes(operacao, filtros, como_modelo=False):
+    """
+    Carrega a página atual de clientes e exibe os botões de navegação.
+    Os cursores das páginas visitadas ficam no session_state, permitindo voltar.
+    Mudar os filtros reinicia a navegação na primeira página.
+    
+    Args:
+        operacao (str): Nome da operação (cada operação navega separadamente)
+        filtros (dict): Filtros retornados por filtros_busca()
+        como_modelo (bool): Se True, retorna instâncias de Cliente em vez de tuplas
+        
+    Returns:
+        list: Clientes da página atual (tuplas id, cpf, nome, telefone)
+    """
+    chave = f"paginacao_clientes_{operacao}"
+    estado = st.session_state.get(chave)
+    if estado is None or estado["filtros"] != filtros:
+        # Pilha de cursores: o topo é o início da página atual
+        estado = {"filtros": filtros, "cursores": [None]}
+        st.session_state[chave] = estado
+    
+    dados, proximo = consultar_clientes_pagina(
+        apos=estado["cursores"][-1], limite=TAMANHO_PAGINA, como_modelo=como_modelo, **filtros
+    )
+    
+    col_ant, col_pag, col_prox = st.columns([1, 2, 1])
+    with col_ant:
+        if st.button("< Anterior", key=f"ant_{operacao}", disabled=len(estado["cursores"]) == 1):
+            estado["cursores"].pop()
+            st.rerun()
+    with col_pag:
+        st.caption(f"Página {len(estado['cursores'])}")
+    with col_prox:
+        if st.button("Próxima >", key=f"prox_{operacao}", disabled=proximo is None):
+            estado["cursores"].append(proximo)
+            st.rerun()
+    return dados
+
 def show_cliente_page():
     """
     Função principal da página de clientes.
@@ -35,81 +98,91 @@ def show_cliente_page():
             
             submit = st.form_submit_button("Cadastrar")
             if submit:
+                existente = buscar_cliente_por_cpf(cpf) if cpf else None
                 if not cpf or not nome:
                     st.warning("Por favor, preencha CPF e Nome.")
+                elif existente:
+                    # Busca pelo índice único de CPF: evita cadastros duplicados
+                    st.warning(f"CPF já cadastrado para o cliente {existente[2]} (ID {existente[0]}).")
                 else:
                     try:
                         # Cria objeto Cliente e insere no banco
                         novo_cliente = Cliente(0, cpf, nome, telefone)
-                        incluir_cliente(novo_cliente)
-                        st.success(f"Cliente {nome} cadastrado com sucesso!")
+                        if incluir_cliente(novo_cliente):
+                            st.success(f"Cliente {nome} cadastrado com sucesso!")
+                        else:
+                            st.error("Erro ao cadastrar. Verifique se o CPF já está cadastrado.")
                     except Exception as e:
                         st.error(f"Erro ao cadastrar: {e}")
 
     # ===== OPERAÇÃO: CONSULTAR =====
     elif operacao == "Consultar":
         st.subheader("Clientes Cadastrados")
-        dados = consultar_clientes()
+        filtros = filtros_busca(operacao)
+        dados = pagina_clientes(operacao, filtros)
         if dados:
-            # Converte dados em DataFrame para exibição em tabela
+            # Converte apenas a página atual em DataFrame para exibição em tabela
+            pd = importar("pandas")
             df = pd.DataFrame(dados, columns=["ID", "CPF", "Nome", "Telefone"])
             st.dataframe(df, use_container_width=True, hide_index=True)
         else:
-            st.info("Nenhum cliente cadastrado.")
+            st.info("Nenhum cliente encontrado.")
 
     # ===== OPERAÇÃO: ALTERAR =====
     elif operacao == "Alterar":
         st.subheader("Alterar Cliente")
-        dados = consultar_clientes()
+        filtros = filtros_busca(operacao)
+        dados = pagina_clientes(operacao, filtros, como_modelo=True)
         if not dados:
-            st.warning("Nenhum cliente para alterar.")
+            st.warning("Nenhum cliente encontrado para alterar.")
             return
 
-        # Cria lista de labels para seleção (ID - Nome)
-        df = pd.DataFrame(dados, columns=["ID", "CPF", "Nome", "Telefone"])
-        labels = [f"{row['ID']} - {row['Nome']}" for index, row in df.iterrows()]
-        
-        selecao_label = st.selectbox("Selecione o cliente para alterar:", options=labels)
-        if selecao_label:
-            # Extrai o ID do label selecionado
-            id_selecionado = int(selecao_label.split(" - ")[0])
-            # Encontra os dados atuais do cliente
-            dados_atuais = next((item for item in dados if item[0] == id_selecionado), None)
+        # Opções de seleção ("ID - Nome") apenas da página atual
+        cliente_atual = st.selectbox(
+            "Selecione o cliente para alterar:", 
+            options=dados, 
+            format_func=lambda c: f"{c.get_id_cliente()} - {c.get_nome()}"
+        )
+        if cliente_atual:
+            id_selecionado = cliente_atual.get_id_cliente()
             
             with st.form(key="form_alterar_cliente"):
-                cpf = st.text_input("CPF:", value=dados_atuais[1], max_chars=11)
-                nome = st.text_input("Nome Completo:", value=dados_atuais[2])
-                telefone = st.text_input("Telefone:", value=dados_atuais[3], max_chars=14)
+                cpf = st.text_input("CPF:", value=cliente_atual.get_cpf(), max_chars=11)
+                nome = st.text_input("Nome Completo:", value=cliente_atual.get_nome())
+                telefone = st.text_input("Telefone:", value=cliente_atual.get_telefone(), max_chars=14)
                 
                 submit = st.form_submit_button("Salvar Alterações")
                 if submit:
                     try:
                         # Cria objeto Cliente com dados alterados e atualiza
                         cliente_alterado = Cliente(id_selecionado, cpf, nome, telefone)
-                        alterar_cliente(cliente_alterado)
-                        st.success("Cliente alterado com sucesso!")
-                        st.rerun()  # Recarrega a página para refletir mudanças
+                        if alterar_cliente(cliente_alterado):
+                            st.success("Cliente alterado com sucesso!")
+                            st.rerun()  # Recarrega a página para refletir mudanças
+                        else:
+                            st.error("Erro ao alterar. Verifique se o CPF pertence a outro cliente.")
                     except Exception as e:
                         st.error(f"Erro ao alterar: {e}")
 
     # ===== OPERAÇÃO: EXCLUIR =====
     elif operacao == "Excluir":
         st.subheader("Excluir Cliente")
-        dados = consultar_clientes()
+        filtros = filtros_busca(operacao)
+        dados = pagina_clientes(operacao, filtros, como_modelo=True)
         if not dados:
-            st.warning("Nenhum cliente para excluir.")
+            st.warning("Nenhum cliente encontrado para excluir.")
             return
             
-        df = pd.DataFrame(dados, columns=["ID", "CPF", "Nome", "Telefone"])
-        labels = [f"{row['ID']} - {row['Nome']}" for index, row in df.iterrows()]
-        
-        selecao_label = st.selectbox("Selecione o cliente para excluir:", options=labels)
+        cliente_selecionado = st.selectbox(
+            "Selecione o cliente para excluir:", 
+            options=dados, 
+            format_func=lambda c: f"{c.get_id_cliente()} - {c.get_nome()}"
+        )
         
         if st.button("Excluir", type="primary"):
             try:
-                id_selecionado = int(selecao_label.split(" - ")[0])
-                excluir_cliente(id_selecionado)
+                excluir_cliente(cliente_selecionado.get_id_cliente())
                 st.success("Cliente excluído com sucesso!")
                 st.rerun()
             except Exception as e:
-                st.error(f"Erro ao excluir. Verifique se o cliente está vinculado a uma comanda. Erro: {e}")
\ No newline at end of file
+                st.error(f"Erro ao excluir. Verifique se o cliente está vinculado a uma comanda. Erro: {e}")
@@ -3,23 +3,30 @@
 Página de Gestão de Comandas.
 Interface Streamlit para gerenciar o ciclo completo de uma comanda:
 1. Abrir comanda (criar nova comanda para uma mesa)
-2. Gerenciar comanda aberta (adicionar itens do cardápio)
+2. Gerenciar comanda aberta (montar um pedido com vários itens e enviá-lo de uma vez)
 3. Fechar comanda (calcular total, registrar pagamento, liberar mesa)
+4. Visão geral das contas abertas (totais de todas as comandas em uma consulta)
 """
 
 import streamlit as st
-import pandas as pd
+from Services.importacao import importar
 from Controllers.MesaController import consultar_mesas_com_comanda
 from Controllers.FuncionarioController import consultar_funcionarios
-from Controllers.ItemCardapioController import consultar_itens
+from Controllers.ItemCardapioController import consultar_itens, buscar_itens
 from Controllers.ComandaController import (
     abrir_comanda, 
-    adicionar_item_comanda, 
+    adicionar_itens_comanda, 
     consultar_itens_comanda,
     calcular_total_comanda,
+    calcular_totais_comandas,
     fechar_comanda
 )
 
+# Máximo de itens retornados pela busca do cardápio
+LIMITE_BUSCA_ITENS = 30
+# Cardápios até este tamanho são listados inteiros quando não há termo de busca
+LIMITE_CARDAPIO_COMPLETO = 100
+
 def format_func_dict(options_dict):
     """
     Função auxiliar para formatar os selectbox do Streamlit.
@@ -33,6 +40,20 @@ def format_func_dict(options_dict):
     """
     return lambda x: options_dict[x]
 
+def obter_carrinho(id_comanda):
+    """
+    Retorna o pedido em montagem (carrinho) de uma comanda, guardado no session_state.
+    O carrinho só é gravado no banco quando o pedido é enviado.
+    
+    Args:
+        id_comanda (int): ID da comanda
+        
+    Returns:
+        list: Lista (mutável) de tuplas (id_item, quantidade, descricao, valor_unitario)
+    """
+    carrinhos = st.session_state.setdefault("carrinhos_comanda", {})
+    return carrinhos.setdefault(id_comanda, [])
+
 def show_comanda_page():
     """
     Função principal da página de comandas.
@@ -43,7 +64,7 @@ def show_comanda_page():
     # Menu lateral com três operações principais
     operacao = st.sidebar.selectbox(
         "Operações de Comanda", 
-        ["Abrir Comanda", "Gerenciar Comanda Aberta", "Fechar Comanda"]
+        ["Abrir Comanda", "Gerenciar Comanda Aberta", "Fechar Comanda", "Visão Geral das Contas"]
     )
 
     # ===== OPERAÇÃO 1: ABRIR COMANDA =====
@@ -115,25 +136,69 @@ def show_comanda_page():
                 st.warning("Nenhum item cadastrado no cardápio.")
                 return
             
-            item_options = {i[0]: f"{i[1]} - R$ {i[3]:.2f}" for i in itens_cardapio_data}
+            # Busca enquanto digita (índice FTS5); sem termo, cardápios pequenos
+            # são listados inteiros
+            termo_busca = st.text_input("Buscar item do cardápio:", placeholder="Ex: caip, pizza cal...")
+            if termo_busca.strip():
+                itens_exibidos = buscar_itens(termo_busca, limite=LIMITE_BUSCA_ITENS)
+            elif len(itens_cardapio_data) <= LIMITE_CARDAPIO_COMPLETO:
+                itens_exibidos = itens_cardapio_data
+            else:
+                itens_exibidos = []
+                st.info("Digite parte do nome do item para buscar no cardápio.")
+            
+            carrinho = obter_carrinho(id_comanda_selecionada)
             
-            with st.form(key="form_add_item"):
-                st.write(f"**Adicionar Itens à Comanda {id_comanda_selecionada}**")
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    id_item = st.selectbox("Item do Cardápio:", options=list(item_options.keys()), format_func=format_func_dict(item_options))
-                with col2:
-                    qtd = st.number_input("Qtd:", min_value=1, step=1)
+            if termo_busca.strip() and not itens_exibidos:
+                st.warning("Nenhum item encontrado para a busca.")
+            
+            if itens_exibidos:
+                item_options = {i[0]: f"{i[1]} - R$ {i[3]:.2f}" for i in itens_exibidos}
+                itens_por_id = {i[0]: i for i in itens_exibidos}
+                
+                # Adicionar ao pedido apenas altera o carrinho (session_state);
+                # nada é gravado no banco até o pedido ser enviado
+                with st.form(key="form_add_item", clear_on_submit=True):
+                    st.write(f"**Montar Pedido da Comanda {id_comanda_selecionada}**")
+                    col1, col2 = st.columns([3, 1])
+                    with col1:
+                        id_item = st.selectbox("Item do Cardápio:", options=list(item_options.keys()), format_func=format_func_dict(item_options))
+                    with col2:
+                        qtd = st.number_input("Qtd:", min_value=1, step=1)
+                    
+                    submit_item = st.form_submit_button("Adicionar ao Pedido")
+                    if submit_item:
+                        item = itens_por_id[id_item]
+                        carrinho.append((id_item, int(qtd), item[1], item[3]))
+            
+            # Pedido em montagem
+            if carrinho:
+                st.write("**Pedido a enviar:**")
+                pd = importar("pandas")
+                df_carrinho = pd.DataFrame(
+                    [(descricao, qtd, qtd * valor) for _, qtd, descricao, valor in carrinho],
+                    columns=["Item", "Qtd", "Total Item"]
+                )
+                st.dataframe(df_carrinho, use_container_width=True, hide_index=True)
                 
-                submit_item = st.form_submit_button("Adicionar Item")
-                if submit_item:
-                    try:
-                        if adicionar_item_comanda(id_comanda_selecionada, id_item, qtd):
-                            st.success(f"{qtd}x '{item_options[id_item].split(' - ')[0]}' adicionado(s).")
-                        else:
-                            st.error("Erro ao adicionar item.")
-                    except Exception as e:
-                        st.error(f"Erro: {e}")
+                col_enviar, col_limpar = st.columns(2)
+                with col_enviar:
+                    if st.button("Enviar Pedido", type="primary"):
+                        try:
+                            # Todo o pedido em uma única consulta de preços e uma transação
+                            pedido = [(id_item, qtd) for id_item, qtd, _, _ in carrinho]
+                            if adicionar_itens_comanda(id_comanda_selecionada, pedido):
+                                st.success(f"Pedido com {len(carrinho)} item(ns) enviado.")
+                                carrinho.clear()
+                                st.rerun()
+                            else:
+                                st.error("Erro ao enviar o pedido.")
+                        except Exception as e:
+                            st.error(f"Erro: {e}")
+                with col_limpar:
+                    if st.button("Limpar Pedido"):
+                        carrinho.clear()
+                        st.rerun()
 
             # 3. Mostrar itens já adicionados
             st.markdown("---")
@@ -142,6 +207,7 @@ def show_comanda_page():
             
             if itens_na_comanda:
                 # Cria DataFrame com os itens
+                pd = importar("pandas")
                 df_itens = pd.DataFrame(
                     [dict(row) for row in itens_na_comanda], 
                     columns=["descricao", "quantidade_item", "valor_unitario_momento", "valor_total_item"]
@@ -182,6 +248,7 @@ def show_comanda_page():
             # Mostrar itens da comanda
             itens_na_comanda = consultar_itens_comanda(id_comanda_selecionada)
             if itens_na_comanda:
+                pd = importar("pandas")
                 df_itens = pd.DataFrame(
                     [dict(row) for row in itens_na_comanda], 
                     columns=["descricao", "quantidade_item", "valor_total_item"]
@@ -210,4 +277,37 @@ def show_comanda_page():
                         except Exception as e:
                             st.error(f"Erro: {e}")
             else:
-                st.warning("Esta comanda está vazia. Não é possível fechar.")
\ No newline at end of file
+                st.warning("Esta comanda está vazia. Não é possível fechar.")
+
+    # ===== OPERAÇÃO 4: VISÃO GERAL DAS CONTAS =====
+    elif operacao == "Visão Geral das Contas":
+        st.subheader("Visão Geral das Contas Abertas")
+        
+        # Totais de todas as comandas abertas em uma única consulta agregada
+        totais_abertas = calcular_totais_comandas()
+        if not totais_abertas:
+            st.info("Nenhuma comanda aberta no momento.")
+            return
+        
+        nomes_funcionarios = {f[0]: f[2] for f in consultar_funcionarios()}
+        pd = importar("pandas")
+        df_contas = pd.DataFrame(
+            [
+                (
+                    id_comanda,
+                    totais["id_mesa"],
+                    nomes_funcionarios.get(totais["funcionario_id"], totais["funcionario_id"]),
+                    totais["horario_abertura"],
+                    totais["subtotal"],
+                    totais["taxa_servico_valor"],
+                    totais["valor_total"],
+                )
+                for id_comanda, totais in totais_abertas.items()
+            ],
+            columns=["Comanda", "Mesa", "Funcionário", "Abertura", "Subtotal", "Taxa Serviço", "Total"]
+        )
+        st.dataframe(df_contas, use_container_width=True, hide_index=True)
+        
+        col1, col2 = st.columns(2)
+        col1.metric("Comandas Abertas", len(df_contas))
+        col2.metric("Total em Aberto", f"R$ {df_contas['Total'].sum():.2f}")
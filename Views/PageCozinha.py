@@ -0,0 +1,144 @@
+# Views/PageCozinha.py
+"""
+Página da Cozinha.
+Mostra os pedidos pendentes e em preparo, atualizando a cada segundo.
+
+A fila fica no session_state de cada tela: a primeira execução carrega as
+linhas em andamento e as seguintes buscam apenas o que mudou desde o último
+cursor (Controllers/CozinhaController.py). Só o trecho da fila é reexecutado
+na atualização automática (st.fragment), não a página inteira.
+"""
+
+from collections import deque
+
+import streamlit as st
+from Controllers.CozinhaController import (
+    LIMITE_ALTERACOES,
+    alterar_status_preparo,
+    consultar_alteracoes_cozinha,
+    consultar_fila_cozinha,
+)
+from Controllers.instrumentacao import medir_render
+
+# Nome da atualização automática na página "Diagnóstico"
+ROTULO_ATUALIZACAO = "Cozinha (atualização automática)"
+# Intervalo (segundos) entre as buscas de alterações
+INTERVALO_ATUALIZACAO = 1
+# Linhas prontas mantidas na coluna "Prontos"
+LIMITE_PRONTOS = 10
+
+# Próxima situação e rótulo do botão de cada situação
+_PROXIMO_STATUS = {
+    "pendente": ("preparando", "Iniciar"),
+    "preparando": ("pronto", "Pronto"),
+}
+
+def _estado_fila():
+    """
+    Retorna a fila desta tela, guardada no session_state.
+
+    Returns:
+        dict: cursor (None antes da carga inicial), linhas (id -> dict das
+              linhas em andamento) e prontos (deque das últimas linhas prontas)
+    """
+    return st.session_state.setdefault("fila_cozinha", {
+        "cursor": None,
+        "linhas": {},
+        "prontos": deque(maxlen=LIMITE_PRONTOS),
+    })
+
+def atualizar_fila(estado):
+    """
+    Aplica à fila as linhas novas ou alteradas desde o cursor; linhas
+    prontas ou retiradas (comanda fechada) saem da fila.
+    Na primeira chamada (cursor None) faz a carga inicial.
+
+    Args:
+        estado (dict): Fila retornada por _estado_fila()
+    """
+    if estado["cursor"] is None:
+        linhas, cursor = consultar_fila_cozinha()
+        if cursor is None:
+            return
+        estado["linhas"] = {linha["id_comanda_item_cardapio"]: linha for linha in linhas}
+        estado["cursor"] = cursor
+        return
+
+    while True:
+        alteracoes, estado["cursor"] = consultar_alteracoes_cozinha(estado["cursor"])
+        for linha in alteracoes:
+            id_linha = linha["id_comanda_item_cardapio"]
+            if linha["status_preparo"] is None:
+                # Comanda fechada antes do preparo terminar: a linha sai da fila
+                estado["linhas"].pop(id_linha, None)
+            elif linha["status_preparo"] == "pronto":
+                estado["linhas"].pop(id_linha, None)
+                estado["prontos"].appendleft(linha)
+            else:
+                estado["linhas"][id_linha] = linha
+        if len(alteracoes) < LIMITE_ALTERACOES:
+            break
+
+def _avancar_linha(id_linha, status):
+    """Callback do botão: grava a nova situação antes de a fila ser reexibida."""
+    if not alterar_status_preparo(id_linha, status):
+        st.toast("Erro ao alterar a situação do pedido.")
+
+def _mostrar_linha(linha):
+    """Exibe uma linha de pedido com o botão que a avança para a próxima situação."""
+    with st.container(border=True):
+        st.markdown(f"**{linha['quantidade_item']}x {linha['descricao']}**")
+        st.caption(f"Mesa {linha['mesa_id']} · Comanda {linha['comanda_id']} · {linha['horario_pedido']}")
+        proximo, rotulo = _PROXIMO_STATUS[linha["status_preparo"]]
+        # A mudança chega à fila pela busca de alterações, como as das outras telas
+        st.button(rotulo, key=f"cozinha_{linha['id_comanda_item_cardapio']}_{proximo}",
+                  on_click=_avancar_linha, args=(linha["id_comanda_item_cardapio"], proximo))
+
+def _mostrar_fila():
+    """Busca as alterações e exibe as colunas da fila."""
+    estado = _estado_fila()
+    atualizar_fila(estado)
+    if estado["cursor"] is None:
+        st.error("Erro ao carregar a fila da cozinha.")
+        return
+
+    linhas = sorted(estado["linhas"].values(), key=lambda linha: linha["id_comanda_item_cardapio"])
+    col_pendentes, col_preparo, col_prontos = st.columns(3)
+    with col_pendentes:
+        pendentes = [linha for linha in linhas if linha["status_preparo"] == "pendente"]
+        st.subheader(f"Pendentes ({len(pendentes)})")
+        for linha in pendentes:
+            _mostrar_linha(linha)
+    with col_preparo:
+        em_preparo = [linha for linha in linhas if linha["status_preparo"] == "preparando"]
+        st.subheader(f"Em preparo ({len(em_preparo)})")
+        for linha in em_preparo:
+            _mostrar_linha(linha)
+    with col_prontos:
+        st.subheader("Prontos")
+        for linha in estado["prontos"]:
+            st.write(f"{linha['quantidade_item']}x {linha['descricao']} · Mesa {linha['mesa_id']}")
+
+@st.fragment(run_every=INTERVALO_ATUALIZACAO)
+def _mostrar_fila_automatica():
+    """Fila reexecutada sozinha a cada INTERVALO_ATUALIZACAO segundos."""
+    # Medido à parte: estas reexecuções não passam por main.main()
+    with medir_render(ROTULO_ATUALIZACAO):
+        _mostrar_fila()
+
+def show_cozinha_page():
+    """
+    Função principal da página da cozinha.
+    Exibe a fila de pedidos com atualização automática.
+    """
+    st.title("Cozinha")
+
+    automatico = st.sidebar.toggle("Atualização automática", value=True)
+    if st.sidebar.button("Recarregar fila"):
+        # Descarta a fila local e refaz a carga inicial
+        st.session_state.pop("fila_cozinha", None)
+
+    if automatico:
+        _mostrar_fila_automatica()
+    else:
+        _mostrar_fila()
@@ -0,0 +1,134 @@
+# Views/PageDiagnostico.py
+"""
+Página de Diagnóstico.
+Mostra o tempo de renderização de cada página (p50/p95) e as consultas SQL
+mais lentas registradas pela instrumentação desde o início do processo
+(com o plano de execução das que passaram do limiar de consulta lenta),
+além do uso do pool de conexões, do escritor único e do cache.
+"""
+
+import streamlit as st
+from Services.importacao import importar
+from Controllers.instrumentacao import (
+    consultas_recentes,
+    consultas_mais_lentas,
+    consultas_agrupadas,
+    consultas_lentas,
+    estatisticas_render,
+    limpar_registros,
+    AMOSTRA_INSTRUMENTACAO,
+    INSTRUMENTACAO_ATIVA,
+    LIMITE_REGISTROS,
+    LIMIAR_CONSULTA_LENTA_MS,
+)
+from Controllers.db_connection import estatisticas_pool
+from Controllers.cache import estatisticas_cache
+from Controllers.escritor import estatisticas_escritor
+from Controllers.alteracoes import estatisticas_alteracoes
+
+# Linhas exibidas em cada tabela de consultas
+LIMITE_TABELA = 20
+
+def show_diagnostico_page():
+    """
+    Função principal da página de diagnóstico.
+    Exibe os tempos de renderização e de consultas em memória.
+    """
+    st.title("Diagnóstico")
+    pd = importar("pandas")
+
+    if not INSTRUMENTACAO_ATIVA:
+        st.warning("Instrumentação de consultas desligada: inicie com RESTAURANTE_INSTRUMENTACAO=1.")
+    elif AMOSTRA_INSTRUMENTACAO < 1:
+        st.caption(f"Amostragem: {AMOSTRA_INSTRUMENTACAO:.0%} dos comandos SQL são registrados.")
+    st.caption(f"Registros em memória: até {LIMITE_REGISTROS} consultas e renderizações mais recentes.")
+
+    if st.sidebar.button("Limpar registros"):
+        limpar_registros()
+        st.rerun()
+
+    # ===== RENDERIZAÇÃO DAS PÁGINAS =====
+    st.subheader("Tempo de Renderização por Página")
+    renders = estatisticas_render()
+    if renders:
+        df = pd.DataFrame(renders).rename(columns={
+            "pagina": "Página",
+            "renderizacoes": "Execuções",
+            "p50_ms": "p50 (ms)",
+            "p95_ms": "p95 (ms)",
+            "max_ms": "Máximo (ms)",
+            "ultima_ms": "Última (ms)",
+        })
+        st.dataframe(df.round(1), use_container_width=True, hide_index=True)
+    else:
+        st.info("Nenhuma página renderizada ainda.")
+
+    st.divider()
+
+    # ===== CONSULTAS =====
+    st.subheader("Consultas SQL")
+    colunas_consulta = {
+        "duracao_ms": "Duração (ms)",
+        "linhas": "Linhas",
+        "chamador": "Função",
+        "sql": "SQL",
+        "parametros": "Parâmetros",
+        "instante": "Instante",
+        "erro": "Erro",
+    }
+    aba_lentas, aba_planos, aba_agrupadas, aba_recentes = st.tabs(
+        ["Mais Lentas", "Planos de Execução", "Por Tempo Total", "Recentes"]
+    )
+    with aba_lentas:
+        lentas = consultas_mais_lentas(LIMITE_TABELA)
+        if lentas:
+            df = pd.DataFrame(lentas)[list(colunas_consulta)].rename(columns=colunas_consulta)
+            st.dataframe(df.round(3), use_container_width=True, hide_index=True)
+        else:
+            st.info("Nenhuma consulta registrada.")
+    with aba_planos:
+        st.caption(f"Consultas acima de {LIMIAR_CONSULTA_LENTA_MS:g} ms (RESTAURANTE_CONSULTA_LENTA_MS).")
+        lentas = consultas_lentas(LIMITE_TABELA)
+        if not lentas:
+            st.info("Nenhuma consulta passou do limiar.")
+        for registro in lentas:
+            titulo = f"{registro['duracao_ms']:.1f} ms — {registro['chamador']}"
+            if registro["varreduras"]:
+                titulo += f" — varredura completa: {', '.join(registro['varreduras'])}"
+            with st.expander(titulo):
+                st.code(registro["sql"], language="sql")
+                st.text("\n".join(registro["plano"]) or "(sem plano)")
+                st.caption(f"{registro['instante']} · {registro['linhas']} linha(s)")
+    with aba_agrupadas:
+        grupos = consultas_agrupadas(LIMITE_TABELA)
+        if grupos:
+            df = pd.DataFrame(grupos).rename(columns={
+                "total_ms": "Total (ms)",
+                "execucoes": "Execuções",
+                "media_ms": "Média (ms)",
+                "p95_ms": "p95 (ms)",
+                "max_ms": "Máximo (ms)",
+                "linhas": "Linhas (média)",
+                "chamador": "Função",
+                "sql": "SQL",
+            })
+            st.dataframe(df.round(3), use_container_width=True, hide_index=True)
+        else:
+            st.info("Nenhuma consulta registrada.")
+    with aba_recentes:
+        recentes = consultas_recentes(LIMITE_TABELA * 5)
+        if recentes:
+            df = pd.DataFrame(recentes)[list(colunas_consulta)].rename(columns=colunas_consulta)
+            st.dataframe(df.round(3), use_container_width=True, hide_index=True)
+        else:
+            st.info("Nenhuma consulta registrada.")
+
+    st.divider()
+
+    # ===== POOL DE CONEXÕES, ESCRITOR E CACHE =====
+    with st.expander("Pool de conexões, escritor e cache"):
+        st.write("Pool de conexões:", estatisticas_pool())
+        st.write("Escritor único (commits agrupados):", estatisticas_escritor())
+        st.write("Cache de dados de referência:", estatisticas_cache())
+        st.write("Detecção de alterações (verificações x leituras dos contadores):",
+                 estatisticas_alteracoes())
@@ -6,9 +6,10 @@ Funcionários são os atendentes que abrem e gerenciam as comandas.
 """
 
 import streamlit as st
-import pandas as pd
+from Services.importacao import importar
 from Controllers.FuncionarioController import (
     incluir_funcionario, 
+    buscar_funcionario_por_cpf,
     consultar_funcionarios, 
     excluir_funcionario, 
     alterar_funcionario
@@ -33,13 +34,19 @@ def show_funcionario_page():
             
             submit = st.form_submit_button("Cadastrar")
             if submit:
+                existente = buscar_funcionario_por_cpf(cpf) if cpf else None
                 if not cpf or not nome:
                     st.warning("Por favor, preencha CPF e Nome.")
+                elif existente:
+                    # Busca pelo índice único de CPF: evita cadastros duplicados
+                    st.warning(f"CPF já cadastrado para o funcionário {existente[2]} (ID {existente[0]}).")
                 else:
                     try:
                         novo_func = Funcionario(0, cpf, nome)
-                        incluir_funcionario(novo_func)
-                        st.success(f"Funcionário {nome} cadastrado com sucesso!")
+                        if incluir_funcionario(novo_func):
+                            st.success(f"Funcionário {nome} cadastrado com sucesso!")
+                        else:
+                            st.error("Erro ao cadastrar. Verifique se o CPF já está cadastrado.")
                     except Exception as e:
                         st.error(f"Erro ao cadastrar: {e}")
 
@@ -48,6 +55,7 @@ def show_funcionario_page():
         st.subheader("Funcionários Cadastrados")
         dados = consultar_funcionarios()
         if dados:
+            pd = importar("pandas")
             df = pd.DataFrame(dados, columns=["ID", "CPF", "Nome"])
             st.dataframe(df, use_container_width=True, hide_index=True)
         else:
@@ -56,51 +64,52 @@ def show_funcionario_page():
     # ===== OPERAÇÃO: ALTERAR =====
     elif operacao == "Alterar":
         st.subheader("Alterar Funcionário")
-        dados = consultar_funcionarios()
+        dados = consultar_funcionarios(como_modelo=True)
         if not dados:
             st.warning("Nenhum funcionário para alterar.")
             return
 
-        df = pd.DataFrame(dados, columns=["ID", "CPF", "Nome"])
-        ids_funcionarios = [f"{row['ID']} - {row['Nome']}" for index, row in df.iterrows()]
-        
-        selecao_label = st.selectbox("Selecione o funcionário para alterar:", options=ids_funcionarios)
-        if selecao_label:
-            id_selecionado = int(selecao_label.split(" - ")[0])
-            # Encontra os dados atuais do funcionário selecionado
-            dados_atuais = next((item for item in dados if item[0] == id_selecionado), None)
+        funcionario_atual = st.selectbox(
+            "Selecione o funcionário para alterar:",
+            options=dados,
+            format_func=lambda f: f"{f.get_id_funcionario()} - {f.get_nome()}"
+        )
+        if funcionario_atual:
+            id_selecionado = funcionario_atual.get_id_funcionario()
             
             with st.form(key="form_alterar_func"):
-                cpf = st.text_input("CPF:", value=dados_atuais[1], max_chars=11)
-                nome = st.text_input("Nome Completo:", value=dados_atuais[2])
+                cpf = st.text_input("CPF:", value=funcionario_atual.get_cpf(), max_chars=11)
+                nome = st.text_input("Nome Completo:", value=funcionario_atual.get_nome())
                 
                 submit = st.form_submit_button("Salvar Alterações")
                 if submit:
                     try:
                         func_alterado = Funcionario(id_selecionado, cpf, nome)
-                        alterar_funcionario(func_alterado)
-                        st.success("Funcionário alterado com sucesso!")
-                        st.rerun() 
+                        if alterar_funcionario(func_alterado):
+                            st.success("Funcionário alterado com sucesso!")
+                            st.rerun()
+                        else:
+                            st.error("Erro ao alterar. Verifique se o CPF pertence a outro funcionário.")
                     except Exception as e:
                         st.error(f"Erro ao alterar: {e}")
 
     # ===== OPERAÇÃO: EXCLUIR =====
     elif operacao == "Excluir":
         st.subheader("Excluir Funcionário")
-        dados = consultar_funcionarios()
+        dados = consultar_funcionarios(como_modelo=True)
         if not dados:
             st.warning("Nenhum funcionário para excluir.")
             return
             
-        df = pd.DataFrame(dados, columns=["ID", "CPF", "Nome"])
-        ids_funcionarios = [f"{row['ID']} - {row['Nome']}" for index, row in df.iterrows()]
-        
-        selecao_label = st.selectbox("Selecione o funcionário para excluir:", options=ids_funcionarios)
+        funcionario_selecionado = st.selectbox(
+            "Selecione o funcionário para excluir:",
+            options=dados,
+            format_func=lambda f: f"{f.get_id_funcionario()} - {f.get_nome()}"
+        )
         
         if st.button("Excluir", type="primary"):
             try:
-                id_selecionado = int(selecao_label.split(" - ")[0])
-                excluir_funcionario(id_selecionado)
+                excluir_funcionario(funcionario_selecionado.get_id_funcionario())
                 st.success("Funcionário excluído com sucesso!")
                 st.rerun()  # Atualiza a lista
             except Exception as e:
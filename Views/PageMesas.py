@@ -7,7 +7,7 @@ Também controla o status das mesas (livre, ocupada, reservada).
 """
 
 import streamlit as st
-import pandas as pd
+from Services.importacao import importar
 from Controllers.MesaController import (
     incluir_mesa, 
     consultar_mesas, 
@@ -46,6 +46,7 @@ def show_mesas_page():
         st.subheader("Status das Mesas")
         dados = consultar_mesas()
         if dados:
+            pd = importar("pandas")
             df = pd.DataFrame(dados, columns=["ID da Mesa", "Status", "Capacidade"])
             st.dataframe(df, use_container_width=True, hide_index=True)
         else:
@@ -54,31 +55,31 @@ def show_mesas_page():
     # ===== OPERAÇÃO: ALTERAR =====
     elif operacao == "Alterar":
         st.subheader("Alterar Mesa")
-        dados = consultar_mesas()
+        dados = consultar_mesas(como_modelo=True)
         if not dados:
             st.warning("Nenhuma mesa para alterar.")
             return
 
-        df = pd.DataFrame(dados, columns=["ID", "Status", "Capacidade"])
-        labels = [f"Mesa {row['ID']} (Cap: {row['Capacidade']})" for index, row in df.iterrows()]
-        
-        selecao_label = st.selectbox("Selecione a mesa para alterar:", options=labels)
-        if selecao_label:
-            id_selecionado = int(selecao_label.split(" ")[1])
-            dados_atuais = next((item for item in dados if item[0] == id_selecionado), None)
+        mesa_atual = st.selectbox(
+            "Selecione a mesa para alterar:",
+            options=dados,
+            format_func=lambda m: f"Mesa {m.get_id_mesa()} (Cap: {m.get_capacidade()})"
+        )
+        if mesa_atual:
+            id_selecionado = mesa_atual.get_id_mesa()
             
             with st.form(key="form_alterar_mesa"):
                 capacidade = st.number_input(
                     "Capacidade:", 
                     min_value=1, 
-                    value=dados_atuais[2], 
+                    value=mesa_atual.get_capacidade(), 
                     step=1
                 )
                 # Permite alterar o status da mesa
                 status = st.selectbox(
                     "Status:", 
                     options=['livre', 'ocupada', 'reservada'], 
-                    index=['livre', 'ocupada', 'reservada'].index(dados_atuais[1])
+                    index=['livre', 'ocupada', 'reservada'].index(mesa_atual.get_status())
                 )
                 
                 submit = st.form_submit_button("Salvar Alterações")
@@ -96,20 +97,20 @@ def show_mesas_page():
         st.subheader("Excluir Mesa")
         # Apenas mesas com status 'livre' podem ser excluídas
         # Mesas ocupadas ou reservadas não devem ser removidas
-        dados = [m for m in consultar_mesas() if m[1] == 'livre']
+        dados = [m for m in consultar_mesas(como_modelo=True) if m.get_status() == 'livre']
         if not dados:
             st.warning("Nenhuma mesa 'livre' disponível para exclusão.")
             return
             
-        df = pd.DataFrame(dados, columns=["ID", "Status", "Capacidade"])
-        labels = [f"Mesa {row['ID']} (Cap: {row['Capacidade']})" for index, row in df.iterrows()]
-        
-        selecao_label = st.selectbox("Selecione a mesa (livre) para excluir:", options=labels)
+        mesa_selecionada = st.selectbox(
+            "Selecione a mesa (livre) para excluir:",
+            options=dados,
+            format_func=lambda m: f"Mesa {m.get_id_mesa()} (Cap: {m.get_capacidade()})"
+        )
         
         if st.button("Excluir", type="primary"):
             try:
-                id_selecionado = int(selecao_label.split(" ")[1])
-                excluir_mesa(id_selecionado)
+                excluir_mesa(mesa_selecionada.get_id_mesa())
                 st.success("Mesa excluída com sucesso!")
                 st.rerun() 
             except Exception as e:
@@ -0,0 +1,112 @@
+# Views/PageRelatorios.py
+"""
+Página de Relatórios de Vendas.
+Interface Streamlit para acompanhar o faturamento do restaurante:
+faturamento por dia e por hora, ticket médio, itens mais vendidos
+e desempenho de cada funcionário no período escolhido.
+"""
+
+import streamlit as st
+from datetime import date, timedelta
+from Controllers.RelatorioController import resumo_vendas, consultar_comandas_fechadas
+
+# Período exibido ao abrir a página (últimos 30 dias)
+DIAS_PERIODO_PADRAO = 30
+# Quantidade de itens nos rankings
+LIMITE_RANKING = 10
+# Quantidade máxima de comandas na listagem detalhada
+LIMITE_COMANDAS = 200
+
+def formatar_moeda(valor):
+    """Formata um valor no padrão 'R$ 1.234,56'."""
+    return f"R$ {valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+def show_relatorios_page():
+    """
+    Função principal da página de relatórios.
+    Permite escolher o período e exibe os indicadores de vendas.
+    """
+    st.title("Relatórios de Vendas")
+
+    # ===== PERÍODO =====
+    hoje = date.today()
+    periodo = st.sidebar.date_input(
+        "Período:",
+        value=(hoje - timedelta(days=DIAS_PERIODO_PADRAO - 1), hoje),
+        max_value=hoje,
+    )
+    # Enquanto o usuário escolhe as datas, o widget retorna só o início
+    if not isinstance(periodo, (tuple, list)) or len(periodo) != 2:
+        st.info("Selecione a data inicial e a data final do período.")
+        return
+    inicio, fim = periodo
+
+    resumo = resumo_vendas(inicio, fim, limite_itens=LIMITE_RANKING)
+    totais = resumo["totais"]
+    if totais["comandas"] == 0:
+        st.info("Nenhuma comanda fechada no período selecionado.")
+        return
+
+    # ===== INDICADORES DO PERÍODO =====
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Faturamento", formatar_moeda(totais["faturamento"]))
+    col2.metric("Comandas Fechadas", totais["comandas"])
+    col3.metric("Ticket Médio", formatar_moeda(totais["ticket_medio"]))
+
+    st.divider()
+
+    # ===== FATURAMENTO POR DIA E POR HORA =====
+    st.subheader("Faturamento por Dia")
+    st.line_chart(resumo["por_dia"]["faturamento"])
+
+    st.subheader("Faturamento por Hora do Dia")
+    st.bar_chart(resumo["por_hora"]["faturamento"])
+
+    st.divider()
+
+    # ===== ITENS MAIS VENDIDOS =====
+    st.subheader("Itens Mais Vendidos")
+    colunas_itens = {
+        "descricao": "Item",
+        "quantidade": "Quantidade",
+        "receita": "Receita (R$)",
+        "participacao": "% da Receita",
+    }
+    aba_quantidade, aba_receita = st.tabs(["Por Quantidade", "Por Receita"])
+    for aba, chave in ((aba_quantidade, "itens_quantidade"), (aba_receita, "itens_receita")):
+        with aba:
+            df_itens = resumo[chave][list(colunas_itens)].rename(columns=colunas_itens)
+            df_itens["% da Receita"] = (df_itens["% da Receita"] * 100).round(1)
+            df_itens["Receita (R$)"] = df_itens["Receita (R$)"].round(2)
+            st.dataframe(df_itens, use_container_width=True, hide_index=True)
+
+    st.divider()
+
+    # ===== DESEMPENHO POR FUNCIONÁRIO =====
+    st.subheader("Faturamento por Funcionário")
+    df_func = resumo["por_funcionario"].rename(columns={
+        "nome": "Funcionário",
+        "comandas": "Comandas",
+        "faturamento": "Faturamento (R$)",
+        "ticket_medio": "Ticket Médio (R$)",
+    })
+    st.bar_chart(df_func.set_index("Funcionário")["Faturamento (R$)"])
+    st.dataframe(
+        df_func[["Funcionário", "Comandas", "Faturamento (R$)", "Ticket Médio (R$)"]].round(2),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    # ===== COMANDAS DO PERÍODO =====
+    # Carregada só quando solicitada: pode ler também o banco de histórico
+    if st.checkbox(f"Listar comandas do período (até {LIMITE_COMANDAS})"):
+        df_comandas = consultar_comandas_fechadas(inicio, fim, limite=LIMITE_COMANDAS).rename(columns={
+            "id_comanda": "Comanda",
+            "horario_abertura": "Abertura",
+            "horario_fechamento": "Fechamento",
+            "mesa_id": "Mesa",
+            "funcionario": "Funcionário",
+            "quantidade_itens": "Itens",
+            "valor_total": "Valor Total (R$)",
+        })
+        st.dataframe(df_comandas.round(2), use_container_width=True, hide_index=True)
@@ -0,0 +1,98 @@
+# Views/PageSalao.py
+"""
+Página do Salão ao Vivo.
+Quadro das mesas (livre, ocupada, reservada) com a comanda aberta de cada
+uma, atualizado automaticamente a cada poucos segundos.
+
+A atualização só consulta mesas e comandas quando algo mudou: o quadro vem
+do cache de consultar_quadro_salao, validado pelos contadores de alteração
+(Controllers/alteracoes.py). Com o salão parado, cada atualização custa uma
+verificação de PRAGMA data_version, sem ler nenhuma tabela.
+"""
+
+import sqlite3
+from datetime import datetime
+
+import streamlit as st
+from Controllers.alteracoes import versoes_tabelas
+from Controllers.instrumentacao import medir_render
+from Controllers.MesaController import TABELAS_QUADRO_SALAO, consultar_quadro_salao
+
+# Nome da atualização automática na página "Diagnóstico"
+ROTULO_ATUALIZACAO = "Salão ao Vivo (atualização automática)"
+# Intervalo (segundos) entre as atualizações automáticas
+INTERVALO_ATUALIZACAO = 2
+# Mesas por linha do quadro
+MESAS_POR_LINHA = 4
+
+_ICONE_STATUS = {"livre": "🟢", "ocupada": "🔴", "reservada": "🟡"}
+
+def _registrar_versao():
+    """
+    Guarda no session_state o horário da última alteração percebida pela tela.
+
+    Returns:
+        str: Horário (HH:MM:SS) em que a tela viu os dados mudarem pela última vez
+    """
+    estado = st.session_state.setdefault("quadro_salao", {"versao": None, "alterado_em": None})
+    try:
+        versao = versoes_tabelas(*TABELAS_QUADRO_SALAO)
+    except sqlite3.Error:
+        versao = None
+    if versao is None or versao != estado["versao"]:
+        estado["versao"] = versao
+        estado["alterado_em"] = datetime.now().strftime("%H:%M:%S")
+    return estado["alterado_em"]
+
+def _mostrar_mesa(mesa):
+    """Exibe o cartão de uma mesa do quadro."""
+    with st.container(border=True):
+        icone = _ICONE_STATUS.get(mesa["status"], "⚪")
+        st.markdown(f"**{icone} Mesa {mesa['id_mesa']}** · {mesa['capacidade']} lugares")
+        if mesa["id_comanda"] is not None:
+            abertura = mesa["horario_abertura"][11:16] if mesa["horario_abertura"] else "-"
+            st.caption(f"Comanda {mesa['id_comanda']} · aberta às {abertura}")
+            st.write(f"{mesa['quantidade_itens']} item(ns) · R$ {mesa['subtotal_itens']:.2f}")
+        else:
+            st.caption(mesa["status"].capitalize())
+
+def _mostrar_quadro():
+    """Exibe os totais do salão e o cartão de cada mesa."""
+    alterado_em = _registrar_versao()
+    mesas = consultar_quadro_salao()
+    if not mesas:
+        st.info("Nenhuma mesa cadastrada.")
+        return
+
+    ocupadas = [m for m in mesas if m["id_comanda"] is not None]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Livres", sum(1 for m in mesas if m["status"] == "livre"))
+    col2.metric("Ocupadas", sum(1 for m in mesas if m["status"] == "ocupada"))
+    col3.metric("Reservadas", sum(1 for m in mesas if m["status"] == "reservada"))
+    col4.metric("Em aberto", f"R$ {sum(m['subtotal_itens'] for m in ocupadas):.2f}")
+    st.caption(f"Última alteração percebida às {alterado_em}")
+
+    for inicio in range(0, len(mesas), MESAS_POR_LINHA):
+        colunas = st.columns(MESAS_POR_LINHA)
+        for coluna, mesa in zip(colunas, mesas[inicio:inicio + MESAS_POR_LINHA]):
+            with coluna:
+                _mostrar_mesa(mesa)
+
+@st.fragment(run_every=INTERVALO_ATUALIZACAO)
+def _mostrar_quadro_automatico():
+    """Quadro reexecutado sozinho a cada INTERVALO_ATUALIZACAO segundos."""
+    # Medido à parte: estas reexecuções não passam por main.main()
+    with medir_render(ROTULO_ATUALIZACAO):
+        _mostrar_quadro()
+
+def show_salao_page():
+    """
+    Função principal da página do salão.
+    Exibe o quadro das mesas com atualização automática.
+    """
+    st.title("Salão ao Vivo")
+
+    if st.sidebar.toggle("Atualização automática", value=True):
+        _mostrar_quadro_automatico()
+    else:
+        _mostrar_quadro()
@@ -0,0 +1,56 @@
+# Views/registro_paginas.py
+"""
+Registro das páginas da aplicação.
+
+Cada página é descrita pelo módulo View e pelo nome da função que a renderiza.
+O módulo só é importado quando a página é aberta pela primeira vez, e a função
+resolvida fica guardada neste módulo. Como o Streamlit reexecuta main.py a cada
+interação, mas não reimporta módulos já carregados, a resolução acontece uma
+única vez por processo.
+"""
+
+import threading
+
+from Services.importacao import importar
+
+# Nome exibido no menu -> (módulo View, função de renderização)
+PAGINAS = {
+    "Gestão de Comandas": ("Views.PageComanda", "show_comanda_page"),
+    "Salão ao Vivo": ("Views.PageSalao", "show_salao_page"),
+    "Cadastro de Funcionários": ("Views.PageFuncionario", "show_funcionario_page"),
+    "Cadastro de Clientes": ("Views.PageCliente", "show_cliente_page"),
+    "Gerenciar Cardápio": ("Views.PageCardapio", "show_cardapio_page"),
+    "Gerenciar Mesas": ("Views.PageMesas", "show_mesas_page"),
+    "Cozinha": ("Views.PageCozinha", "show_cozinha_page"),
+    "Relatórios de Vendas": ("Views.PageRelatorios", "show_relatorios_page"),
+    "Diagnóstico": ("Views.PageDiagnostico", "show_diagnostico_page"),
+}
+
+_lock = threading.Lock()
+_funcoes = {}  # nome da página -> função show_*_page já resolvida
+
+
+def obter_pagina(nome_pagina):
+    """
+    Retorna a função de renderização da página, importando o módulo se preciso.
+
+    Args:
+        nome_pagina (str): Nome da página (deve estar em PAGINAS)
+
+    Returns:
+        function: Função show_*_page da página
+
+    Raises:
+        KeyError: Se a página não estiver registrada
+        ImportError: Se o módulo da View não puder ser importado
+        AttributeError: Se o módulo não tiver a função registrada
+    """
+    funcao = _funcoes.get(nome_pagina)
+    if funcao is not None:
+        return funcao
+
+    nome_modulo, nome_funcao = PAGINAS[nome_pagina]
+    funcao = getattr(importar(nome_modulo), nome_funcao)
+    with _lock:
+        _funcoes[nome_pagina] = funcao
+    return funcao
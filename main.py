@@ -15,10 +15,14 @@ Estrutura do Projeto:
 O aplicativo usa Streamlit para interface e SQLite para persistência de dados.
 """
 
-import streamlit as st
+import os
 import sys
+import time
 from pathlib import Path
-import importlib
+
+_inicio_streamlit = time.perf_counter()
+import streamlit as st
+_tempo_streamlit = time.perf_counter() - _inicio_streamlit
 
 # ===== 1. CONFIGURAÇÃO DA PÁGINA =====
 # IMPORTANTE: st.set_page_config DEVE SER A PRIMEIRA CHAMADA DO STREAMLIT
@@ -33,29 +37,41 @@ st.set_page_config(
 # sem problemas de importação relativa
 sys.path.append(str(Path(__file__).parent))
 
-# ===== 3. DICIONÁRIO DE PÁGINAS DISPONÍVEIS =====
-# Mapeia o nome exibido no menu para o caminho do módulo View
-# A chave é o nome no menu, o valor é o caminho do módulo
-PAGES = {
-    "Gestão de Comandas": "Views.PageComanda",
-    "Cadastro de Funcionários": "Views.PageFuncionario",
-    "Cadastro de Clientes": "Views.PageCliente",
-    "Gerenciar Cardápio": "Views.PageCardapio",
-    "Gerenciar Mesas": "Views.PageMesas",
-}
-
-# ===== 4. FUNÇÃO PARA CARREGAR PÁGINAS DINAMICAMENTE =====
+from Services.importacao import registrar_tempo, relatorio_importacoes
+from Controllers.instrumentacao import medir_render
+from Views.registro_paginas import PAGINAS, obter_pagina
+
+registrar_tempo("streamlit", _tempo_streamlit)
+
+# Exibe o relatório de inicialização na sidebar (RESTAURANTE_RELATORIO_INICIALIZACAO=1)
+MOSTRAR_RELATORIO = os.environ.get("RESTAURANTE_RELATORIO_INICIALIZACAO", "0") == "1"
+
+# ===== 3. INICIALIZAÇÃO DO BANCO DE DADOS =====
+@st.cache_resource
+def inicializar_banco():
+    """
+    Cria as tabelas e aplica as migrações pendentes do esquema.
+    st.cache_resource garante que isso rode uma única vez por processo,
+    e não a cada interação do usuário.
+    """
+    from Services.database import create_database
+    create_database()
+    return True
+
+# ===== 4. DICIONÁRIO DE PÁGINAS DISPONÍVEIS =====
+# O registro (nome no menu -> módulo e função da View) fica em
+# Views/registro_paginas.py, que importa cada página só quando ela é aberta
+PAGES = PAGINAS
+
+# ===== 5. FUNÇÃO PARA CARREGAR PÁGINAS =====
 def load_page(page_name):
     """
-    Carrega um módulo de página dinamicamente com base na seleção do usuário.
-    
-    A função espera que cada módulo View tenha uma função nomeada como:
-    'show_<nome_da_pagina>_page'
-    
-    Exemplos:
-        'Views.PageCliente' -> procura por 'show_cliente_page()'
-        'Views.PageComanda' -> procura por 'show_comanda_page()'
-    
+    Retorna a função de renderização da página selecionada.
+
+    O módulo da View é importado na primeira vez em que a página é aberta e
+    a função fica guardada no registro de páginas; nas reexecuções seguintes
+    do script a busca é apenas uma consulta ao dicionário.
+
     Args:
         page_name (str): Nome da página selecionado (deve estar em PAGES)
         
@@ -63,32 +79,34 @@ def load_page(page_name):
         function: Função da página carregada, ou None se erro
     """
     try:
-        # Extrai apenas o nome do módulo (última parte após 'Views.')
-        module_name_simple = PAGES[page_name].split('.')[-1]
-        
-        # Converte o nome do módulo (ex: PageCliente) 
-        # para o nome da função esperada (ex: show_cliente_page)
-        # Remove 'Page' do início e converte para minúsculas
-        page_func_name = f"show_{module_name_simple.replace('Page', '').lower()}_page"
-        
-        # Importa dinamicamente o módulo
-        module = importlib.import_module(PAGES[page_name])
-        
-        # Obtém a função de renderização do módulo carregado
-        return getattr(module, page_func_name)
+        return obter_pagina(page_name)
     
-    except (ImportError, AttributeError) as e:
+    except (KeyError, ImportError, AttributeError) as e:
         # Se houver erro, exibe mensagem ao usuário
         st.error(f"Erro ao carregar a página '{page_name}': {e}")
-        st.warning("Verifique o nome do arquivo da View e da função 'show_..._page'.")
+        st.warning("Verifique o registro em Views/registro_paginas.py e a função 'show_..._page'.")
         return None
 
-# ===== 5. FUNÇÃO PRINCIPAL (MAIN) =====
+def mostrar_relatorio_inicializacao():
+    """
+    Exibe na sidebar o tempo gasto na primeira importação de cada módulo
+    e na preparação do banco de dados.
+    """
+    with st.sidebar.expander("Relatório de inicialização"):
+        for modulo, milissegundos in relatorio_importacoes():
+            st.write(f"`{modulo}`: {milissegundos:.1f} ms")
+
+# ===== 6. FUNÇÃO PRINCIPAL (MAIN) =====
 def main():
     """
     Função principal que renderiza a aplicação.
     Gerencia a navegação entre páginas e renderiza a página selecionada.
     """
+    # Garante que o esquema do banco está na versão mais recente
+    inicio = time.perf_counter()
+    inicializar_banco()
+    registrar_tempo("banco de dados", time.perf_counter() - inicio)
+
     # Título principal da aplicação
     st.title('Sistema de Gerenciamento de Restaurante')
     
@@ -104,9 +122,14 @@ def main():
     # Carrega e renderiza a página selecionada
     show_page = load_page(page_selection)
     if show_page:
-        show_page()  # Executa a função da página
+        # O tempo de renderização aparece na página "Diagnóstico"
+        with medir_render(page_selection):
+            show_page()  # Executa a função da página
+
+    if MOSTRAR_RELATORIO:
+        mostrar_relatorio_inicializacao()
 
-# ===== 6. PONTO DE ENTRADA DO SCRIPT =====
+# ===== 7. PONTO DE ENTRADA DO SCRIPT =====
 # Executa a função main apenas se o arquivo for executado diretamente
 # (não quando importado como módulo em outro arquivo)
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+# tests/conftest.py
+"""
+Fixtures dos testes: cada teste recebe um banco novo em diretório temporário,
+criado por create_database (tabelas + migrações), com o pool global, o
+escritor único, o detector de alterações e o cache apontados para ele.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Permite importar os módulos do projeto a partir da pasta de testes
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from Controllers.alteracoes import fechar_detector
+from Controllers.cache import limpar_cache
+from Controllers.db_connection import configurar_pool, fechar_pool, obter_conexao
+from Controllers.escritor import encerrar_escritor
+from Services.database import create_database
+
+# Dados mínimos para abrir e fechar comandas
+ITENS_CARDAPIO = (
+    ("Pizza Calabresa", "grande", 60.0),
+    ("Suco de Laranja", "500 ml", 9.5),
+    ("Pudim", None, 12.0),
+)
+
+
+@pytest.fixture
+def banco(tmp_path, capsys):
+    """
+    Banco vazio com 2 funcionários, 4 mesas livres e os itens de ITENS_CARDAPIO.
+
+    Yields:
+        Path: Caminho do banco principal (o histórico fica ao lado)
+    """
+    caminho = tmp_path / "restaurante.db"
+    create_database(caminho)
+    configurar_pool(caminho)
+    limpar_cache()
+    with obter_conexao() as conexao:
+        conexao.executemany(
+            "INSERT INTO funcionario (cpf, nome) VALUES (?, ?)",
+            [("11144477735", "Ana"), ("52998224725", "Bruno")],
+        )
+        conexao.executemany(
+            "INSERT INTO mesa (status, capacidade) VALUES ('livre', ?)", [(2,), (4,), (4,), (6,)]
+        )
+        conexao.executemany(
+            "INSERT INTO item_cardapio (descricao, sub_descricao, valor_unitario) VALUES (?, ?, ?)",
+            ITENS_CARDAPIO,
+        )
+        conexao.commit()
+    capsys.readouterr()  # Descarta as mensagens da criação do banco
+    yield caminho
+    encerrar_escritor()
+    fechar_detector()
+    fechar_pool()
+    limpar_cache()
@@ -0,0 +1,144 @@
+# tests/test_api_http.py
+"""Testes da API HTTP/JSON (Services/api_http.py)."""
+
+import http.client
+import json
+import sqlite3
+import threading
+from http import HTTPStatus
+
+import pytest
+
+from Services import api_http
+from Services.api_http import LIMITE_BUSCA_CARDAPIO, criar_servidor, despachar
+
+
+@pytest.fixture
+def servidor(banco):
+    """API em uma porta livre, atendendo em segundo plano."""
+    servidor = criar_servidor("127.0.0.1", 0)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield servidor.server_address[1]
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _requisitar(porta, metodo, caminho, dados=None, cabecalhos=None):
+    conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=5)
+    try:
+        conexao.request(metodo, caminho, body=dados, headers=cabecalhos or {})
+        resposta = conexao.getresponse()
+        return resposta.status, json.loads(resposta.read())
+    finally:
+        conexao.close()
+
+
+def test_ciclo_da_comanda(banco):
+    status, resposta = despachar("POST", "/comandas", {"funcionario_id": 1, "mesa_id": 2})
+    assert status == HTTPStatus.CREATED
+    id_comanda = resposta["id_comanda"]
+
+    status, resposta = despachar("POST", f"/comandas/{id_comanda}/itens",
+                                 {"itens": [{"item_cardapio_id": 1, "quantidade": 2}, {"item_cardapio_id": 2}]})
+    assert status == HTTPStatus.CREATED
+    assert resposta["itens_adicionados"] == 2
+
+    status, resposta = despachar("GET", f"/comandas/{id_comanda}/total", {})
+    assert status == HTTPStatus.OK
+    assert resposta["subtotal"] == pytest.approx(2 * 60.0 + 9.5)
+
+    status, resposta = despachar("POST", f"/comandas/{id_comanda}/fechar", {})
+    assert status == HTTPStatus.OK
+    assert resposta["horario_fechamento"] is not None
+    assert despachar("POST", f"/comandas/{id_comanda}/fechar", {})[0] == HTTPStatus.CONFLICT
+
+
+def test_itens_aceitam_lista_no_corpo(banco):
+    _, resposta = despachar("POST", "/comandas", {"funcionario_id": 1, "mesa_id": 1})
+    status, resposta = despachar("POST", f"/comandas/{resposta['id_comanda']}/itens",
+                                 [{"item_cardapio_id": 3}])
+    assert status == HTTPStatus.CREATED
+    assert resposta["itens_adicionados"] == 1
+
+
+def test_corpo_que_nao_e_objeto_recebe_400(banco):
+    status, resposta = despachar("POST", "/clientes", [1, 2])
+    assert status == HTTPStatus.BAD_REQUEST
+    assert "objeto JSON" in resposta["erro"]
+
+
+def test_cliente_com_cpf_invalido_recebe_400(banco):
+    for cpf in ("abc", "", 123, "123.456.789"):
+        status, resposta = despachar("POST", "/clientes", {"cpf": cpf, "nome": "Carla"})
+        assert status == HTTPStatus.BAD_REQUEST, cpf
+        assert "CPF" in resposta["erro"]
+    assert despachar("GET", "/clientes", {})[1]["clientes"] == []
+
+
+def test_cliente_com_cpf_repetido_recebe_409(banco):
+    status, resposta = despachar("POST", "/clientes", {"cpf": "390.533.447-05", "nome": "Carla"})
+    assert status == HTTPStatus.CREATED
+    assert resposta["cpf"] == "39053344705"
+    status, resposta = despachar("POST", "/clientes", {"cpf": "39053344705", "nome": "Outra"})
+    assert status == HTTPStatus.CONFLICT
+    assert "já cadastrado" in resposta["erro"]
+
+
+def test_rotas_e_metodos_desconhecidos(banco):
+    assert despachar("GET", "/nada", {})[0] == HTTPStatus.NOT_FOUND
+    assert despachar("DELETE", "/clientes", {})[0] == HTTPStatus.METHOD_NOT_ALLOWED
+    assert despachar("GET", "/comandas/999", {})[0] == HTTPStatus.NOT_FOUND
+
+
+def test_busca_limitada_pelo_limite_proprio(banco, monkeypatch):
+    limites = []
+    monkeypatch.setattr(api_http, "buscar_itens", lambda termo, limite: limites.append(limite) or [])
+    assert despachar("GET", "/cardapio/busca?q=p&limite=100000", {})[0] == HTTPStatus.OK
+    assert limites == [LIMITE_BUSCA_CARDAPIO]
+
+
+def test_erro_inesperado_vira_500(banco, monkeypatch, capsys):
+    def _pool_esgotado():
+        raise sqlite3.OperationalError("Pool de conexões esgotado (5 conexões em uso)")
+
+    monkeypatch.setattr(api_http, "calcular_totais_comandas", _pool_esgotado)
+    status, resposta = despachar("GET", "/comandas/abertas", {})
+    assert status == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert "erro" in resposta
+    assert "Pool de conexões esgotado" in capsys.readouterr().out
+
+
+def test_lote_isola_as_operacoes(banco):
+    status, resposta = despachar("POST", "/lote", {"operacoes": [
+        {"metodo": "POST", "caminho": "/comandas", "corpo": {"funcionario_id": 1, "mesa_id": 3}},
+        {"metodo": "POST", "caminho": "/clientes", "corpo": [1]},
+        {"metodo": "POST", "caminho": "/lote", "corpo": {"operacoes": []}},
+    ]})
+    assert status == HTTPStatus.OK
+    assert [r["status"] for r in resposta["resultados"]] == [201, 400, 400]
+
+
+def test_http_cliente_e_corpo_invalido(servidor):
+    dados = json.dumps({"cpf": "390.533.447-05", "nome": "Carla"}).encode()
+    status, resposta = _requisitar(servidor, "POST", "/clientes", dados,
+                                   {"Content-Type": "application/json"})
+    assert status == HTTPStatus.CREATED
+    assert resposta["nome"] == "Carla"
+
+    status, resposta = _requisitar(servidor, "POST", "/clientes", b"{nao e json",
+                                   {"Content-Type": "application/json"})
+    assert status == HTTPStatus.BAD_REQUEST
+
+
+def test_http_content_length_invalido(servidor):
+    conexao = http.client.HTTPConnection("127.0.0.1", servidor, timeout=5)
+    try:
+        conexao.putrequest("POST", "/clientes")
+        conexao.putheader("Content-Length", "abc")
+        conexao.endheaders()
+        resposta = conexao.getresponse()
+        assert resposta.status == HTTPStatus.BAD_REQUEST
+        assert "Content-Length" in json.loads(resposta.read())["erro"]
+    finally:
+        conexao.close()
@@ -0,0 +1,31 @@
+# tests/test_cache.py
+"""Testes do cache de dados de referência (Controllers/cache.py)."""
+
+import sqlite3
+from contextlib import closing
+
+from Controllers.FuncionarioController import consultar_funcionarios
+from Controllers.ItemCardapioController import consultar_itens
+
+
+def _gravar_em_outro_processo(caminho, comando, parametros=()):
+    """Escrita por uma conexão fora do pool, como a de outro processo."""
+    with closing(sqlite3.connect(caminho)) as conexao:
+        conexao.execute(comando, parametros)
+        conexao.commit()
+
+
+def test_cardapio_em_cache_ve_escrita_de_outro_processo(banco):
+    assert [item[3] for item in consultar_itens() if item[0] == 1] == [60.0]
+    _gravar_em_outro_processo(banco, "UPDATE item_cardapio SET valor_unitario = 65.0 WHERE id_item = 1")
+    assert [item[3] for item in consultar_itens() if item[0] == 1] == [65.0]
+
+    _gravar_em_outro_processo(banco, "DELETE FROM item_cardapio WHERE id_item = 3")
+    assert [item[0] for item in consultar_itens()] == [1, 2]
+
+
+def test_funcionarios_em_cache_veem_escrita_de_outro_processo(banco):
+    assert [f[2] for f in consultar_funcionarios()] == ["Ana", "Bruno"]
+    _gravar_em_outro_processo(banco, "INSERT INTO funcionario (cpf, nome) VALUES (?, ?)",
+                              ("39053344705", "Carla"))
+    assert [f[2] for f in consultar_funcionarios()] == ["Ana", "Bruno", "Carla"]
@@ -0,0 +1,157 @@
+# tests/test_escritor.py
+"""Testes das transações aninhadas (savepoints) e do escritor único."""
+
+import threading
+
+import pytest
+
+from Controllers.db_connection import apos_transacao, em_transacao, obter_conexao, transacao
+from Controllers.escritor import EscritorUnico
+
+
+def _inserir_mesa(capacidade):
+    with transacao() as conexao:
+        conexao.execute("INSERT INTO mesa (status, capacidade) VALUES ('livre', ?)", (capacidade,))
+    return capacidade
+
+
+def _falhar():
+    with transacao() as conexao:
+        conexao.execute("INSERT INTO mesa (status, capacidade) VALUES ('livre', 99)")
+        raise ValueError("operação inválida")
+
+
+def _capacidades(*capacidades):
+    with obter_conexao() as conexao:
+        marcadores = ", ".join("?" * len(capacidades))
+        return sorted(linha[0] for linha in conexao.execute(
+            f"SELECT capacidade FROM mesa WHERE capacidade IN ({marcadores})", capacidades
+        ))
+
+
+def _ocupar(escritor):
+    """
+    Deixa o escritor ocupado com uma operação que espera o evento devolvido:
+    as operações submetidas até ele ser sinalizado formam o próximo lote.
+    """
+    iniciada, liberar = threading.Event(), threading.Event()
+    escritor.submeter(lambda: iniciada.set() or liberar.wait(5))
+    assert iniciada.wait(5)
+    return liberar
+
+
+@pytest.fixture
+def escritor(banco):
+    """Escritor próprio do teste, com estatísticas zeradas."""
+    escritor = EscritorUnico(latencia=0)
+    yield escritor
+    escritor.encerrar()
+
+
+# ===== TRANSAÇÕES ANINHADAS =====
+
+def test_erro_no_bloco_interno_desfaz_so_o_bloco(banco):
+    with transacao() as conexao:
+        conexao.execute("INSERT INTO mesa (status, capacidade) VALUES ('livre', 10)")
+        with pytest.raises(ValueError):
+            _falhar()
+        _inserir_mesa(11)
+    assert _capacidades(10, 11, 99) == [10, 11]
+
+
+def test_erro_no_bloco_externo_desfaz_tudo(banco):
+    with pytest.raises(ValueError):
+        with transacao():
+            _inserir_mesa(10)
+            raise ValueError("cancelado")
+    assert _capacidades(10) == []
+    assert not em_transacao()
+
+
+def test_apos_transacao_roda_depois_do_commit(banco):
+    vistas = []
+
+    def _ler_de_outra_thread():
+        thread = threading.Thread(target=lambda: vistas.append(_capacidades(10)))
+        thread.start()
+        thread.join()
+
+    with transacao():
+        _inserir_mesa(10)
+        apos_transacao(_ler_de_outra_thread)
+        assert vistas == []
+    assert vistas == [[10]]
+
+
+# ===== ESCRITOR ÚNICO =====
+
+def test_operacoes_enfileiradas_sao_gravadas_em_um_lote(escritor):
+    liberar = threading.Event()
+    iniciada = threading.Event()
+
+    def _bloquear():
+        iniciada.set()
+        liberar.wait(5)
+        return _inserir_mesa(10)
+
+    primeira = escritor.submeter(_bloquear)
+    assert iniciada.wait(5)
+    futuros = [escritor.submeter(_inserir_mesa, capacidade) for capacidade in (11, 12, 13)]
+    liberar.set()
+
+    assert [f.result(5) for f in [primeira] + futuros] == [10, 11, 12, 13]
+    estatisticas = escritor.estatisticas()
+    assert estatisticas["operacoes"] == 4
+    assert estatisticas["lotes"] == 2
+    assert estatisticas["maior_lote"] == 3
+    assert _capacidades(10, 11, 12, 13) == [10, 11, 12, 13]
+
+
+def test_erro_de_uma_operacao_nao_afeta_o_lote(escritor):
+    liberar = _ocupar(escritor)
+    futuros = [
+        escritor.submeter(_inserir_mesa, 10),
+        escritor.submeter(_falhar),
+        escritor.submeter(_inserir_mesa, 11),
+    ]
+    liberar.set()
+
+    assert futuros[0].result(5) == 10
+    with pytest.raises(ValueError):
+        futuros[1].result(5)
+    assert futuros[2].result(5) == 11
+    assert escritor.estatisticas()["reexecutadas"] == 0
+    assert _capacidades(10, 11, 99) == [10, 11]
+
+
+def test_lote_desfeito_pelo_sqlite_e_regravado_uma_a_uma(escritor, capsys):
+    def _desfazer_transacao():
+        # Como um erro grave do SQLite, que desfaz a transação inteira
+        with obter_conexao() as conexao:
+            conexao.execute("ROLLBACK")
+        return "desfeita"
+
+    liberar = _ocupar(escritor)
+    futuros = [
+        escritor.submeter(_inserir_mesa, 10),
+        escritor.submeter(_desfazer_transacao),
+        escritor.submeter(_inserir_mesa, 11),
+    ]
+    liberar.set()
+
+    assert [f.result(5) for f in futuros] == [10, "desfeita", 11]
+    assert escritor.estatisticas()["reexecutadas"] == 3
+    assert escritor.estatisticas()["lotes"] == 2
+    assert "gravando uma a uma" in capsys.readouterr().out
+    assert _capacidades(10, 11) == [10, 11]
+
+
+def test_operacao_cancelada_antes_de_comecar_nao_e_gravada(escritor):
+    liberar = _ocupar(escritor)
+    cancelada = escritor.submeter(_inserir_mesa, 10)
+    gravada = escritor.submeter(_inserir_mesa, 11)
+    assert cancelada.cancel()
+    liberar.set()
+
+    assert gravada.result(5) == 11
+    assert _capacidades(10, 11) == [11]
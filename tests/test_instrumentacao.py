@@ -0,0 +1,40 @@
+# tests/test_instrumentacao.py
+"""Testes da medição de renderização (Controllers/instrumentacao.py)."""
+
+import sys
+import types
+
+import pytest
+
+from Controllers import instrumentacao
+from Controllers.instrumentacao import limpar_registros, medir_render
+
+
+class _ScriptControlException(BaseException):
+    """Como a exceção de st.rerun()/st.stop(), que herda de BaseException."""
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    modulo = types.ModuleType("streamlit.runtime.scriptrunner_utils.exceptions")
+    modulo.ScriptControlException = _ScriptControlException
+    monkeypatch.setitem(sys.modules, modulo.__name__, modulo)
+    limpar_registros()
+    yield instrumentacao._renders
+    limpar_registros()
+
+
+def test_rerun_do_streamlit_nao_e_erro(renders):
+    with pytest.raises(_ScriptControlException):
+        with medir_render("Cozinha"):
+            raise _ScriptControlException()
+    assert [r["erro"] for r in renders] == [None]
+
+
+def test_excecao_da_pagina_e_erro(renders):
+    with pytest.raises(ValueError):
+        with medir_render("Cozinha"):
+            raise ValueError("falha")
+    with medir_render("Cozinha"):
+        pass
+    assert [r["erro"] for r in renders] == ["ValueError", None]
@@ -0,0 +1,53 @@
+# tests/test_migracoes.py
+"""Testes das migrações versionadas (Services/migracoes.py)."""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from Services import migracoes
+from Services.migracoes import MIGRACOES, aplicar_migracoes, versao_atual
+
+
+def _tabelas(conexao):
+    return {linha[0] for linha in conexao.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_banco_novo_fica_na_ultima_versao(banco):
+    with closing(sqlite3.connect(banco)) as conexao:
+        assert versao_atual(conexao) == MIGRACOES[-1][0]
+        # Reaplicar não faz nada
+        assert aplicar_migracoes(conexao) == []
+
+
+def test_migracao_com_erro_e_desfeita(banco, monkeypatch, capsys):
+    ultima = MIGRACOES[-1][0]
+
+    def _falha(conexao):
+        conexao.execute("CREATE TABLE tabela_parcial (id INTEGER)")
+        conexao.execute("INSERT INTO tabela_inexistente VALUES (1)")
+
+    monkeypatch.setattr(migracoes, "MIGRACOES", MIGRACOES + [(ultima + 1, "Migração com erro", _falha)])
+    with closing(sqlite3.connect(banco)) as conexao:
+        with pytest.raises(sqlite3.OperationalError):
+            aplicar_migracoes(conexao)
+        # Nada da migração ficou gravado e a versão não mudou
+        assert versao_atual(conexao) == ultima
+        assert "tabela_parcial" not in _tabelas(conexao)
+    assert "Erro ao aplicar migração" in capsys.readouterr().out
+
+
+def test_aplica_somente_ate_a_versao_pedida(banco, monkeypatch):
+    ultima = MIGRACOES[-1][0]
+    executadas = []
+    extras = [
+        (ultima + 1, "Primeira", lambda conexao: executadas.append(ultima + 1)),
+        (ultima + 2, "Segunda", lambda conexao: executadas.append(ultima + 2)),
+    ]
+    monkeypatch.setattr(migracoes, "MIGRACOES", MIGRACOES + extras)
+    with closing(sqlite3.connect(banco)) as conexao:
+        assert aplicar_migracoes(conexao, ate_versao=ultima + 1) == [ultima + 1]
+        assert versao_atual(conexao) == ultima + 1
+        assert aplicar_migracoes(conexao) == [ultima + 2]
+    assert executadas == [ultima + 1, ultima + 2]
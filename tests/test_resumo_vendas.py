@@ -0,0 +1,89 @@
+# tests/test_resumo_vendas.py
+"""Testes do resumo diário de vendas (Controllers/ResumoVendasController.py)."""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from Controllers.ComandaController import abrir_comanda, adicionar_itens_comanda, fechar_comanda
+from Controllers.HistoricoController import _copiar_para_historico, arquivar_comandas, historico_anexado
+from Controllers.db_connection import transacao
+from Controllers.ResumoVendasController import _RESUMOS, reconstruir_resumos, verificar_resumos
+
+
+def _fechar_comandas(pedidos):
+    """Abre, lança e fecha uma comanda por pedido [(item_id, quantidade), ...]."""
+    for numero, itens in enumerate(pedidos):
+        id_comanda = abrir_comanda(numero % 2 + 1, numero % 4 + 1)
+        assert adicionar_itens_comanda(id_comanda, itens)
+        assert fechar_comanda(id_comanda)
+
+
+def _conteudo_resumos(caminho):
+    with closing(sqlite3.connect(caminho)) as conexao:
+        return {
+            tabela: conexao.execute(f"SELECT * FROM {tabela} ORDER BY 1, 2").fetchall()
+            for tabela in _RESUMOS
+        }
+
+
+@pytest.fixture
+def vendas(banco):
+    """Banco com quatro comandas fechadas no dia."""
+    _fechar_comandas([[(1, 1), (2, 2)], [(2, 3)], [(3, 1), (1, 2)], [(1, 1), (2, 1), (3, 1)]])
+    return banco
+
+
+def test_resumo_incremental_igual_a_reconstrucao(vendas):
+    incremental = _conteudo_resumos(vendas)
+    assert incremental["resumo_vendas_dia"][0][1] == 4  # comandas do dia
+    assert verificar_resumos() == []
+    assert reconstruir_resumos()
+    assert _conteudo_resumos(vendas) == incremental
+
+
+def test_verificacao_encontra_e_corrige_divergencia(vendas, capsys):
+    with closing(sqlite3.connect(vendas)) as conexao:
+        conexao.execute("UPDATE resumo_vendas_item SET quantidade = quantidade + 5 WHERE item_cardapio_id = 2")
+        conexao.commit()
+
+    divergencias = verificar_resumos()
+    assert [d["tabela"] for d in divergencias] == ["resumo_vendas_item"]
+    assert divergencias[0]["resumo"]["quantidade"] - divergencias[0]["calculado"]["quantidade"] == 5
+
+    assert len(verificar_resumos(corrigir=True)) == 1
+    assert verificar_resumos() == []
+    assert "corrigida(s)" in capsys.readouterr().out
+
+
+def test_verificacao_nao_espera_o_lock_de_escrita(vendas):
+    # Outra conexão com uma escrita em andamento: a comparação lê um retrato
+    # do banco (WAL) e termina sem esperar o busy_timeout
+    with closing(sqlite3.connect(vendas, isolation_level=None)) as escritora:
+        escritora.execute("BEGIN IMMEDIATE")
+        try:
+            assert verificar_resumos() == []
+        finally:
+            escritora.rollback()
+
+
+def test_resumo_confere_depois_do_arquivamento(vendas):
+    antes = _conteudo_resumos(vendas)
+    # dias=-1: todas as comandas fechadas vão para o histórico
+    assert arquivar_comandas(dias=-1)["comanda"] == 4
+    assert _conteudo_resumos(vendas) == antes
+    assert verificar_resumos() == []
+
+
+def test_lote_copiado_e_ainda_nao_removido_conta_uma_vez(vendas):
+    # Retrato entre as duas transações de um lote do arquivamento: as
+    # comandas já estão no histórico e ainda no banco principal
+    with historico_anexado() as conexao:
+        with transacao():
+            _copiar_para_historico(conexao, [1, 2])
+        assert conexao.execute("SELECT COUNT(*) FROM comanda_geral").fetchone()[0] == 4
+        assert conexao.execute(
+            "SELECT COUNT(*) FROM comanda_item_cardapio_geral WHERE comanda_id IN (1, 2)"
+        ).fetchone()[0] == 3
+    assert verificar_resumos() == []
@@ -0,0 +1,42 @@
+# tests/test_subtotais.py
+"""Testes da conferência dos subtotais mantidos nas comandas (ComandaController)."""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from Controllers.ComandaController import abrir_comanda, adicionar_itens_comanda, verificar_subtotais
+
+
+@pytest.fixture
+def comanda(banco):
+    """Comanda aberta com 2 pizzas e 1 suco (subtotal 129.5)."""
+    id_comanda = abrir_comanda(1, 1)
+    assert adicionar_itens_comanda(id_comanda, [(1, 2), (2, 1)])
+    return id_comanda
+
+
+def _desalinhar(caminho, id_comanda):
+    with closing(sqlite3.connect(caminho)) as conexao:
+        conexao.execute("UPDATE comanda SET subtotal_itens = 1.0 WHERE id_comanda = ?", (id_comanda,))
+        conexao.commit()
+
+
+def test_conferencia_nao_espera_o_lock_de_escrita(comanda, banco):
+    _desalinhar(banco, comanda)
+    with closing(sqlite3.connect(banco, isolation_level=None, timeout=0)) as escritora:
+        escritora.execute("BEGIN IMMEDIATE")
+        try:
+            divergentes = verificar_subtotais()
+        finally:
+            escritora.rollback()
+    assert [d["id_comanda"] for d in divergentes] == [comanda]
+    assert divergentes[0]["subtotal_calculado"] == pytest.approx(129.5)
+
+
+def test_correcao_reconstroi_o_subtotal(comanda, banco, capsys):
+    _desalinhar(banco, comanda)
+    assert len(verificar_subtotais(corrigir=True)) == 1
+    assert "corrigida(s)" in capsys.readouterr().out
+    assert verificar_subtotais() == []